@@ -0,0 +1,116 @@
+"""Build and query times of the concordance of Ende example sentences.
+
+For each SIZES entry, that many synthetic example sentences (two to seven
+words of the Ende-like syllables of benchmarks/synthetic.py, under about a
+third as many headwords) are indexed, and the build time is printed
+beside n log n of the corpus length, relative to the first size, to show
+how the suffix array build scales. The index is then timed on queries of
+one syllable (thousands of hits), a whole word, two-word phrases and
+strings that occur nowhere: counting the occurrences, and fetching the
+first LIMIT hits in context. For a sample of the queries the count is
+checked against a scan of every sentence.
+
+Usage: python benchmarks/bench_concordance.py [--sizes 10000 50000] [--queries N] [--limit N]
+"""
+import argparse
+import math
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from ende_dictionary.concordance import Concordance, fold, normalize, write_index
+from synthetic import ENGLISH, SYLLABLES, _sentence, _word
+
+
+def synthetic_examples(count, rng):
+    """count (sentence, translation, headword) triples, about three per headword."""
+    headwords = [_word(rng) for _ in range(max(1, count // 3))]
+    return [(_sentence(rng), rng.choice(ENGLISH), rng.choice(headwords)) for _ in range(count)]
+
+
+def occurrences(sentences, query):
+    """Overlapping occurrences of query in the folded sentences, by scanning them all."""
+    total = 0
+    for sentence in sentences:
+        start = sentence.find(query)
+        while start != -1:
+            total += 1
+            start = sentence.find(query, start + 1)
+    return total
+
+
+def timed(function, queries, repeat=3):
+    """Per-query times in microseconds, the best of repeat runs each."""
+    times = []
+    for query in queries:
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            function(query)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        times.append(best * 1e6)
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Time the concordance of Ende example sentences.')
+    parser.add_argument('--sizes', type=int, nargs='*', default=[10000, 50000], metavar='SENTENCES')
+    parser.add_argument('--queries', type=int, default=200)
+    parser.add_argument('--limit', type=int, default=50, help='hits fetched per query (default 50)')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    baseline = None
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            rng = random.Random(args.seed)
+            examples = synthetic_examples(size, rng)
+            # The index keeps one sentence per distinct (sentence, translation, headword)
+            sentences = [fold(sentence) for sentence, _, _ in
+                         sorted({(normalize(sentence), translation, headword)
+                                 for sentence, translation, headword in examples})]
+            characters = sum(len(sentence) + 1 for sentence in sentences)
+            path = os.path.join(tmp, f'ende-{size}.kwic')
+            start = time.perf_counter()
+            write_index(examples, path)
+            elapsed = time.perf_counter() - start
+            work = characters * math.log2(characters)
+            baseline = baseline or (elapsed, work)
+            print(f"{size} sentences, {characters} characters indexed in {elapsed:.2f} s "
+                  f"({os.path.getsize(path) / 1e6:.1f} MB); time x{elapsed / baseline[0]:.1f}, "
+                  f"n log n x{work / baseline[1]:.1f}")
+
+            start = time.perf_counter()
+            index = Concordance(path)
+            print(f"opened in {(time.perf_counter() - start) * 1000:.2f} ms")
+            with index:
+                words = [word for sentence in sentences[:1000] for word in sentence.rstrip('.').split()]
+                cases = [
+                    ('syllable', [rng.choice(SYLLABLES) for _ in range(args.queries)]),
+                    ('word', [rng.choice(words) for _ in range(args.queries)]),
+                    ('phrase', [' '.join(rng.choice(sentences).rstrip('.').split()[:2])
+                                for _ in range(args.queries)]),
+                    ('absent', [_word(rng, 6, 8) for _ in range(args.queries)]),
+                ]
+                for name, queries in cases:
+                    for query in queries[:10]:
+                        if index.count(query) != occurrences(sentences, fold(query)):
+                            raise SystemExit(f"count({query!r}) disagrees with a scan of every sentence")
+                print("counts agree with a scan of every sentence on a sample of every query kind")
+
+                print(f"{'queries':<10} {'hits':>8} {'count us':>9} {'p99 us':>8} "
+                      f"{f'first {args.limit} us':>13} {'p99 us':>8}")
+                for name, queries in cases:
+                    counts = timed(index.count, queries)
+                    hits = timed(lambda query: index.search(query, args.limit), queries)
+                    matches = statistics.mean(index.count(query) for query in queries)
+                    print(f"{name:<10} {matches:>8.1f} {statistics.mean(counts):>9.1f} "
+                          f"{sorted(counts)[int(len(counts) * 0.99)]:>8.1f} {statistics.mean(hits):>13.1f} "
+                          f"{sorted(hits)[int(len(hits) * 0.99)]:>8.1f}")
+
+
+if __name__ == '__main__':
+    main()
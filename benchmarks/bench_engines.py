@@ -0,0 +1,80 @@
+"""Compare the lxml and stdlib parser engines (ende_dictionary.engines).
+
+Reads each input with every installed engine and prints the median read
+and parse stage times of REPEATS runs per engine and the speed-up of each
+engine over stdlib; these are the numbers behind
+ende_dictionary.engines.AUTO. That the engines extract identical records
+is checked by tests/test_engines.py.
+
+The inputs are the repo's LIFT exports, any --configured export given,
+and synthetic LIFT and configured exports of each --sizes entry count
+(benchmarks/synthetic.py).
+
+Usage: python benchmarks/bench_engines.py [--sizes 10000 100000] [--configured FILE] [--repeats N]
+"""
+import argparse
+import glob
+import os
+import statistics
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+
+from ende_dictionary import configured, engines, lift
+from ende_dictionary.instrument import Stats
+from synthetic import generate_configured, generate_lift
+
+READERS = {
+    'lift': lambda path, stats: lift.iter_records(path, stats=stats),
+    'configured': lambda path, stats: configured.iter_items(path, stats=stats),
+}
+
+
+def read(engine, kind, path):
+    engines.use(engine)
+    stats = Stats()
+    start = time.perf_counter()
+    records = list(READERS[kind](path, stats))
+    return records, time.perf_counter() - start, stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Time the lxml and stdlib parser engines.')
+    parser.add_argument('--sizes', type=int, nargs='*', default=[10000, 100000], metavar='ENTRIES')
+    parser.add_argument('--configured', action='append', default=[], metavar='FILE',
+                        help='a configured-dictionary export to include (repeatable)')
+    parser.add_argument('--repeats', type=int, default=3)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    available = engines.available()
+    if 'lxml' not in available:
+        print("lxml is not installed: only the stdlib engine is measured")
+    with tempfile.TemporaryDirectory() as tmp:
+        inputs = [('lift', path) for path in sorted(glob.glob(os.path.join(ROOT, '*', '*.lift')))]
+        inputs += [('configured', path) for path in args.configured]
+        for size in args.sizes:
+            for kind, generate, ext in (('lift', generate_lift, '.lift'), ('configured', generate_configured, '.txt')):
+                path = os.path.join(tmp, f'synthetic-{size}{ext}')
+                generate(path, size, args.seed)
+                inputs.append((kind, path))
+
+        print(f"{'input':<36} {'records':>8} {'engine':<7} {'read s':>8} {'parse s':>8} {'total s':>8} {'speed-up':>9}")
+        for kind, path in inputs:
+            baseline = None
+            for engine in reversed(available):
+                runs = [read(engine, kind, path) for _ in range(args.repeats)]
+                total = statistics.median(elapsed for records, elapsed, stats in runs)
+                stage = {name: statistics.median(stats.stages[name].wall for records, elapsed, stats in runs)
+                         for name in ('read', 'parse')}
+                baseline = baseline or total
+                count = len(runs[0][0])
+                print(f"{os.path.basename(path):<36} {count:>8} {engine:<7} {stage['read']:>8.3f} "
+                      f"{stage['parse']:>8.3f} {total:>8.3f} {baseline / total:>8.2f}x")
+    engines.use('auto')
+    print("auto engine: " + ', '.join(f"{reader} {engines.current(reader)}" for reader in engines.AUTO))
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,165 @@
+"""Compare the per-entry CPU cost of the XPath extract_* functions with read_entry.
+
+The extract_* functions below are the element-tree lookups the verb and
+semantic converters made before the shared LIFT reader, kept here as the
+reference the visitor is timed against.
+
+Usage: python benchmarks/bench_entry_visitor.py [LIFT_FILE] [REPEATS]
+"""
+import argparse
+import os
+import re
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+LIFT_FILE = os.path.join(ROOT, 'verb-dictionary', 'dictionary-verb-20250513.lift')
+
+from ende_dictionary.lift import iter_entries, read_entry
+
+
+def clean_text(text):
+    """Clean text by removing extra whitespace and replacing underscores with spaces."""
+    if text:
+        text = re.sub(r'\s+', ' ', text.strip())
+        return text.replace('_', ' ')
+    return ''
+
+
+def extract_headword(entry):
+    """Extract the headword (analytic non-plural) from lexical-unit."""
+    lexical_unit = entry.find('lexical-unit')
+    if lexical_unit is not None:
+        form = lexical_unit.find("./form[@lang='kit']/text")
+        return clean_text(form.text) if form is not None and form.text else ''
+    return ''
+
+
+def extract_analytic_plural(entry):
+    """Extract all analytic plural forms from variants, joined by commas."""
+    variants = entry.findall('variant')
+    plurals = []
+    for variant in variants:
+        env = variant.find("./trait[@name='environment'][@value='analytic plural']")
+        if env is not None:
+            form = variant.find("./form[@lang='kit']/text")
+            if form is not None and form.text:
+                plurals.append(clean_text(form.text))
+    return ', '.join(plurals) if plurals else '[]'
+
+
+def extract_definition(entry):
+    """Extract definition or gloss, concatenated with commas."""
+    senses = entry.findall('sense')
+    definitions = []
+    for sense in senses:
+        # Try definition first
+        def_form = sense.find("./definition/form[@lang='en']/text")
+        if def_form is not None and def_form.text:
+            definitions.append(clean_text(def_form.text))
+        else:
+            # Fallback to gloss
+            gloss = sense.find("./gloss[@lang='en']/text")
+            if gloss is not None and gloss.text:
+                definitions.append(clean_text(gloss.text))
+    return ', '.join(definitions) if definitions else ''
+
+
+def extract_verb_class(entry):
+    """Extract verb inflection class."""
+    sense = entry.find('sense')
+    if sense is not None:
+        trait = sense.find("./grammatical-info/trait[@name='Verb-infl-class']")
+        if trait is not None:
+            return trait.get('value', 'Irregular')
+    return 'Irregular'
+
+
+def extract_examples(entry):
+    """Extract example sentences and their translations."""
+    examples = entry.findall('sense/example')
+    example_list = []
+    for ex in examples:
+        sentence = ex.find("./form[@lang='kit']/text")
+        translation = ex.find("./translation[@type='Free translation']/form[@lang='en']/text")
+        sentence_text = clean_text(sentence.text) if sentence is not None and sentence.text else ''
+        trans_text = clean_text(translation.text) if translation is not None and translation.text else ''
+        if sentence_text and trans_text:  # Only include complete examples
+            example_list.append({'sentence': sentence_text, 'translation': trans_text})
+    return example_list
+
+
+def extract_senses(entry):
+    """Extract senses with part of speech, definition, and semantic domains."""
+    senses = entry.findall('sense')
+    sense_data = []
+    for i, sense in enumerate(senses, 1):
+        # Part of speech
+        pos = sense.find('grammatical-info')
+        pos_text = clean_text(pos.get('value')) if pos is not None else ''
+
+        # Definition or gloss
+        def_form = sense.find("./definition/form[@lang='en']/text")
+        definition = clean_text(def_form.text) if def_form is not None and def_form.text else ''
+        if not definition:
+            gloss = sense.find("./gloss[@lang='en']/text")
+            definition = clean_text(gloss.text) if gloss is not None and gloss.text else ''
+
+        # Semantic domains
+        domains = [clean_text(trait.get('value')) for trait in sense.findall("./trait[@name='semantic-domain-ddp4']")]
+
+        sense_data.append({
+            'sense_number': i,
+            'pos': pos_text,
+            'definition': definition,
+            'domains': domains
+        })
+    return sense_data
+
+
+
+def xpath_fields(entry):
+    """Everything both converters pulled out of an entry before the visitor."""
+    return (
+        extract_verb_class(entry),
+        extract_headword(entry),
+        extract_analytic_plural(entry),
+        extract_definition(entry),
+        extract_examples(entry),
+        extract_senses(entry),
+    )
+
+
+def visitor_fields(entry):
+    return read_entry(entry)
+
+
+def cpu_per_entry(func, entries, repeats):
+    best = None
+    for _ in range(repeats):
+        start = time.process_time()
+        for entry in entries:
+            func(entry)
+        elapsed = time.process_time() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best / len(entries)
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Time the XPath extract_* functions against read_entry.')
+    parser.add_argument('lift_file', nargs='?', default=LIFT_FILE,
+                        help="LIFT export to read (default the repo's verb export)")
+    parser.add_argument('repeats', nargs='?', type=int, default=5, help='timed runs, best taken (default 5)')
+    args = parser.parse_args()
+    repeats = args.repeats
+    entries = list(iter_entries(args.lift_file, stream=False))
+
+    xpath = cpu_per_entry(xpath_fields, entries, repeats)
+    visitor = cpu_per_entry(visitor_fields, entries, repeats)
+    print(f"{len(entries)} entries, best of {repeats}")
+    print(f"XPath extract_* functions: {xpath * 1e6:8.1f} us/entry")
+    print(f"read_entry visitor:        {visitor * 1e6:8.1f} us/entry")
+    print(f"speed-up:                  {xpath / visitor:8.2f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,57 @@
+"""Microbenchmark for ende_dictionary.latex.escape_latex.
+
+Escapes every headword, POS label, definition and domain name the semantic
+converter emits for the repo's LIFT export, and compares the old ten-pass
+str.replace chain with the single-pass compiled alternation, uncached
+and cached.
+
+Usage: python benchmarks/bench_escape.py [LIFT_FILE] [REPEATS]
+"""
+import argparse
+import os
+import timeit
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+LIFT_FILE = os.path.join(ROOT, 'verb-dictionary', 'dictionary-verb-20250513.lift')
+
+from ende_dictionary import semantic
+from ende_dictionary.latex import escape_latex
+
+
+def replace_chain(text):
+    """The escape_latex convert_dictionary.py used before the shared one."""
+    replacements = {
+        '&': r'\&', '%': r'\%', '$': r'\$', '#': r'\#', '_': r'\_',
+        '{': r'\{', '}': r'\}', '~': r'\textasciitilde', '^': r'\textasciicircum',
+        '\\': r'\textbackslash'
+    }
+    for char, escape in replacements.items():
+        text = text.replace(char, escape)
+    return text
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Time escape_latex on the strings the semantic converter emits.')
+    parser.add_argument('lift_file', nargs='?', default=LIFT_FILE,
+                        help="LIFT export to read (default the repo's verb export)")
+    parser.add_argument('repeats', nargs='?', type=int, default=20, help='timed runs, best taken (default 20)')
+    args = parser.parse_args()
+    repeats = args.repeats
+    strings = []
+    for domain, entries in semantic.parse_lift_file(args.lift_file).items():
+        for entry in entries:
+            strings.extend((domain, entry.headword, entry.pos, entry.definition))
+    distinct = len(set(strings))
+
+    uncached = escape_latex.__wrapped__
+    candidates = [('str.replace chain', replace_chain),
+                  ('compiled alternation', uncached),
+                  ('alternation + LRU cache', escape_latex)]
+    print(f"{len(strings)} strings ({distinct} distinct), best of {repeats}")
+    for name, func in candidates:
+        best = min(timeit.repeat(lambda: [func(s) for s in strings], number=1, repeat=repeats))
+        print(f"{name:24} {best / len(strings) * 1e9:8.1f} ns/string")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""Export times of the JSON Lines and SQLite backends (ende_dictionary.export).
+
+Builds the grouped sections the converters would for a lexicon of SENSES
+senses (one million by default) directly in memory: domain sections with
+every sense listed under one to three of the synthetic DDP4 domains, and
+verb-class sections with one verb per two senses and up to two examples
+each. Both are then exported to each format and the time, record count
+and file size printed; the SQLite databases are checked by querying an
+indexed column.
+
+Usage: python benchmarks/bench_export.py [SENSES] [--seed N]
+"""
+import argparse
+import os
+import random
+import sqlite3
+import tempfile
+import time
+from collections import defaultdict
+
+from ende_dictionary.domains import DomainTrie
+from ende_dictionary.export import export_sections
+from ende_dictionary.grouped import VERB_CLASSES, DomainSense, VerbItem
+from ende_dictionary.lift import LiftExample
+from synthetic import DOMAINS, ENGLISH, POS, _gloss, _sentence, _word
+
+
+def synthetic_sections(senses, seed=0):
+    rng = random.Random(seed)
+    domain_groups = defaultdict(list)
+    verb_groups = defaultdict(list)
+    for number in range(0, senses, 2):
+        headword = f'{_word(rng)}{number // 2}'
+        for sense_number in (1, 2):
+            sense = DomainSense(headword, rng.choice(POS), sense_number, _gloss(rng))
+            for domain in rng.sample(DOMAINS, rng.randint(1, 3)):
+                domain_groups[domain].append(sense)
+        examples = [LiftExample(_sentence(rng), rng.choice(ENGLISH)) for _ in range(rng.randint(0, 2))]
+        verb_groups[rng.choice(VERB_CLASSES)].append(VerbItem(headword, _word(rng), _gloss(rng), examples))
+    verb_sections = [(verb_class, sorted(verb_groups[verb_class], key=lambda entry: entry.headword))
+                     for verb_class in VERB_CLASSES]
+    return verb_sections, DomainTrie.from_groups(domain_groups).flat_sections
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Time the JSON Lines and SQLite export backends.')
+    parser.add_argument('senses', nargs='?', type=int, default=1000000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    verb_sections, domain_sections = synthetic_sections(args.senses, args.seed)
+    print(f"{args.senses} senses built in {time.perf_counter() - start:.1f} s")
+    print(f"{'sections':<9} {'format':<7} {'records':>9} {'seconds':>8} {'MB':>7}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for kind, sections in (('domain', domain_sections), ('verb', verb_sections)):
+            for fmt in ('jsonl', 'sqlite'):
+                path = os.path.join(tmp, f'{kind}.{fmt}')
+                start = time.perf_counter()
+                count = export_sections(fmt, kind, sections, path)
+                elapsed = time.perf_counter() - start
+                print(f"{kind:<9} {fmt:<7} {count:>9} {elapsed:>8.2f} {os.path.getsize(path) / 1e6:>7.1f}")
+        with sqlite3.connect(os.path.join(tmp, 'domain.sqlite')) as connection:
+            start = time.perf_counter()
+            (rows,) = connection.execute('SELECT count(*) FROM sense_domains JOIN domains ON domain_id = id '
+                                         'WHERE domain = ?', (DOMAINS[0],)).fetchone()
+            print(f"indexed lookup: {rows} senses in {DOMAINS[0]!r} in "
+                  f"{(time.perf_counter() - start) * 1000:.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
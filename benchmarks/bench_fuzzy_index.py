@@ -0,0 +1,121 @@
+"""Build, load and lookup times of the approximate-match index of Ende forms.
+
+FORMS synthetic forms (100k by default) of 2 to 5 of the Ende-like
+syllables of benchmarks/synthetic.py are filed as headwords, allomorphs,
+analytic plurals and variants of about half as many entries. With only 21
+syllables that is a far denser lexicon than a real one: lookup time grows
+with the number of forms near the query, and --syllables 2 4 (half of all
+possible forms taken) shows the worst case. Queries are
+indexed forms with zero, one or two random edits, plus random strings that
+mostly match nothing. For a sample of the queries the index's answer is
+checked against a brute-force scan of every form.
+
+Usage: python benchmarks/bench_fuzzy_index.py [FORMS] [--syllables LOW HIGH] [--queries N] [--seed N]
+"""
+import argparse
+import os
+import random
+import statistics
+import tempfile
+import time
+
+from ende_dictionary.fuzzy_index import KINDS, FuzzyIndex, edit_distance, normalize, write_index
+from synthetic import SYLLABLES, _word
+
+LETTERS = sorted(set(''.join(SYLLABLES)))
+
+
+def synthetic_forms(count, rng, low=2, high=5):
+    """count distinct (form, kind, headword) triples of low to high syllables, about two forms per entry."""
+    words = set()
+    while len(words) < count:
+        words.add(_word(rng, low, high))
+    words = sorted(words)
+    rng.shuffle(words)
+    forms = []
+    headword = None
+    for word in words:
+        if headword is None or rng.random() < 0.5:
+            headword = word
+            forms.append((word, 'headword', word))
+        else:
+            forms.append((word, rng.choice(KINDS[1:]), headword))
+    return forms
+
+
+def edited(word, edits, rng):
+    for _ in range(edits):
+        i = rng.randrange(len(word) + 1)
+        operation = rng.choice(('insert', 'delete', 'replace')) if word else 'insert'
+        if operation == 'insert':
+            word = word[:i] + rng.choice(LETTERS) + word[i:]
+        elif i < len(word):
+            word = word[:i] + (rng.choice(LETTERS) if operation == 'replace' else '') + word[i + 1:]
+    return word
+
+
+def brute_force(query, normalized, limit):
+    query = normalize(query)
+    return sorted({form for form in normalized if edit_distance(query, form, limit) <= limit})
+
+
+def timed(index, queries, repeat=3):
+    """Per-query lookup times in microseconds."""
+    times = []
+    for query in queries:
+        best = None
+        for _ in range(repeat):
+            start = time.perf_counter()
+            index.lookup(query)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        times.append(best * 1e6)
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Time the approximate-match index of Ende forms.')
+    parser.add_argument('forms', nargs='?', type=int, default=100000)
+    parser.add_argument('--syllables', type=int, nargs=2, default=[2, 5], metavar=('LOW', 'HIGH'))
+    parser.add_argument('--queries', type=int, default=500)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    forms = synthetic_forms(args.forms, rng, *args.syllables)
+    words = [form for form, _, _ in forms]
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'ende.fuzzy')
+        start = time.perf_counter()
+        write_index(forms, path)
+        print(f"{len(forms)} forms indexed in {time.perf_counter() - start:.1f} s, "
+              f"{os.path.getsize(path) / 1e6:.1f} MB")
+
+        start = time.perf_counter()
+        index = FuzzyIndex(path)
+        print(f"opened in {(time.perf_counter() - start) * 1000:.2f} ms")
+        with index:
+            cases = [(f'{edits} edit{"s" if edits != 1 else ""}',
+                      [edited(rng.choice(words), edits, rng) for _ in range(args.queries)])
+                     for edits in (0, 1, 2)]
+            cases.append(('random', [''.join(rng.choice(LETTERS) for _ in range(rng.randint(4, 10)))
+                                     for _ in range(args.queries)]))
+
+            normalized = sorted({normalize(word) for word in words})
+            for name, queries in cases:
+                for query in queries[:20]:
+                    got = sorted({normalize(match.form) for match in index.lookup(query)})
+                    if got != brute_force(query, normalized, index.max_distance):
+                        raise SystemExit(f"lookup({query!r}) disagrees with a brute-force scan")
+            print("lookups agree with a brute-force scan on a sample of every query kind")
+
+            print(f"{'queries':<10} {'matches':>8} {'mean us':>9} {'p50 us':>8} {'p99 us':>8}")
+            for name, queries in cases:
+                times = timed(index, queries)
+                matches = statistics.mean(len(index.lookup(query)) for query in queries)
+                print(f"{name:<10} {matches:>8.1f} {statistics.mean(times):>9.1f} "
+                      f"{statistics.median(times):>8.1f} {sorted(times)[int(len(times) * 0.99)]:>8.1f}")
+
+
+if __name__ == '__main__':
+    main()
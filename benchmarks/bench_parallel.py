@@ -0,0 +1,71 @@
+"""Time serial against --jobs N section rendering for the verb and semantic converters.
+
+The repo's LIFT export is replicated COPIES times (with distinct headwords)
+to get a build-sized input. Every parallel run is checked to be
+byte-identical to the serial one.
+
+Usage: python benchmarks/bench_parallel.py [COPIES] [JOBS ...]
+"""
+import argparse
+import copy
+import os
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+
+from ende_dictionary import semantic
+from ende_dictionary import verbs as verb
+
+LIFT_FILE = os.path.join(ROOT, 'verb-dictionary', 'dictionary-verb-20250513.lift')
+
+
+def renamed(item, headword):
+    item = copy.copy(item)
+    item.headword = headword
+    return item
+
+
+def replicate(groups, copies):
+    """Return groups with every item repeated copies times under a numbered headword."""
+    bigger = {}
+    for key, items in groups.items():
+        bigger[key] = [renamed(item, f"{item.headword}{n}")
+                       for n in range(copies) for item in items]
+    return bigger
+
+
+def time_generate(module, groups, jobs, out_dir):
+    path = os.path.join(out_dir, f'{module.__name__}-{jobs}.tex')
+    start = time.perf_counter()
+    module.generate_latex(groups, path, jobs)
+    elapsed = time.perf_counter() - start
+    with open(path, 'rb') as f:
+        return elapsed, f.read()
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Time serial against parallel section rendering.')
+    parser.add_argument('copies', nargs='?', type=int, default=200,
+                        help="times the repo's LIFT export is replicated (default 200)")
+    parser.add_argument('jobs', nargs='*', type=int, default=[2, 4, 8],
+                        help='worker counts to time against serial rendering (default 2 4 8)')
+    args = parser.parse_args()
+    copies = args.copies
+    jobs_list = args.jobs
+    print(f"{os.cpu_count()} CPU(s) available")
+    with tempfile.TemporaryDirectory() as out_dir:
+        for module in (verb, semantic):
+            groups = replicate(module.parse_lift_file(LIFT_FILE), copies)
+            count = sum(len(items) for items in groups.values())
+            serial, expected = time_generate(module, groups, 1, out_dir)
+            print(f"{module.__name__}: {len(groups)} sections, {count} items")
+            print(f"  jobs=1  {serial:7.3f} s")
+            for jobs in jobs_list:
+                elapsed, output = time_generate(module, groups, jobs, out_dir)
+                assert output == expected, f"jobs={jobs} output differs from serial"
+                print(f"  jobs={jobs:<2} {elapsed:7.3f} s  {serial / elapsed:5.2f}x")
+
+
+if __name__ == '__main__':
+    main()
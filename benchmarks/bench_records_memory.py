@@ -0,0 +1,129 @@
+"""Compare the memory held by dict and slot records in the grouped outputs.
+
+Generates a synthetic LIFT export of ENTRIES entries (default 100000),
+parses it once, then builds the verb-class and semantic-domain groups
+twice under tracemalloc: with the per-item dicts the converters used to
+build (one dict per domain a sense is listed under, one dict per example)
+and with the shared ende_dictionary.grouped records the converters build
+now. Parsed records are allocated before tracing starts, so only the
+grouping itself is measured. Also reports how many distinct label string
+objects the parsed senses hold, to show the readers' interning.
+
+Usage: python benchmarks/bench_records_memory.py [ENTRIES] [--seed N]
+"""
+import argparse
+import gc
+import os
+import tempfile
+import time
+import tracemalloc
+from collections import defaultdict
+
+from ende_dictionary import semantic
+from ende_dictionary import verbs as verb
+from ende_dictionary.lift import iter_records
+from synthetic import generate_lift
+
+
+def dict_verb_entry(record):
+    """verb.verb_entry as it was before the grouped records."""
+    verb_class = 'Irregular'
+    if record.senses and record.senses[0].verb_class is not None:
+        verb_class = record.senses[0].verb_class
+    if verb_class not in verb.VERB_CLASSES:
+        return None
+    analytic_plural = ', '.join(record.analytic_plurals) if record.analytic_plurals else '[]'
+    definitions = []
+    examples = []
+    for sense in record.senses:
+        definition = sense.definition if sense.definition is not None else sense.gloss
+        if definition is not None:
+            definitions.append(definition)
+        for example in sense.examples:
+            if example.sentence and example.translation:
+                examples.append({'sentence': example.sentence, 'translation': example.translation})
+    definition = ', '.join(definitions) if definitions else ''
+    if not (record.headword and definition):
+        return None
+    return verb_class, {'headword': record.headword, 'analytic_plural': analytic_plural,
+                        'definition': definition, 'examples': examples}
+
+
+def dict_domain_entries(record):
+    """semantic.domain_entries as it was before the grouped records."""
+    if not record.headword:
+        return
+    for i, sense in enumerate(record.senses, 1):
+        definition = sense.definition or sense.gloss or ''
+        for domain in sense.domains:
+            if domain:
+                yield domain, {'headword': record.headword, 'pos': sense.pos,
+                               'sense_number': i, 'definition': definition}
+
+
+def group_verbs(records, entry):
+    groups = defaultdict(list)
+    for record in records:
+        item = entry(record)
+        if item:
+            groups[item[0]].append(item[1])
+    return groups
+
+
+def group_domains(records, entries):
+    groups = defaultdict(list)
+    for record in records:
+        for domain, item in entries(record):
+            groups[domain].append(item)
+    return groups
+
+
+def traced(build):
+    """Return (result, bytes still allocated, peak bytes, seconds) for build()."""
+    gc.collect()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = build()
+    elapsed = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, current, peak, elapsed
+
+
+def label_objects(records):
+    """(references, distinct values, distinct objects) over every sense's POS and domain labels."""
+    labels = [label for record in records for sense in record.senses
+              for label in (sense.pos, *sense.domains)]
+    return len(labels), len(set(labels)), len({id(label) for label in labels})
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Measure dict against slot records for the grouped outputs.')
+    parser.add_argument('entries', nargs='?', type=int, default=100000)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, 'synthetic.lift')
+        generate_lift(path, args.entries, args.seed)
+        records = list(iter_records(path))
+
+    references, values, objects = label_objects(records)
+    print(f"{len(records)} entries; {references} POS/domain labels, "
+          f"{values} distinct values held in {objects} string objects")
+    print(f"{'output':<10} {'records':<6} {'items':>8} {'held MB':>9} {'peak MB':>9} {'time s':>8}")
+    cases = [
+        ('verb', 'dict', lambda: group_verbs(records, dict_verb_entry)),
+        ('verb', 'slots', lambda: group_verbs(records, verb.verb_entry)),
+        ('semantic', 'dict', lambda: group_domains(records, dict_domain_entries)),
+        ('semantic', 'slots', lambda: group_domains(records, semantic.domain_entries)),
+    ]
+    for output, kind, build in cases:
+        groups, current, peak, elapsed = traced(build)
+        items = sum(len(entries) for entries in groups.values())
+        print(f"{output:<10} {kind:<6} {items:>8} {current / 1e6:>9.1f} {peak / 1e6:>9.1f} {elapsed:>8.2f}")
+        del groups
+
+
+if __name__ == '__main__':
+    main()
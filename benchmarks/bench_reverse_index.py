@@ -0,0 +1,83 @@
+"""Build, load and query times of the English-to-Ende reverse index.
+
+SENSES synthetic senses (100k by default) get two to eight English words
+each, drawn from a 30k-word vocabulary with Zipf frequencies so postings
+range from thousands of senses for the commonest words to one for the
+rarest, as in a real lexicon. The mapped index is then timed on exact,
+prefix and two-word AND queries over words of every frequency.
+
+Usage: python benchmarks/bench_reverse_index.py [SENSES]
+"""
+import argparse
+import itertools
+import os
+import random
+import tempfile
+import time
+
+from ende_dictionary.reverse_index import ReverseIndex, write_index
+
+VOCABULARY = 30000
+LETTERS = 'abcdefghijklmnopqrstuvwxyz'
+
+
+def vocabulary(rng, size):
+    words = set()
+    while len(words) < size:
+        words.add(''.join(rng.choice(LETTERS) for _ in range(rng.randint(3, 9))))
+    return sorted(words)
+
+
+def synthetic_senses(count, seed=0):
+    rng = random.Random(seed)
+    words = vocabulary(rng, VOCABULARY)
+    rng.shuffle(words)
+    weights = list(itertools.accumulate(1 / rank for rank in range(1, len(words) + 1)))
+    senses = []
+    for number in range(count):
+        terms = set(rng.choices(words, cum_weights=weights, k=rng.randint(2, 8)))
+        senses.append((f'hw{number // 2:06d}', f'sense-{number}', terms))
+    senses.sort(key=lambda sense: sense[0])
+    return words, senses
+
+
+def per_query(func, queries, repeat=5):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        for query in queries:
+            func(query)
+    return (time.perf_counter() - start) / (repeat * len(queries)) * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Time the English-to-Ende reverse index.')
+    parser.add_argument('senses', nargs='?', type=int, default=100000,
+                        help='synthetic senses to index (default 100000)')
+    count = parser.parse_args().senses
+    words, senses = synthetic_senses(count)
+    # Query words sampled across the frequency range: common, middling and rare
+    samples = words[:20] + words[1000:1020] + words[-20:]
+    pairs = [f'{a} {b}' for a, b in zip(samples, reversed(samples))]
+    with tempfile.TemporaryDirectory() as tmp:
+        index_file = os.path.join(tmp, 'ende.idx')
+        start = time.perf_counter()
+        write_index(senses, index_file)
+        print(f"write  {time.perf_counter() - start:8.2f} s   {count} senses, "
+              f"{os.path.getsize(index_file) / 1024:.0f} KB")
+
+        start = time.perf_counter()
+        index = ReverseIndex(index_file)
+        print(f"load   {(time.perf_counter() - start) * 1e6:8.1f} us  {index.term_count} terms")
+
+        with index:
+            hits = sum(len(index.exact(word)) for word in samples) / len(samples)
+            print(f"exact  {per_query(index.exact, samples):8.1f} us  avg {hits:.0f} hits")
+            print(f"  rare {per_query(index.exact, words[-20:]):8.1f} us")
+            print(f"  top  {per_query(lambda q: index.exact(q, limit=20), samples):8.1f} us  first 20 hits")
+            print(f"prefix {per_query(lambda q: index.prefix(q[:4], limit=20), samples):8.1f} us  first 20 hits")
+            print(f"AND    {per_query(lambda q: index.search(q, limit=20), pairs):8.1f} us  first 20 hits")
+            print(f"miss   {per_query(index.exact, ['zzzzzzzzzz', 'q', 'aardvarks']):8.1f} us")
+
+
+if __name__ == '__main__':
+    main()
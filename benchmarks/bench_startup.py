@@ -0,0 +1,78 @@
+"""Start-up time of the package and its command line.
+
+Runs each command REPEATS times (15 by default) in a fresh interpreter and
+prints the median wall time, the time over a bare interpreter, and which
+of the heavy modules it imported: the LIFT reader's ElementTree, the
+configured reader's html.parser, lxml (the faster engine for both, when
+installed), multiprocessing (only needed for --jobs) and sqlite3 (only
+needed for --format sqlite). The last rows run complete
+conversions of the repo's verb export, through the command line and
+through the legacy script, to put the start-up cost in proportion.
+
+Usage: python benchmarks/bench_startup.py [REPEATS]
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir))
+LIFT_FILE = os.path.join(ROOT, 'verb-dictionary', 'dictionary-verb-20250513.lift')
+VERB_SCRIPT = os.path.join(ROOT, 'verb-dictionary', 'convert_verb_dictionary.py')
+HEAVY = ('xml.etree.ElementTree', 'html.parser', 'lxml.etree', 'multiprocessing', 'sqlite3')
+
+
+def commands(out_dir):
+    output = os.path.join(out_dir, 'verb-dictionary.tex')
+    convert = [LIFT_FILE, '-o', output, '--no-snapshot', '--summary', 'none']
+    return [
+        ('python -c pass', ['-c', 'pass']),
+        ('import ende_dictionary', ['-c', 'import ende_dictionary']),
+        ('cli --help', ['-m', 'ende_dictionary', '--help']),
+        ('verbs --help', ['-m', 'ende_dictionary', 'verbs', '--help']),
+        ('dictionary --help', ['-m', 'ende_dictionary', 'dictionary', '--help']),
+        ('build --help', ['-m', 'ende_dictionary', 'build', '--help']),
+        ('verbs (convert)', ['-m', 'ende_dictionary', 'verbs'] + convert),
+        ('verb script (convert)', [VERB_SCRIPT] + convert),
+    ]
+
+
+def run(args):
+    start = time.perf_counter()
+    subprocess.run([sys.executable] + args, cwd=ROOT, check=True,
+                   stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    return time.perf_counter() - start
+
+
+def heavy_imports(args):
+    """The HEAVY modules a command imports, read from -X importtime."""
+    result = subprocess.run([sys.executable, '-X', 'importtime'] + args, cwd=ROOT, check=True,
+                            stdout=subprocess.DEVNULL, stderr=subprocess.PIPE, text=True)
+    imported = {line.rsplit('|', 1)[-1].strip() for line in result.stderr.splitlines()
+                if line.startswith('import time:')}
+    return [name for name in HEAVY if name in imported]
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Time the start-up of the package and its command line.')
+    parser.add_argument('repeats', nargs='?', type=int, default=15,
+                        help='runs of each command, median taken (default 15)')
+    repeats = parser.parse_args().repeats
+    with tempfile.TemporaryDirectory() as tmp:
+        cases = commands(tmp)
+        baseline = None
+        print(f"{'command':<24} {'median ms':>10} {'over python':>12}  heavy imports")
+        for name, args in cases:
+            run(args)  # warm the file cache and the bytecode
+            median = statistics.median(run(args) for _ in range(repeats)) * 1000
+            if baseline is None:
+                baseline = median
+            print(f"{name:<24} {median:>10.1f} {median - baseline:>12.1f}  "
+                  f"{', '.join(heavy_imports(args)) or '-'}")
+
+
+if __name__ == '__main__':
+    main()
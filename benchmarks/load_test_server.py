@@ -0,0 +1,135 @@
+"""Load-test the lookup server (ende_dictionary.server) on localhost.
+
+Either points at a running instance (--port) or starts one on the given
+LIFT export (--serve). Query targets are drawn from the lexicon itself:
+mostly headword lookups, plus verb-class, part-of-speech and domain
+filters, with a skewed choice so some queries are hot. CONCURRENCY
+keep-alive connections send REQUESTS requests in total; latency
+percentiles, throughput and the server's cache counters are printed.
+
+Usage: python benchmarks/load_test_server.py --serve dictionary-verb-20250513.lift [-n 20000] [-c 50]
+"""
+import argparse
+import asyncio
+import json
+import os
+import random
+import subprocess
+import sys
+import time
+from urllib.parse import quote
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+
+from ende_dictionary.grouped import VERB_CLASSES
+
+
+async def request(reader, writer, target):
+    """Send one keep-alive GET and return (status, body)."""
+    writer.write(f"GET {target} HTTP/1.1\r\nHost: localhost\r\n\r\n".encode('latin-1'))
+    status_line = await reader.readline()
+    length = 0
+    while True:
+        line = await reader.readline()
+        if line in (b'\r\n', b''):
+            break
+        name, _, value = line.decode('latin-1').partition(':')
+        if name.lower() == 'content-length':
+            length = int(value)
+    body = await reader.readexactly(length)
+    return int(status_line.split()[1]), body
+
+
+async def fetch(host, port, target):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        return await request(reader, writer, target)
+    finally:
+        writer.close()
+
+
+async def query_mix(host, port, count, seed):
+    """Build count request targets from the entries the server holds."""
+    status, body = await fetch(host, port, '/entries?limit=1000')
+    entries = json.loads(body)['entries']
+    headwords = [entry['headword'] for entry in entries]
+    domains = sorted({domain for entry in entries for sense in entry['senses'] for domain in sense['domains']})
+    parts_of_speech = sorted({sense['pos'] for entry in entries for sense in entry['senses'] if sense['pos']})
+    rng = random.Random(seed)
+    targets = []
+    for _ in range(count):
+        kind = rng.random()
+        if kind < 0.7:
+            # Skewed towards the start of the list so a few headwords are hot
+            targets.append('/entries/' + quote(headwords[int(len(headwords) * rng.random() ** 3)]))
+        elif kind < 0.8:
+            targets.append(f'/entries?verb_class={quote(rng.choice(VERB_CLASSES))}&limit=20')
+        elif kind < 0.9 and parts_of_speech:
+            targets.append(f'/entries?pos={quote(rng.choice(parts_of_speech))}&limit=20')
+        elif domains:
+            targets.append(f'/entries?domain={quote(rng.choice(domains))}&limit=20')
+        else:
+            targets.append('/entries/' + quote(rng.choice(headwords)))
+    return targets
+
+
+async def client(host, port, targets, latencies):
+    reader, writer = await asyncio.open_connection(host, port)
+    try:
+        for target in targets:
+            start = time.perf_counter()
+            await request(reader, writer, target)
+            latencies.append(time.perf_counter() - start)
+    finally:
+        writer.close()
+
+
+def percentile(values, fraction):
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+async def run(host, port, requests, concurrency, seed):
+    targets = await query_mix(host, port, requests, seed)
+    latencies = []
+    start = time.perf_counter()
+    await asyncio.gather(*(client(host, port, targets[i::concurrency], latencies)
+                           for i in range(concurrency)))
+    elapsed = time.perf_counter() - start
+    latencies.sort()
+    print(f"{len(latencies)} requests over {concurrency} connections in {elapsed:.2f} s: "
+          f"{len(latencies) / elapsed:.0f} req/s")
+    print(f"latency  p50 {percentile(latencies, 0.5) * 1000:.2f} ms  p90 {percentile(latencies, 0.9) * 1000:.2f} ms  "
+          f"p99 {percentile(latencies, 0.99) * 1000:.2f} ms  max {latencies[-1] * 1000:.2f} ms")
+    status, body = await fetch(host, port, '/stats')
+    print(f"server   {json.loads(body)['cache']}")
+
+
+def start_server(lift_file, port):
+    process = subprocess.Popen([sys.executable, '-m', 'ende_dictionary.server', lift_file, '--port', str(port)],
+                               cwd=ROOT, stderr=subprocess.PIPE, text=True)
+    # The server reports on stderr once it is listening
+    print(process.stderr.readline().strip())
+    return process
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Load-test the dictionary lookup server.')
+    parser.add_argument('--serve', metavar='LIFT', help='start a server on this LIFT export for the test')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('-n', '--requests', type=int, default=20000)
+    parser.add_argument('-c', '--concurrency', type=int, default=50)
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+
+    process = start_server(os.path.abspath(args.serve), args.port) if args.serve else None
+    try:
+        asyncio.run(run(args.host, args.port, args.requests, args.concurrency, args.seed))
+    finally:
+        if process is not None:
+            process.terminate()
+            process.wait()
+
+
+if __name__ == '__main__':
+    main()
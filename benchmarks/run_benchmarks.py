@@ -0,0 +1,155 @@
+"""Time every converter's parse and emit stages on synthetic exports.
+
+parse_s and emit_s cover the converter's parse and emit calls; 'stages'
+breaks them down into the read/parse/group/sort/emit stages of
+ende_dictionary.instrument. Inputs come from benchmarks/synthetic.py and are cached in the data
+directory by (kind, size, seed). Each (converter, size) pair runs in its own
+subprocess so the reported peak RSS belongs to that run alone. Results are
+written as JSON together with the commit they were measured on, and a
+previous results file can be passed with --compare to print the ratios.
+
+    python benchmarks/run_benchmarks.py [--sizes 10000 100000 1000000] [-o results.json]
+
+Results go to benchmarks/benchmark-results.json unless -o names another file.
+    python benchmarks/run_benchmarks.py --sizes 10000 --compare old.json
+"""
+import argparse
+import json
+import logging
+import os
+import platform
+import resource
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+
+from ende_dictionary.instrument import Stats
+from synthetic import GENERATORS
+
+# Converter name -> the synthetic export kind it reads
+CONVERTERS = {'verb': 'lift', 'semantic': 'lift', 'dictionary': 'configured', 'word_lists': 'configured'}
+EXTENSIONS = {'lift': '.lift', 'configured': '.txt'}
+DEFAULT_SIZES = [10000, 100000, 1000000]
+
+
+def _peak_rss_mb():
+    # ru_maxrss is in KiB on Linux and in bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def _stages(converter):
+    """Return (parse, emit) callables for a converter."""
+    if converter == 'verb':
+        from ende_dictionary import verbs as module
+        return module.parse_lift_file, module.generate_latex
+    if converter == 'semantic':
+        from ende_dictionary import semantic as module
+        return module.parse_lift_file, module.generate_latex
+    from ende_dictionary.configured import iter_items
+    if converter == 'dictionary':
+        from ende_dictionary.dictionary import write_dictionary as emit
+    else:
+        from ende_dictionary.word_lists import write_word_lists as emit
+    return (lambda path, stats: list(iter_items(path, stats=stats))), emit
+
+
+def run_one(converter, input_file, output_file):
+    """Parse and emit once in this process; return the measured stage times and peak RSS."""
+    logging.basicConfig(level=logging.ERROR)
+    parse, emit = _stages(converter)
+    stats = Stats()
+    start = time.perf_counter()
+    model = parse(input_file, stats=stats)
+    parsed = time.perf_counter()
+    emit(model, output_file, stats=stats)
+    emitted = time.perf_counter()
+    return {'parse_s': parsed - start, 'emit_s': emitted - parsed, 'peak_rss_mb': _peak_rss_mb(),
+            'stages': {name: timing['wall_s'] for name, timing in stats.as_dict()['stages'].items()}}
+
+
+def input_path(data_dir, kind, entries, seed):
+    """Path of the cached synthetic export, generating it on first use."""
+    path = os.path.join(data_dir, f'{kind}-{entries}-{seed}{EXTENSIONS[kind]}')
+    if not os.path.exists(path):
+        start = time.perf_counter()
+        GENERATORS[kind](path + '.partial', entries, seed)
+        os.replace(path + '.partial', path)
+        print(f"generated {path} in {time.perf_counter() - start:.1f} s", file=sys.stderr)
+    return path
+
+
+def _commit():
+    try:
+        return subprocess.run(['git', 'rev-parse', 'HEAD'], cwd=ROOT, capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def compare(old, new):
+    """Print new/old ratios for every (converter, entries) pair present in both result sets."""
+    previous = {(r['converter'], r['entries']): r for r in old['results']}
+    print(f"\ncompared with {old.get('commit') or 'unknown commit'} (ratio < 1 is better)")
+    for record in new['results']:
+        before = previous.get((record['converter'], record['entries']))
+        if before is None:
+            continue
+        ratios = '  '.join(f"{key} {record[key] / before[key]:5.2f}x"
+                           for key in ('parse_s', 'emit_s', 'peak_rss_mb') if before[key])
+        print(f"{record['converter']:<11} {record['entries']:>8}  {ratios}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark the converters on synthetic exports.')
+    parser.add_argument('--sizes', type=int, nargs='+', default=DEFAULT_SIZES)
+    parser.add_argument('--converters', nargs='+', choices=list(CONVERTERS), default=list(CONVERTERS))
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--data-dir', default=os.path.join(tempfile.gettempdir(), 'ende-benchmarks'),
+                        help='where generated inputs are cached')
+    parser.add_argument('-o', '--output', default=os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                                               'benchmark-results.json'),
+                        help='results file (default benchmarks/benchmark-results.json)')
+    parser.add_argument('--compare', metavar='OLD_JSON', help='print ratios against an earlier results file')
+    parser.add_argument('--worker', nargs=3, metavar=('CONVERTER', 'INPUT', 'OUTPUT'), help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.worker:
+        print(json.dumps(run_one(*args.worker)))
+        return
+
+    os.makedirs(args.data_dir, exist_ok=True)
+    results = []
+    print(f"{'converter':<11} {'entries':>8} {'parse s':>9} {'emit s':>9} {'peak MB':>9}")
+    with tempfile.TemporaryDirectory() as out_dir:
+        for entries in args.sizes:
+            for converter in args.converters:
+                kind = CONVERTERS[converter]
+                source = input_path(args.data_dir, kind, entries, args.seed)
+                output = os.path.join(out_dir, f'{converter}.tex')
+                worker = subprocess.run([sys.executable, os.path.abspath(__file__), '--worker',
+                                         converter, source, output],
+                                        capture_output=True, text=True, check=True)
+                record = {'converter': converter, 'entries': entries, 'seed': args.seed,
+                          'input_bytes': os.path.getsize(source)}
+                record.update(json.loads(worker.stdout.splitlines()[-1]))
+                results.append(record)
+                print(f"{converter:<11} {entries:>8} {record['parse_s']:9.3f} {record['emit_s']:9.3f} "
+                      f"{record['peak_rss_mb']:9.1f}")
+
+    report = {'commit': _commit(), 'python': platform.python_version(), 'platform': platform.platform(),
+              'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S%z'), 'results': results}
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    print(f"wrote {args.output}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            compare(json.load(f), report)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,172 @@
+"""Seeded generators for synthetic FLEx exports of any size.
+
+Both generators stream straight to disk, so million-entry files can be
+produced without holding them in memory. The same seed and size always
+give the same file.
+
+    python benchmarks/synthetic.py lift 100000 out.lift [--seed N]
+    python benchmarks/synthetic.py configured 100000 out.txt [--seed N]
+"""
+import argparse
+import random
+import uuid
+from xml.sax.saxutils import escape, quoteattr
+
+SYLLABLES = ['ba', 'bä', 'da', 'dd', 'gi', 'ka', 'kä', 'll', 'ma', 'mo', 'nge', 'ngä',
+             'pä', 'ro', 'sa', 'su', 'tt', 'wa', 'ye', 'yä', 'zo']
+GLOSS_WORDS = ['go', 'come', 'house', 'water', 'fire', 'sago', 'canoe', 'beat', 'dry', 'big',
+               'small', 'river', 'garden', 'fish', 'dog', 'sky', 'moon', 'walk', 'speak',
+               'cook', 'man', 'woman', 'child', 'tree', 'leaf', 'shine', 'break', 'open']
+ENGLISH = ['I saw it yesterday.', 'They went to the garden.', 'The water is very deep.',
+           'He beat the sago with the sago beater.', 'We will return home tomorrow.',
+           'The dog is always barking.', 'She cooked fish for the children.']
+POS = ['Noun', 'Intransitive S verb', 'Transitive S verb', 'Adverb', 'Adjective',
+       'Proper noun', 'Pronoun', 'Coordinating conjunction']
+POS_ABBR = ['n.', 'vi.', 'vt.', 'adv.', 'adj.', 'pn.', 'pro.', 'coord.', 'A vi.', 'B vt.']
+VERB_CLASSES = ['I', 'II', 'III', 'IV', 'Irregular']
+DOMAINS = ['1.1 Sky', '1.1.1 Sun', '1.1.1.1 Moon', '1.1.1.2 Star', '1.2 World',
+           '1.3 Water', '1.3.1 Bodies of water', '1.3.1.3 River', '1.5 Plant',
+           '1.5.1 Tree', '1.6 Animal', '1.6.1.1 Mammal', '2.1 Body', '2.3.1 See',
+           '5.2 Food', '5.2.1 Food preparation', '6.2 Agriculture', '6.6.5.1 Sago',
+           '7.2 Move', '7.2.1 Manner of movement', '8.1.1 Quantity', '9.2.2 Adjectives']
+
+
+def _word(rng, low=1, high=3):
+    return ''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(low, high)))
+
+
+def _gloss(rng):
+    return ' '.join(rng.choice(GLOSS_WORDS) for _ in range(rng.randint(1, 4)))
+
+
+def _sentence(rng):
+    words = ' '.join(_word(rng) for _ in range(rng.randint(2, 7)))
+    return words[0].upper() + words[1:] + '.'
+
+
+def _form(lang, text):
+    return f'<form lang="{lang}"><text>{escape(text)}</text></form>'
+
+
+def _lift_entry(rng):
+    guid = uuid.UUID(int=rng.getrandbits(128))
+    headword = _word(rng)
+    parts = [f'<entry dateCreated="2025-01-01T00:00:00Z" id="{headword}_{guid}" guid="{guid}">',
+             f'<lexical-unit>{_form("kit", headword)}</lexical-unit>',
+             '<trait name="morph-type" value="stem"/>']
+    for _ in range(rng.choice([0, 0, 1, 1, 2])):
+        environment = rng.choice(['analytic plural', 'analytic plural', 'dialect'])
+        parts.append(f'<variant>{_form("kit", headword + _word(rng, 1, 1))}'
+                     f'<trait name="environment" value="{environment}"/></variant>')
+    is_verb = rng.random() < 0.4
+    for _ in range(rng.choice([1, 1, 1, 2, 3])):
+        pos = rng.choice(POS[1:3]) if is_verb else rng.choice(POS)
+        sense = [f'<sense id="{uuid.UUID(int=rng.getrandbits(128))}">',
+                 f'<grammatical-info value="{pos}">']
+        if is_verb:
+            sense.append(f'<trait name="Verb-infl-class" value="{rng.choice(VERB_CLASSES)}"/>')
+        sense.append('</grammatical-info>')
+        gloss = _gloss(rng)
+        sense.append(f'<gloss lang="en"><text>{escape(gloss)}</text></gloss>')
+        if rng.random() < 0.9:
+            sense.append(f'<definition>{_form("en", "to " + gloss if is_verb else gloss)}</definition>')
+        for _ in range(rng.choice([0, 0, 1, 1, 2, 3])):
+            sense.append(f'<example>{_form("kit", _sentence(rng))}'
+                         f'<translation type="Free translation">{_form("en", rng.choice(ENGLISH))}</translation>'
+                         f'</example>')
+        for domain in rng.sample(DOMAINS, rng.choice([0, 1, 1, 2])):
+            sense.append(f'<trait name="semantic-domain-ddp4" value={quoteattr(domain)}/>')
+        sense.append('</sense>')
+        parts.append(''.join(sense))
+    parts.append('</entry>\n')
+    return ''.join(parts)
+
+
+def generate_lift(path, entries, seed=0):
+    """Write a LIFT export with the given number of entries to path."""
+    rng = random.Random(seed)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('<?xml version="1.0" encoding="UTF-8" ?>\n<lift producer="synthetic" version="0.13">\n'
+                '<header><ranges></ranges></header>\n')
+        for _ in range(entries):
+            f.write(_lift_entry(rng))
+        f.write('</lift>\n')
+
+
+def _span(cls, inner, **attrs):
+    extra = ''.join(f' {key}="{value}"' for key, value in attrs.items())
+    return f'<span class="{cls}"{extra}>{inner}</span>'
+
+
+def _lang(lang, text):
+    return f'<span lang="{lang}">{escape(text)}</span>'
+
+
+def _configured_entry(rng, letter):
+    guid = uuid.UUID(int=rng.getrandbits(128))
+    headword = letter + _word(rng)
+    if rng.random() < 0.08:
+        parts = _span('headword', _lang('kit', headword))
+        parts += _span('variantentrytypes', _span('variantentrytype', _span(
+            'reverseabbr', _lang('en', rng.choice(['var. of', 'dial. var. of'])))))
+        parts += _span('referencedentries', _span('referencedentry', _span('headword', _lang('kit', _word(rng)))))
+        return f'<div class="minorentryvariant" id="g{guid}">{parts}</div>\n'
+
+    parts = _span('mainheadword', _lang('kit', headword))
+    if rng.random() < 0.05:
+        parts += _span('etymologies', _span('etymology', _span('preccomment', _lang('en', 'from'))
+                                            + _span('name', _lang('en', 'Tok Pisin'))
+                                            + _span('form', _lang('tpi', _word(rng)))))
+    senses = _span('sharedgrammaticalinfo', _span('morphosyntaxanalysis', _span(
+        'partofspeech', _lang('en', rng.choice(POS_ABBR)))))
+    count = rng.choice([1, 1, 1, 2, 3])
+    for number in range(1, count + 1):
+        inner = _span('definitionorgloss', _lang('en', _gloss(rng)))
+        for _ in range(rng.choice([0, 0, 1, 2])):
+            example = _span('example', _lang('kit', _sentence(rng)))
+            translation = _span('translationcontents', _span('translationcontent', _span(
+                'translation', _lang('en', rng.choice(ENGLISH)))))
+            inner += _span('examplescontents', _span('examplescontent', example + translation))
+        sense_number = _span('sensenumber', str(number)) if count > 1 else ''
+        senses += _span('sensecontent', sense_number + _span('sense', inner, entryguid=f'g{guid}'))
+    parts += _span('senses', senses)
+    if rng.random() < 0.15:
+        parts += _span('allomorphs', _span('allomorph', _span('form', _lang('kit', _word(rng)))))
+    if rng.random() < 0.05:
+        parts += _span('subentries', _span('subentry', _span('headword', _lang('kit', headword + ' ' + _word(rng)))
+                                           + _span('definitionorgloss', _lang('en', _gloss(rng)))))
+    return f'<div class="entry" id="g{guid}">{parts}</div>\n'
+
+
+def generate_configured(path, entries, seed=0):
+    """Write a FLEx configured-dictionary HTML export with the given number of entries to path."""
+    rng = random.Random(seed)
+    letters = sorted({syllable[0] for syllable in SYLLABLES})
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write('<?xml version="1.0" encoding="utf-8"?><!DOCTYPE html>'
+                '<html xmlns="http://www.w3.org/1999/xhtml"><head><title>synthetic</title></head>'
+                '<body class="lexentry">\n')
+        for i, letter in enumerate(letters):
+            f.write(f'<div class="letHead"><span class="letter">{letter.upper()} {letter}</span></div>\n')
+            start = entries * i // len(letters)
+            end = entries * (i + 1) // len(letters)
+            for _ in range(start, end):
+                f.write(_configured_entry(rng, letter))
+        f.write('</body></html>\n')
+
+
+GENERATORS = {'lift': generate_lift, 'configured': generate_configured}
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Write a seeded synthetic LIFT or configured-HTML export.')
+    parser.add_argument('kind', choices=sorted(GENERATORS))
+    parser.add_argument('entries', type=int)
+    parser.add_argument('path')
+    parser.add_argument('--seed', type=int, default=0)
+    args = parser.parse_args()
+    GENERATORS[args.kind](args.path, args.entries, args.seed)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,9 @@
+"""Shared helpers for the Ende dictionary converters.
+
+The parse and emit functions below (see ende_dictionary.api) are the
+library interface; python -m ende_dictionary is the command line (see
+ende_dictionary.cli).
+"""
+from .api import emit_dictionary, emit_domains, emit_verbs, emit_word_lists, parse_configured, parse_lift
+
+__all__ = ['emit_dictionary', 'emit_domains', 'emit_verbs', 'emit_word_lists', 'parse_configured', 'parse_lift']
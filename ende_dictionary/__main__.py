@@ -0,0 +1,6 @@
+"""python -m ende_dictionary: see ende_dictionary.cli."""
+import sys
+
+from .cli import main
+
+sys.exit(main())
@@ -0,0 +1,72 @@
+"""Parse and emit functions for using the converters from Python.
+
+    import ende_dictionary as ende
+
+    records = ende.parse_lift('dictionary-verb-20250513.lift')
+    ende.emit_verbs(records, 'verb-dictionary.tex')
+
+    items = ende.parse_configured('dictionary-configured-20250509.txt')
+    ende.emit_dictionary(items, 'dictionary.tex')
+    ende.emit_word_lists(items, 'word_lists.tex')
+
+parse_lift returns LiftEntry records (ende_dictionary.lift) and
+parse_configured the LetterHead / ConfiguredEntry / MinorVariant items
+(ende_dictionary.configured); the emitters take those lists, so one parse
+can feed any number of outputs. Output files are paths, '-' for stdout or
+open text files. The readers' parser engine is chosen as described in
+ende_dictionary.engines. Each function imports the modules it needs when
+it is first called, so importing the package stays cheap.
+"""
+from .instrument import NULL_STATS
+
+
+def parse_lift(path, stats=NULL_STATS, use_snapshot=False):
+    """The LiftEntry records of a LIFT export, as a list; with use_snapshot via its .snapshot cache."""
+    from .snapshot import lift_records
+    return list(lift_records(path, stats=stats, use_snapshot=use_snapshot))
+
+
+def parse_configured(path, stats=NULL_STATS, use_snapshot=False):
+    """The items of a configured-dictionary export, as a list; with use_snapshot via its .snapshot cache."""
+    from .snapshot import configured_items
+    return list(configured_items(path, stats, use_snapshot))
+
+
+def emit_verbs(records, output_file, jobs=1, stats=NULL_STATS, fmt='latex'):
+    """Write the verb dictionary for LiftEntry records to output_file as fmt ('latex', 'jsonl' or 'sqlite')."""
+    from . import export, verbs
+    verb_groups = verbs.group_records(records, stats)
+    if fmt == 'latex':
+        verbs.generate_latex(verb_groups, output_file, jobs, stats)
+    else:
+        with stats.stage('sort'):
+            sections = verbs.class_sections(verb_groups)
+        export.export_sections(fmt, 'verb', sections, output_file, stats)
+
+
+def emit_domains(records, output_file, jobs=1, stats=NULL_STATS, fmt='latex', nested=False):
+    """Write the semantic-domain dictionary for LiftEntry records to output_file as fmt.
+
+    nested only applies to LaTeX; see ende_dictionary.semantic.generate_latex.
+    """
+    from . import export, semantic
+    domain_groups = semantic.group_records(records, stats)
+    if fmt == 'latex':
+        semantic.generate_latex(domain_groups, output_file, jobs, stats, nested)
+    else:
+        from .domains import DomainTrie
+        with stats.stage('sort'):
+            sections = DomainTrie.from_groups(domain_groups).flat_sections
+        export.export_sections(fmt, 'domain', sections, output_file, stats)
+
+
+def emit_dictionary(items, output_file, jobs=1, stats=NULL_STATS):
+    """Write the full dictionary for configured-export items to output_file."""
+    from .dictionary import write_dictionary
+    write_dictionary(items, output_file, jobs, stats)
+
+
+def emit_word_lists(items, output_file, jobs=1, stats=NULL_STATS):
+    """Write the part-of-speech word lists for configured-export items to output_file."""
+    from .word_lists import write_word_lists
+    write_word_lists(items, output_file, jobs, stats)
@@ -0,0 +1,124 @@
+"""Helpers for the binary files the package writes: index files and snapshots.
+
+The reverse, fuzzy and concordance indexes share one layout: a struct
+header, little-endian arrays and UTF-8 string blobs addressed through
+offset arrays. blob and little_endian encode the parts, MappedFile maps a
+finished file and slices the parts back out without copying them, and
+atomic_write gives every writer the same write-then-rename behaviour.
+"""
+import contextlib
+import mmap
+import os
+import struct
+import sys
+import tempfile
+from array import array
+
+
+def blob(strings):
+    """Concatenate strings as UTF-8, returning (offsets array, blob)."""
+    offsets = array('I', [0])
+    parts = []
+    size = 0
+    for text in strings:
+        data = text.encode('utf-8')
+        parts.append(data)
+        size += len(data)
+        offsets.append(size)
+    return offsets, b''.join(parts)
+
+
+def little_endian(values):
+    """The bytes of an array in little-endian order."""
+    if sys.byteorder != 'little':
+        values = array(values.typecode, values)
+        values.byteswap()
+    return values.tobytes()
+
+
+def replacement_mode(path):
+    """The permissions for a file replacing path: those of path, or the umask's for a new file."""
+    try:
+        return os.stat(path).st_mode & 0o7777
+    except FileNotFoundError:
+        # The umask can only be read by setting it
+        umask = os.umask(0)
+        os.umask(umask)
+        return 0o666 & ~umask
+
+
+@contextlib.contextmanager
+def atomic_write(path):
+    """Yield a temporary path next to path, which replaces path if the block completes.
+
+    The file gets path's permissions, or those of a normally created file
+    if path does not exist yet. If the block raises, the temporary file is
+    removed and path is left alone.
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    fd, tmp_path = tempfile.mkstemp(prefix='.' + os.path.basename(path) + '.', suffix='.tmp', dir=directory)
+    os.close(fd)
+    try:
+        yield tmp_path
+        os.chmod(tmp_path, replacement_mode(path))
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+
+class MappedFile:
+    """Read-only, memory-mapped view of a file of a header, arrays and blobs.
+
+    Subclasses unpack their header from _view and slice their parts out
+    with _arrays and _blobs, which keep track of the views close() has to
+    release. Use as a context manager, or call close(), to release the
+    mapping.
+    """
+
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = memoryview(self._mmap)
+        self._views = [self._view]
+
+    def _arrays(self, position, layout):
+        """The arrays of (typecode, count) layout stored from position on, and the position after them."""
+        arrays = []
+        for typecode, count in layout:
+            size = count * struct.calcsize(typecode)
+            values = self._view[position:position + size]
+            if sys.byteorder == 'little':
+                values = values.cast(typecode)
+                self._views.append(values)
+            else:
+                swapped = array(typecode)
+                swapped.frombytes(values)
+                swapped.byteswap()
+                values.release()
+                values = swapped
+            arrays.append(values)
+            position += size
+        return arrays, position
+
+    def _blobs(self, position, sizes):
+        """Views of the blobs of the given byte sizes stored from position on, and the position after them."""
+        blobs = []
+        for size in sizes:
+            blobs.append(self._view[position:position + size])
+            position += size
+        self._views += blobs
+        return blobs, position
+
+    def close(self):
+        for view in reversed(getattr(self, '_views', [])):
+            view.release()
+        self._views = []
+        self._mmap.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+        return False
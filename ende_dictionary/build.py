@@ -0,0 +1,88 @@
+"""Build every output of the configured export from a single parse.
+
+    python -m ende_dictionary build dictionary-configured-20250509.txt
+
+reads the export once into the shared entry model (see
+ende_dictionary.configured) and hands the same records to each registered
+emitter, so parse time is paid once per build rather than once per output.
+"""
+import argparse
+import os
+import sys
+import time
+
+from . import engines, instrument, snapshot
+from .emitters import EMITTERS
+# Imported for their @register_emitter side effect
+from . import dictionary, word_lists  # noqa: F401
+
+
+def build(source, names=None, out_dir='.', outputs=None, jobs=1, stats=instrument.NULL_STATS,
+          use_snapshot=False):
+    """Parse source once and run the named emitters (all registered ones by default).
+
+    outputs maps emitter names to output paths; the rest are written to
+    their default file name in out_dir. Returns {name: seconds} for the
+    parse ('parse') and each emitter; finer stage timings and skipped
+    records go to stats. With use_snapshot the export is loaded from its
+    snapshot cache when it has not changed.
+    """
+    names = list(names or EMITTERS)
+    unknown = [name for name in names if name not in EMITTERS]
+    if unknown:
+        raise ValueError(f"Unknown output(s): {', '.join(unknown)}")
+
+    timings = {}
+    start = time.perf_counter()
+    items = list(snapshot.configured_items(source, stats, use_snapshot))
+    timings['parse'] = time.perf_counter() - start
+    timings.update(emit_all(items, names, out_dir, outputs, jobs, stats))
+    return timings
+
+
+def emit_all(items, names, out_dir='.', outputs=None, jobs=1, stats=instrument.NULL_STATS):
+    """Run the named emitters over already parsed items; returns {name: seconds}.
+
+    out_dir is created if an output without an explicit path goes there.
+    """
+    outputs = outputs or {}
+    if any(not outputs.get(name) for name in names):
+        os.makedirs(out_dir, exist_ok=True)
+    timings = {}
+    for name in names:
+        emit, default_output = EMITTERS[name]
+        start = time.perf_counter()
+        emit(items, outputs.get(name) or os.path.join(out_dir, default_output), jobs, stats)
+        timings[name] = time.perf_counter() - start
+    return timings
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Build LaTeX outputs from a FLEx configured-dictionary export in one parse.')
+    parser.add_argument('source', help='configured HTML export (e.g. dictionary-configured-20250509.txt)')
+    parser.add_argument('--only', action='append', choices=sorted(EMITTERS), metavar='NAME',
+                        help=f"build only this output (repeatable; one of {', '.join(sorted(EMITTERS))})")
+    parser.add_argument('--out-dir', default='.', help='directory for outputs without an explicit path')
+    parser.add_argument('--output', action='append', default=[], metavar='NAME=PATH',
+                        help='write output NAME to PATH')
+    parser.add_argument('--jobs', type=int, default=1, metavar='N',
+                        help='render sections on N worker processes where the output supports it')
+    engines.add_arguments(parser)
+    snapshot.add_arguments(parser)
+    instrument.add_arguments(parser)
+    args = parser.parse_args(argv)
+
+    outputs = {}
+    for spec in args.output:
+        name, sep, path = spec.partition('=')
+        if not sep or name not in EMITTERS:
+            parser.error(f"--output expects NAME=PATH with NAME one of {', '.join(sorted(EMITTERS))}")
+        outputs[name] = path
+
+    with instrument.session(args) as stats:
+        timings = build(args.source, args.only, args.out_dir, outputs, args.jobs, stats, args.snapshot)
+        print(', '.join(f"{name} {seconds:.2f}s" for name, seconds in timings.items()), file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
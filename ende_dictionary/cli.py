@@ -0,0 +1,62 @@
+"""The ende_dictionary command line: one entry point for every converter and tool.
+
+Installing the package (pip install .) puts it on the path as
+ende-dictionary; python -m ende_dictionary runs the same thing:
+
+    python -m ende_dictionary verbs dictionary-verb-20250513.lift -o verb-dictionary.tex
+    python -m ende_dictionary domains dictionary-20250513.lift --nested
+    python -m ende_dictionary build dictionary-configured-20250509.txt --out-dir build
+
+Each command is the main() of one module, which is only imported once the
+command has been chosen, so --help and the configured-export commands never
+load the LIFT reader (and vice versa). Every module can also still be run
+on its own with python -m ende_dictionary.<module>.
+"""
+import argparse
+import importlib
+import os
+import sys
+
+PROG = 'python -m ende_dictionary'
+
+# command: (module, summary)
+COMMANDS = {
+    'verbs': ('verbs', 'verb lists grouped by inflection class, from a LIFT export'),
+    'domains': ('semantic', 'entries grouped by semantic domain, from a LIFT export'),
+    'dictionary': ('dictionary', 'the full dictionary, from a configured export'),
+    'word-lists': ('word_lists', 'part-of-speech word lists, from a configured export'),
+    'build': ('build', 'every configured-export output from one parse'),
+    'watch': ('watch', 'rebuild the outputs whenever an export is saved'),
+    'serve': ('server', 'serve lookups over a LIFT export on HTTP'),
+    'reverse-index': ('reverse_index', 'build or query the English reverse index'),
+    'fuzzy-index': ('fuzzy_index', 'build or query the "did you mean" index of Ende forms'),
+    'concordance': ('concordance', 'build or query the concordance of Ende example sentences'),
+}
+
+
+def prog():
+    """The command as it was typed: the ende-dictionary script, or python -m ende_dictionary."""
+    name = os.path.basename(sys.argv[0])
+    return PROG if name in ('__main__.py', '-c', '') else name
+
+
+def main(argv=None):
+    width = max(map(len, COMMANDS))
+    name = prog()
+    parser = argparse.ArgumentParser(
+        prog=name, description='Convert FLEx exports of the Ende dictionary to LaTeX and other formats.',
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        epilog='commands:\n' + '\n'.join(f'  {name:<{width}}  {summary}' for name, (module, summary) in COMMANDS.items())
+               + f'\n\nRun {name} COMMAND --help for the options of a command.')
+    parser.add_argument('command', choices=COMMANDS, metavar='COMMAND', help='the command to run (see below)')
+    parser.add_argument('args', nargs=argparse.REMAINDER, help='arguments for the command')
+    args = parser.parse_args(argv)
+
+    module = importlib.import_module(f'.{COMMANDS[args.command][0]}', __package__)
+    # So the command's own usage and error messages name it as it was typed
+    sys.argv[0] = f'{name} {args.command}'
+    return module.main(args.args)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,308 @@
+"""Keyword-in-context concordance of the Ende example sentences.
+
+The corpus is every example sentence of LIFT exports and configured
+exports, each filed under the headword it illustrates (a subentry's
+example under the subentry) together with its English translation. Any
+substring of the Ende text can be looked up: the index is a suffix array
+over the sentences, so the occurrences of a query are one contiguous run
+of it, found with two binary searches whatever the size of the corpus.
+They come out in suffix order, that is sorted by the text from the match
+onwards, the classic right-sorted concordance.
+
+Matching ignores case (NFC, case-folded) and treats every run of
+whitespace as one space. Hits never span two sentences.
+
+The file follows the reverse and fuzzy indexes (see ende_dictionary.binfile):
+a header, little-endian arrays and UTF-8 blobs, memory-mapped on open:
+
+    python -m ende_dictionary concordance build ende.kwic --lift dictionary-verb-20250513.lift
+    python -m ende_dictionary concordance query ende.kwic "ndä" --width 30
+"""
+import argparse
+import re
+import struct
+import unicodedata
+from array import array
+from bisect import bisect_right
+from itertools import accumulate
+
+from .binfile import MappedFile, atomic_write, blob, little_endian
+
+MAGIC = b'ENDEKWC1'
+WIDTH = 30
+_WHITESPACE = re.compile(r'\s+')
+# Sentences are joined with a character no normalized sentence contains,
+# so no match runs from one into the next
+_SEPARATOR = '\n'
+# magic, suffix count, sentence count, headword count, and the byte
+# lengths of the folded text, text, translation and headword blobs
+_HEADER = struct.Struct('<8s7I')
+# No UTF-8 sequence contains 0xff, so key + _AFTER sorts after every suffix starting with key
+_AFTER = b'\xff'
+
+
+def normalize(text):
+    """text as it is stored and shown: NFC, every run of whitespace one space, stripped."""
+    return ' '.join(unicodedata.normalize('NFC', text).split())
+
+
+def fold(text):
+    """text case-folded character by character, so positions in it are positions in text.
+
+    The few characters whose case folding is longer than one character
+    (German ß, for one) are kept as they are.
+    """
+    folded = text.casefold()
+    if len(folded) == len(text):
+        return folded
+    return ''.join(char.casefold() if len(char.casefold()) == 1 else char for char in text)
+
+
+def suffix_array(codes):
+    """The start positions of the suffixes of the sequence codes, in sorted order.
+
+    Prefix doubling: each round sorts the suffixes by their first 2k items
+    using the ranks of the previous round for the first k, until every
+    rank is distinct. A round is one O(n log n) sort; the number of rounds
+    grows with the log of the longest repeated substring.
+    """
+    n = len(codes)
+    order = sorted(range(n), key=codes.__getitem__)
+    rank = [0] * n
+    distinct = 0
+    previous = None
+    for i in order:
+        if codes[i] != previous:
+            distinct += 1
+            previous = codes[i]
+        rank[i] = distinct
+    k = 1
+    while distinct < n:
+        # Rank 0 stands for the end of the text, before every real rank
+        keys = [high << 32 | low for high, low in zip(rank, rank[k:] + [0] * k)]
+        order.sort(key=keys.__getitem__)
+        distinct = 0
+        previous = None
+        for i in order:
+            if keys[i] != previous:
+                distinct += 1
+                previous = keys[i]
+            rank[i] = distinct
+        k *= 2
+    return order
+
+
+class Hit:
+    """An occurrence of a query in an example sentence.
+
+    sentence[start:end] is the matched text; headword is the entry the
+    example illustrates and translation its English translation ('' if it
+    has none).
+    """
+    __slots__ = ('headword', 'sentence', 'translation', 'start', 'end')
+
+    def __init__(self, headword, sentence, translation, start, end):
+        self.headword = headword
+        self.sentence = sentence
+        self.translation = translation
+        self.start = start
+        self.end = end
+
+    def __repr__(self):
+        return f'Hit({self.headword!r}, {self.sentence!r}, {self.translation!r}, {self.start}, {self.end})'
+
+    def context(self, width=WIDTH):
+        """(left, match, right): the match with up to width characters of the sentence either side."""
+        return (self.sentence[max(0, self.start - width):self.start], self.sentence[self.start:self.end],
+                self.sentence[self.end:self.end + width])
+
+    def kwic(self, width=WIDTH):
+        """The hit as a keyword-in-context line, the left context right-aligned in width columns."""
+        left, match, right = self.context(width)
+        return f'{left:>{width}}  {match}  {right}'
+
+
+def lift_examples(records):
+    """(sentence, translation, headword) for every example sentence of every LIFT entry."""
+    for record in records:
+        if not record.headword:
+            continue
+        for sense in record.senses:
+            for example in sense.examples:
+                if example.sentence:
+                    yield example.sentence, example.translation, record.headword
+
+
+def configured_examples(items):
+    """(sentence, translation, headword) for the sense and subentry examples of a configured export."""
+    from .configured import ConfiguredEntry
+    for item in items:
+        if not isinstance(item, ConfiguredEntry) or not item.headword:
+            continue
+        for sense in item.senses:
+            for sentence, translation in sense.examples:
+                yield sentence, translation, item.headword
+        for subentry in item.subentries:
+            for sentence, translation in subentry.examples:
+                yield sentence, translation, subentry.headword
+
+
+def write_index(examples, path):
+    """Write the concordance of (sentence, translation, headword) triples to path, atomically.
+
+    Returns the sentence count. Repeated triples, and sentences that
+    normalize to nothing, are left out.
+    """
+    sentences = sorted({(headword, normalize(sentence), normalize(translation or ''))
+                        for sentence, translation, headword in examples if normalize(sentence)})
+    headwords = sorted({headword for headword, _, _ in sentences})
+    headword_numbers = {headword: number for number, headword in enumerate(headwords)}
+
+    # Code points sort like their UTF-8 encodings, so the suffix array is
+    # built over characters and stored as byte offsets into the folded text
+    folded = [fold(sentence) + _SEPARATOR for _, sentence, _ in sentences]
+    folded_offsets, folded_blob = blob(folded)
+    folded = ''.join(folded)
+    byte_offsets = [0]
+    byte_offsets += accumulate(len(char.encode('utf-8')) for char in folded)
+    suffixes = array('I', (byte_offsets[i] for i in suffix_array([ord(char) for char in folded])
+                           if folded[i] != _SEPARATOR))
+
+    text_offsets, text_blob = blob(sentence for _, sentence, _ in sentences)
+    translation_offsets, translation_blob = blob(translation for _, _, translation in sentences)
+    headword_offsets, headword_blob = blob(headwords)
+    sentence_headwords = array('I', (headword_numbers[headword] for headword, _, _ in sentences))
+
+    with atomic_write(path) as tmp_path, open(tmp_path, 'wb') as f:
+        f.write(_HEADER.pack(MAGIC, len(suffixes), len(sentences), len(headwords), len(folded_blob),
+                             len(text_blob), len(translation_blob), len(headword_blob)))
+        for values in (suffixes, folded_offsets, text_offsets, translation_offsets, sentence_headwords,
+                       headword_offsets):
+            f.write(little_endian(values))
+        f.write(folded_blob)
+        f.write(text_blob)
+        f.write(translation_blob)
+        f.write(headword_blob)
+    return len(sentences)
+
+
+def build_index(path, lift_files=(), configured_files=()):
+    """Index the example sentences of the given LIFT and configured exports into path; returns the sentence count."""
+    from .configured import iter_items
+    from .lift import iter_records
+
+    def examples():
+        for lift_file in lift_files:
+            yield from lift_examples(iter_records(lift_file))
+        for configured_file in configured_files:
+            yield from configured_examples(iter_items(configured_file))
+
+    return write_index(examples(), path)
+
+
+class Concordance(MappedFile):
+    """Read-only, memory-mapped view of a concordance file written by write_index.
+
+    Use as a context manager, or call close(), to release the mapping.
+    """
+
+    def __init__(self, path):
+        super().__init__(path)
+        (magic, self.suffix_count, self.sentence_count, headword_count, folded_bytes, text_bytes,
+         translation_bytes, headword_bytes) = _HEADER.unpack_from(self._view)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a concordance file")
+        arrays, position = self._arrays(_HEADER.size, [
+            ('I', self.suffix_count), ('I', self.sentence_count + 1), ('I', self.sentence_count + 1),
+            ('I', self.sentence_count + 1), ('I', self.sentence_count), ('I', headword_count + 1)])
+        (self._suffixes, self._folded_offsets, self._text_offsets, self._translation_offsets,
+         self._sentence_headwords, self._headword_offsets) = arrays
+        # The folded text is compared through the mmap itself, whose slices are bytes
+        self._folded = position
+        (self._text, self._translations, self._headwords), _ = self._blobs(
+            position + folded_bytes, (text_bytes, translation_bytes, headword_bytes))
+
+    def _lower_bound(self, key):
+        text, suffixes, base, size = self._mmap, self._suffixes, self._folded, len(key)
+        lo, hi = 0, self.suffix_count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            start = base + suffixes[mid]
+            if text[start:start + size] < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _range(self, query):
+        # Unlike sentences, queries keep a leading or trailing space, to match at word edges
+        key = fold(_WHITESPACE.sub(' ', unicodedata.normalize('NFC', query))).encode('utf-8')
+        if not key or _SEPARATOR.encode('utf-8') in key:
+            return 0, 0, 0
+        return self._lower_bound(key), self._lower_bound(key + _AFTER), len(key)
+
+    def _string(self, blob, offsets, number):
+        return str(blob[offsets[number]:offsets[number + 1]], 'utf-8')
+
+    def _hit(self, suffix, size):
+        offset = self._suffixes[suffix]
+        sentence = bisect_right(self._folded_offsets, offset) - 1
+        start = offset - self._folded_offsets[sentence]
+        base = self._folded + self._folded_offsets[sentence]
+        # Folding keeps the number of characters, so character positions
+        # in the folded sentence are positions in the stored one
+        before = len(self._mmap[base:base + start].decode('utf-8'))
+        length = len(self._mmap[base + start:base + start + size].decode('utf-8'))
+        return Hit(self._string(self._headwords, self._headword_offsets, self._sentence_headwords[sentence]),
+                   self._string(self._text, self._text_offsets, sentence),
+                   self._string(self._translations, self._translation_offsets, sentence),
+                   before, before + length)
+
+    def count(self, query):
+        """The number of occurrences of query in the example sentences."""
+        lo, hi, _ = self._range(query)
+        return hi - lo
+
+    def search(self, query, limit=None):
+        """Hits for every occurrence of query, sorted by the text from the match on; at most limit of them."""
+        lo, hi, size = self._range(query)
+        if limit is not None:
+            hi = min(hi, lo + limit)
+        return [self._hit(suffix, size) for suffix in range(lo, hi)]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Build or query the concordance of Ende example sentences.')
+    commands = parser.add_subparsers(dest='command', required=True)
+    build = commands.add_parser('build', help='index the example sentences of LIFT and configured exports')
+    build.add_argument('index_file')
+    build.add_argument('--lift', action='append', default=[], metavar='FILE',
+                       help='LIFT export to take example sentences from (repeatable)')
+    build.add_argument('--configured', action='append', default=[], metavar='FILE',
+                       help='configured export to take example sentences from (repeatable)')
+    query = commands.add_parser('query', help='print every occurrence of a query in context')
+    query.add_argument('index_file')
+    query.add_argument('query')
+    query.add_argument('--width', type=int, default=WIDTH, help=f'characters of context either side '
+                                                                 f'(default {WIDTH})')
+    query.add_argument('--limit', type=int, default=None)
+    query.add_argument('--count', action='store_true', help='only print the number of occurrences')
+    args = parser.parse_args(argv)
+
+    if args.command == 'build':
+        if not (args.lift or args.configured):
+            build.error('give at least one --lift or --configured export')
+        count = build_index(args.index_file, args.lift, args.configured)
+        print(f"Indexed {count} example sentences into {args.index_file}")
+        return
+    with Concordance(args.index_file) as index:
+        if args.count:
+            print(index.count(args.query))
+            return
+        for hit in index.search(args.query, args.limit):
+            print(f"{hit.kwic(args.width)}\t{hit.headword}\t{hit.translation}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,488 @@
+"""Streaming reader for FLEx configured-dictionary HTML exports.
+
+The export is a flat run of <div> elements under <body>: a div.letHead for
+every letter, a div.entry per main entry and a div.minorentryvariant per
+variant cross-reference. Instead of building a tree of the whole document,
+the reader below feeds the file through an HTML parser in chunks, builds
+a small tree for one top-level div at a time, turns it into a record and
+drops it again, so memory is bounded by the largest single entry. The
+parser is lxml's or html.parser, whichever ende_dictionary.engines
+selects; both drive the same tree builder.
+"""
+from bisect import bisect_right
+from html.parser import HTMLParser
+import re
+import sys
+
+from . import engines
+from .instrument import NULL_STATS
+
+# Elements html.parser never sees a closing tag for
+VOID_TAGS = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input',
+             'link', 'meta', 'param', 'source', 'track', 'wbr'}
+
+
+class LetterHead:
+    """A div.letHead starting a new letter section."""
+    __slots__ = ('letter',)
+
+    def __init__(self, letter):
+        self.letter = letter
+
+
+class ConfiguredSense:
+    """One span.sense.
+
+    number, definition and examples ((example, translation) pairs) feed the
+    full dictionary. pos is the sense's own English part of speech (None if
+    it has none) and gloss its English definitionorgloss text ('' if none),
+    as used by the word lists.
+    """
+    __slots__ = ('number', 'definition', 'examples', 'pos', 'gloss')
+
+    def __init__(self, number, definition, examples, pos=None, gloss=''):
+        self.number = number
+        self.definition = definition
+        self.examples = examples
+        self.pos = pos
+        self.gloss = gloss
+
+
+class Subentry:
+    """A span.subentry with both a headword and a definition."""
+    __slots__ = ('headword', 'pos', 'definition', 'examples')
+
+    def __init__(self, headword, pos, definition, examples):
+        self.headword = headword
+        self.pos = pos
+        self.definition = definition
+        self.examples = examples
+
+
+class ConfiguredEntry:
+    """A div.entry.
+
+    guid is the entry's FLEx guid (the div's id without its leading 'g'),
+    or None if the div has no id. headword is the text of the main headword's span[lang=kit], or None if
+    there is none; such entries are only kept for the word lists, which use
+    plain_headword (the main headword's first span, with every text piece
+    stripped) and shared_pos (the English label in sharedgrammaticalinfo,
+    None if missing). etymology is None, (preccomment, form) or
+    (preccomment, name, form). skipped_subentries counts span.subentry
+    elements left out for lacking a headword or definition.
+    """
+    __slots__ = ('guid', 'headword', 'plain_headword', 'pos', 'shared_pos', 'etymology',
+                 'senses', 'allomorphs', 'subentries', 'skipped_subentries')
+
+    def __init__(self, headword, plain_headword='', guid=None):
+        self.guid = guid
+        self.headword = headword
+        self.plain_headword = plain_headword
+        self.pos = None
+        self.shared_pos = None
+        self.etymology = None
+        self.senses = []
+        self.allomorphs = []
+        self.subentries = []
+        self.skipped_subentries = 0
+
+
+class MinorVariant:
+    """A div.minorentryvariant pointing at its main entry.
+
+    problem is None for a complete variant, otherwise a description of what
+    is missing; variant_type and referenced may then be None. guid is as
+    for ConfiguredEntry.
+    """
+    __slots__ = ('guid', 'headword', 'variant_type', 'referenced', 'problem')
+
+    def __init__(self, headword, variant_type, referenced, problem=None, guid=None):
+        self.guid = guid
+        self.headword = headword
+        self.variant_type = variant_type
+        self.referenced = referenced
+        self.problem = problem
+
+
+class _Node:
+    __slots__ = ('tag', 'attrs', 'classes', 'children', 'seq', 'sensenumber')
+
+    def __init__(self, tag, attrs, seq):
+        self.tag = tag
+        self.attrs = attrs
+        self.classes = (attrs.get('class') or '').split()
+        self.children = []
+        self.seq = seq
+        self.sensenumber = None
+
+    def iter(self):
+        """Yield every descendant element in document order."""
+        for child in self.children:
+            if isinstance(child, _Node):
+                yield child
+                yield from child.iter()
+
+    def find_all(self, cls=None, lang=None, tag='span'):
+        for node in self.iter():
+            if (node.tag == tag and (cls is None or cls in node.classes)
+                    and (lang is None or node.attrs.get('lang') == lang)):
+                yield node
+
+    def find(self, cls=None, lang=None, tag='span'):
+        return next(self.find_all(cls, lang, tag), None)
+
+    def strings(self):
+        """Yield every text piece under this element in document order."""
+        for child in self.children:
+            if isinstance(child, str):
+                yield child
+            else:
+                yield from child.strings()
+
+    def get_text(self):
+        return ''.join(child if isinstance(child, str) else child.get_text()
+                       for child in self.children)
+
+
+class _DivTreeBuilder:
+    """Collect each <div> directly under <body> as a small _Node tree.
+
+    Finished divs are appended to ``completed`` together with the
+    span.translation nodes they contain; the caller drains that list after
+    every feed. With bind_sense_numbers=False the last span.sensenumber
+    is carried across divs, reproducing the document-wide find_previous
+    lookup of the old BeautifulSoup converter.
+
+    start/end/data/close are the parser target interface of lxml, and the
+    same calls html.parser makes through _TopLevelDivParser, so both
+    engines build their trees here.
+    """
+
+    def __init__(self, bind_sense_numbers=True):
+        self.bind_sense_numbers = bind_sense_numbers
+        self.completed = []
+        self._outer = []
+        self._stack = []
+        self._translations = []
+        self._seq = 0
+        self._last_sensenumber = None
+
+    def start(self, tag, attrs):
+        if not self._stack:
+            if tag == 'div' and self._outer and self._outer[-1] == 'body':
+                self._seq = 0
+                self._translations = []
+                if self.bind_sense_numbers:
+                    self._last_sensenumber = None
+                self._stack.append(_Node(tag, dict(attrs), 0))
+            elif tag not in VOID_TAGS:
+                self._outer.append(tag)
+            return
+
+        self._seq += 1
+        node = _Node(tag, dict(attrs), self._seq)
+        self._stack[-1].children.append(node)
+        if tag == 'span':
+            if 'sensenumber' in node.classes:
+                self._last_sensenumber = node
+            if 'sense' in node.classes:
+                node.sensenumber = self._last_sensenumber
+            if 'translation' in node.classes:
+                self._translations.append(node)
+        if tag not in VOID_TAGS:
+            self._stack.append(node)
+
+    def end(self, tag):
+        if self._stack:
+            for depth in range(len(self._stack) - 1, -1, -1):
+                if self._stack[depth].tag == tag:
+                    del self._stack[depth + 1:]
+                    self._close_node()
+                    return
+            if tag not in self._outer:
+                return
+            # An outer element closed around an unterminated div
+            del self._stack[1:]
+            self._close_node()
+        if tag in self._outer:
+            while self._outer.pop() != tag:
+                pass
+
+    def data(self, data):
+        if self._stack:
+            children = self._stack[-1].children
+            # html.parser hands over a run of text cut by a feed boundary in
+            # two calls; keep it one piece so stripping is unaffected
+            if children and isinstance(children[-1], str):
+                children[-1] += data
+            else:
+                children.append(data)
+
+    def _close_node(self):
+        node = self._stack.pop()
+        if not self._stack:
+            self.completed.append((node, self._translations))
+
+    def close(self):
+        if self._stack:
+            del self._stack[1:]
+            self._close_node()
+
+
+class _TopLevelDivParser(HTMLParser):
+    """The stdlib engine: html.parser feeding a _DivTreeBuilder."""
+
+    def __init__(self, bind_sense_numbers=True):
+        super().__init__(convert_charrefs=True)
+        self._builder = _DivTreeBuilder(bind_sense_numbers)
+        self.completed = self._builder.completed
+        # Bound straight to the builder so no event pays for an extra call
+        self.handle_starttag = self._builder.start
+        self.handle_endtag = self._builder.end
+        self.handle_data = self._builder.data
+
+    def close(self):
+        super().close()
+        self._builder.close()
+
+
+class _LxmlDivParser:
+    """The lxml engine: libxml2's HTML parser feeding a _DivTreeBuilder."""
+
+    def __init__(self, bind_sense_numbers=True):
+        from lxml import etree
+        builder = _DivTreeBuilder(bind_sense_numbers)
+        self.completed = builder.completed
+        self._parser = etree.HTMLParser(target=builder, huge_tree=True)
+
+    def feed(self, data):
+        self._parser.feed(data)
+
+    def close(self):
+        self._parser.close()
+
+
+def _div_parser(bind_sense_numbers=True):
+    """A parser for the engine ende_dictionary.engines selects, with feed(), close() and completed."""
+    if engines.current('configured') == 'lxml':
+        return _LxmlDivParser(bind_sense_numbers)
+    return _TopLevelDivParser(bind_sense_numbers)
+
+
+def _text(node):
+    return node.get_text().strip()
+
+
+def _stripped_text(node):
+    """Every text piece stripped and joined, like BeautifulSoup's get_text(strip=True)."""
+    return ''.join(piece.strip() for piece in node.strings())
+
+
+def _english(node, cls):
+    """Stripped text of node's first span.<cls> span[lang=en], None if either is missing."""
+    outer = node.find(cls)
+    if outer is None:
+        return None
+    inner = outer.find(lang='en')
+    return _stripped_text(inner) if inner is not None else None
+
+
+class _Translations:
+    """The span.translation nodes of one div, for find_next() lookups bound to that div."""
+    __slots__ = ('nodes', 'seqs')
+
+    def __init__(self, nodes):
+        self.nodes = nodes
+        self.seqs = [node.seq for node in nodes]
+
+    def after(self, node):
+        i = bisect_right(self.seqs, node.seq)
+        return self.nodes[i] if i < len(self.nodes) else None
+
+
+def _examples(node, translations):
+    examples = []
+    for ex in node.find_all('example'):
+        trans = translations.after(ex)
+        if trans is not None:
+            examples.append((_text(ex), _text(trans)))
+    return examples
+
+
+def _label(text):
+    # Part-of-speech labels repeat on every entry; keep one copy of each
+    return sys.intern(text) if text is not None else None
+
+
+def _guid(div):
+    """The FLEx guid in a div's id="g<guid>", or None."""
+    div_id = div.attrs.get('id')
+    return div_id[1:] if div_id and div_id.startswith('g') else div_id
+
+
+def _read_entry(div, translations):
+    headword_elem = div.find('mainheadword')
+    headword_span = headword_elem.find(lang='kit') if headword_elem is not None else None
+    first_span = headword_elem.find() if headword_elem is not None else None
+    entry = ConfiguredEntry(_text(headword_span) if headword_span is not None else None,
+                            _stripped_text(first_span) if first_span is not None else '', _guid(div))
+
+    shared_gram = div.find('sharedgrammaticalinfo')
+    if shared_gram is not None:
+        entry.shared_pos = _label(_english(shared_gram, 'partofspeech'))
+
+    pos = div.find('partofspeech')
+    if pos is not None:
+        entry.pos = _label(_text(pos))
+
+    etym = div.find('etymology')
+    if etym is not None:
+        prec = etym.find('preccomment')
+        name = etym.find('name')
+        form = etym.find('form')
+        if prec is not None and name is not None and form is not None:
+            entry.etymology = (_text(prec), _text(name), _text(form))
+        elif prec is not None and form is not None:
+            entry.etymology = (_text(prec), _text(form))
+
+    for sense in div.find_all('sense'):
+        number = _text(sense.sensenumber) if sense.sensenumber is not None else None
+        def_elem = sense.find('definitionorgloss')
+        if def_elem is not None:
+            definition = ' '.join(_text(span) for span in def_elem.find_all())
+        else:
+            definition = "no definition provided"
+        entry.senses.append(ConfiguredSense(number, definition, _examples(sense, translations),
+                                            _label(_english(sense, 'partofspeech')),
+                                            _english(sense, 'definitionorgloss') or ''))
+
+    if entry.headword is None:
+        return entry
+
+    for allo in div.find_all('allomorph'):
+        allo_text = allo.find(lang='kit')
+        if allo_text is not None:
+            entry.allomorphs.append(_text(allo_text))
+
+    for sub in div.find_all('subentry'):
+        sub_head = sub.find('headword')
+        sub_def = sub.find('definitionorgloss')
+        if sub_head is not None and sub_def is not None:
+            sub_pos = sub.find('partofspeech')
+            entry.subentries.append(Subentry(
+                _text(sub_head),
+                _label(_text(sub_pos)) if sub_pos is not None else None,
+                _text(sub_def),
+                _examples(sub, translations)))
+        else:
+            entry.skipped_subentries += 1
+    return entry
+
+
+def _read_minor_variant(div):
+    headword = div.find('headword')
+    if headword is None:
+        return None
+    headword_text = _text(headword)
+    var_type = div.find('reverseabbr')
+    ref_head = div.find('referencedentry')
+    if var_type is None or ref_head is None:
+        return MinorVariant(headword_text, None, None, 'missing reverseabbr or referencedentry')
+    ref_head_span = ref_head.find(lang='kit')
+    if ref_head_span is None:
+        return MinorVariant(headword_text, _text(var_type), None, 'missing referenced entry')
+    return MinorVariant(headword_text, _text(var_type), _text(ref_head_span))
+
+
+def _read_div(div, translations):
+    classes = div.classes
+    if classes == ['letHead']:
+        letter = div.find('letter')
+        return LetterHead(_text(letter)) if letter is not None else None
+    if classes == ['entry']:
+        return _read_entry(div, _Translations(translations))
+    if classes == ['minorentryvariant']:
+        variant = _read_minor_variant(div)
+        if variant is not None:
+            variant.guid = _guid(div)
+        return variant
+    return None
+
+
+_DIV_TAG = re.compile(r'<(/?)div\b[^>]*?(/?)>', re.I)
+_BODY_TAG = re.compile(r'<body\b[^>]*>', re.I)
+
+
+def split_divs(text):
+    """The source text of every top-level div of a configured export, in order.
+
+    Returns None if the document has no <body> or its div tags do not
+    balance, in which case it can only be read as a whole (see iter_items).
+    Each piece can be read on its own with read_div_source.
+    """
+    body = _BODY_TAG.search(text)
+    if body is None:
+        return None
+    sources = []
+    depth = 0
+    start = 0
+    for match in _DIV_TAG.finditer(text, body.end()):
+        closing, self_closing = match.groups()
+        if closing:
+            depth -= 1
+            if depth < 0:
+                return None
+            if depth == 0:
+                sources.append(text[start:match.end()])
+        elif self_closing:
+            if depth == 0:
+                sources.append(match.group())
+        else:
+            if depth == 0:
+                start = match.start()
+            depth += 1
+    return sources if depth == 0 else None
+
+
+def read_div_source(source):
+    """The items (see iter_items) of the source text of one top-level div, with sense numbers bound to it."""
+    parser = _div_parser()
+    parser.feed('<body>' + source)
+    parser.close()
+    items = (_read_div(div, translations) for div, translations in parser.completed)
+    return [item for item in items if item is not None]
+
+
+def iter_items(file_path, bind_sense_numbers=True, chunk_size=1 << 16, stats=NULL_STATS):
+    """Yield a LetterHead, ConfiguredEntry or MinorVariant for each top-level div, in order.
+
+    This is the shared entry model for everything built from the configured
+    export: one pass over the file serves both the full dictionary and the
+    part-of-speech word lists.
+
+    Sense numbers and example translations are looked up inside the div they
+    belong to. Pass bind_sense_numbers=False to let a sense without its own
+    number pick up the last one seen anywhere earlier in the document, as
+    the BeautifulSoup converter did.
+
+    Tokenizing the HTML into per-div trees is timed as stats' read stage and
+    turning a tree into a record as its parse stage.
+    """
+    read, parse = stats.stage('read'), stats.stage('parse')
+    parser = _div_parser(bind_sense_numbers)
+    with open(file_path, 'r', encoding='utf-8') as f:
+        while True:
+            with read:
+                chunk = f.read(chunk_size)
+                if chunk:
+                    parser.feed(chunk)
+                else:
+                    parser.close()
+            for div, translations in parser.completed:
+                with parse:
+                    item = _read_div(div, translations)
+                if item is not None:
+                    yield item
+            parser.completed.clear()
+            if not chunk:
+                break
@@ -0,0 +1,175 @@
+"""The full configured dictionary (dictionary.tex), grouped into letter sections.
+
+    python -m ende_dictionary dictionary dictionary-configured-20250509.txt -o dictionary.tex
+"""
+import argparse
+
+from . import engines, incremental, instrument, snapshot
+from .emitters import register_emitter
+from .instrument import NULL_STATS
+from .latex import STDOUT, LatexWriter, escape_latex
+from .parallel import render_sections
+
+
+def example_latex(examples):
+    """Render (example, translation) pairs as \\example commands."""
+    return ''.join(f'\\example{{{escape_latex(ex_text)}}}{{{escape_latex(trans_text)}}}'
+                   for ex_text, trans_text in examples)
+
+
+def entry_latex(entry):
+    """Render one ConfiguredEntry as an \\entry line."""
+    entry_parts = [f'\\headword{{{escape_latex(entry.headword)}}}']
+    if entry.pos is not None:
+        entry_parts.append(f'\\pos{{{escape_latex(entry.pos)}}}')
+    if entry.etymology is not None:
+        entry_parts.append('\\etymology' + ''.join(f'{{{escape_latex(part)}}}' for part in entry.etymology))
+
+    for sense in entry.senses:
+        if sense.number is not None:
+            entry_parts.append(f'\\sensenumber{{{escape_latex(sense.number)}}}')
+        entry_parts.append(f'\\definition{{{escape_latex(sense.definition)}}}')
+        entry_parts.append(example_latex(sense.examples))
+
+    for allo_text in entry.allomorphs:
+        entry_parts.append(f'\\allomorph{{{escape_latex(allo_text)}}}')
+
+    for sub in entry.subentries:
+        sub_parts = [f'\\headword{{{escape_latex(sub.headword)}}}']
+        if sub.pos is not None:
+            sub_parts.append(f'\\pos{{{escape_latex(sub.pos)}}}')
+        sub_parts.append(f'\\definition{{{escape_latex(sub.definition)}}}')
+        sub_parts.append(example_latex(sub.examples))
+        entry_parts.append('\\subentry{' + ''.join(sub_parts) + '}')
+
+    return f'\\entry{{{escape_latex(entry.headword)}}}{{' + ''.join(entry_parts) + '}'
+
+
+def item_latex(item):
+    """Render a letter heading, entry or minor variant read from the export."""
+    from .configured import ConfiguredEntry, LetterHead, MinorVariant
+    if isinstance(item, LetterHead):
+        return f'\\lettersection{{{escape_latex(item.letter)}}}'
+    if isinstance(item, ConfiguredEntry):
+        return entry_latex(item)
+    if isinstance(item, MinorVariant):
+        entry_parts = [
+            f'\\headword{{{escape_latex(item.headword)}}}',
+            f'\\variant{{{escape_latex(item.variant_type)}}}{{{escape_latex(item.referenced)}}}'
+        ]
+        return f'\\entry{{{escape_latex(item.headword)}}}{{' + ''.join(entry_parts) + '}'
+
+
+def printable_items(items, stats=NULL_STATS):
+    """Drop entries without a headword and incomplete variants, counting what was skipped in stats."""
+    from .configured import ConfiguredEntry, MinorVariant
+    for item in items:
+        if isinstance(item, ConfiguredEntry):
+            if item.headword is None:
+                stats.skip('entry', 'missing headword', item.plain_headword or None)
+                continue
+            for _ in range(item.skipped_subentries):
+                stats.skip('subentry', 'missing headword or definition', item.headword)
+        elif isinstance(item, MinorVariant) and item.problem is not None:
+            stats.skip('minorentryvariant', item.problem, item.headword)
+            continue
+        yield item
+
+
+def letter_sections(items):
+    """Group items into runs that each start at a letter heading."""
+    from .configured import LetterHead
+    section = []
+    for item in items:
+        if isinstance(item, LetterHead) and section:
+            yield section
+            section = []
+        section.append(item)
+    if section:
+        yield section
+
+
+def section_latex(letter, items):
+    """Render one letter section; letter is unused but keeps the render_sections signature."""
+    return '\n'.join(item_latex(item) for item in items)
+
+
+@register_emitter('dictionary', 'dictionary.tex')
+def write_dictionary(items, output_file, jobs=1, stats=NULL_STATS):
+    """Write letter sections of the entries in items to output_file, rendering on up to jobs processes."""
+    # The record classes come with the configured reader, which only
+    # commands that read an export need to load
+    from .configured import LetterHead
+    sections = ((section[0].letter if isinstance(section[0], LetterHead) else None, section)
+                for section in letter_sections(printable_items(items, stats)))
+    with stats.stage('emit'), LatexWriter(output_file) as out:
+        for i, section in enumerate(render_sections(section_latex, sections, jobs)):
+            if i:
+                out.write('\n')
+            out.write(section)
+
+
+def build_incremental(input_file, output_file, fragment_dir, stats=NULL_STATS, use_snapshot=False, jobs=1):
+    """Rebuild only the letter sections touched by entries that changed since the last run.
+
+    Entries and variants are tracked by the guid in their div id. Each
+    letter section is written to its own fragment in fragment_dir and
+    output_file \\input's them; see ende_dictionary.incremental. The sections
+    to re-render are rendered on up to jobs processes.
+    """
+    from .configured import LetterHead
+    letter = ''
+
+    def sections_for(item):
+        nonlocal letter
+        if isinstance(item, LetterHead):
+            letter = item.letter
+        return [(letter, item)]
+
+    def entry_key(item):
+        return 'letter ' + item.letter if isinstance(item, LetterHead) else item.guid
+
+    items = printable_items(snapshot.configured_items(input_file, stats, use_snapshot), stats)
+    return incremental.build(items, sections_for, section_latex, None, '', output_file, fragment_dir,
+                             stats, jobs, entry_key)
+
+
+def main(argv=None, default_input=None):
+    """Command-line entry point; default_input is the export read when none is given."""
+    parser = argparse.ArgumentParser(description='Convert a FLEx configured-dictionary export to LaTeX.')
+    parser.add_argument('input_file', nargs='?', default=default_input,
+                        help='configured HTML export to read' + (f' (default {default_input})' if default_input else ''))
+    parser.add_argument('-o', '--output', default='dictionary.tex',
+                        help="LaTeX file to write, or '-' for stdout")
+    incremental.add_arguments(parser, 'letter section', 'sections')
+    parser.add_argument('--jobs', type=int, default=1, metavar='N',
+                        help='render letter sections on N worker processes')
+    engines.add_arguments(parser)
+    snapshot.add_arguments(parser)
+    instrument.add_arguments(parser)
+    args = parser.parse_args(argv)
+    if args.input_file is None:
+        parser.error('a configured export to read is required')
+    if args.incremental and args.output == STDOUT:
+        parser.error('--incremental cannot write to stdout')
+
+    # Read the export one top-level div at a time (or load its snapshot);
+    # sense numbers and translations are looked up inside the entry they
+    # belong to. Skipped subentries and variants are counted and reported
+    # once at the end
+    with instrument.session(args) as stats:
+        if args.incremental:
+            fragment_dir = args.fragment_dir or incremental.default_fragment_dir(args.output)
+            result = build_incremental(args.input_file, args.output, fragment_dir, stats,
+                                       args.snapshot, args.jobs)
+            print(f"LaTeX file updated: {args.output} ({result.summary()})")
+            return
+        items = snapshot.configured_items(args.input_file, stats, args.snapshot)
+        write_dictionary(items, args.output, args.jobs, stats)
+
+    if args.output != STDOUT:
+        print(f"Conversion complete! Check {args.output}")
+
+
+if __name__ == '__main__':
+    main()
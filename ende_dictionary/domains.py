@@ -0,0 +1,176 @@
+"""A hierarchical index over DDP4 semantic-domain labels.
+
+Domain labels are a dotted DDP4 code followed by a description
+("6.6.5.1 Sago"). DomainTrie files every label under the node for its
+code, so "6.6" is the parent of "6.6.5" and the ancestor of "6.6.5.1";
+nodes for codes no label carries ("6.6.5" when only "6.6.5.1" is used)
+are created on the way down. Labels without a code go in a separate list.
+
+All the ordering is done once, in freeze(): each label's entries are
+sorted by headword, children are ordered by their numeric code part and
+the nodes are numbered in pre-order, so every subtree is one contiguous
+run of the section list. After that, looking up a subtree, its sections
+and its entry count are dictionary lookups and slices, and the renderers
+never sort again.
+"""
+import heapq
+from operator import attrgetter, itemgetter
+
+_headword = attrgetter('headword')
+
+
+def split_domain(domain):
+    """(code parts, description) for a DDP4 label, or (None, domain) if it does not start with a code."""
+    code, _, desc = domain.partition(' ')
+    parts = code.split('.')
+    if not (parts[0].isdigit() and all(parts)):
+        return None, domain
+    return tuple(parts), desc
+
+
+def _part_key(part):
+    # Numeric parts compare as numbers (6.10 after 6.9); anything else after them
+    return (0, int(part), '') if part.isdigit() else (1, 0, part)
+
+
+class DomainNode:
+    """One DDP4 code in a DomainTrie.
+
+    sections holds (label, entries) for the labels carrying exactly this
+    code, ordered by description; children are the next-level nodes in
+    code order. After DomainTrie.freeze, start:end is the node's span of
+    DomainTrie.sections and count the number of entries in its subtree.
+    """
+    __slots__ = ('code', 'depth', 'sections', 'children', 'start', 'end', 'count')
+
+    def __init__(self, code, depth):
+        self.code = code
+        self.depth = depth
+        self.sections = []
+        self.children = {}
+        self.start = self.end = self.count = 0
+
+    @property
+    def label(self):
+        """The node's first label, or its bare code if no label carries it."""
+        return self.sections[0][0] if self.sections else self.code
+
+
+class DomainTrie:
+    """Entries grouped by semantic domain, indexed by DDP4 code.
+
+    Build it with from_groups (or add, then freeze). sections lists every
+    (label, entries) pair in output order: coded labels in code order, then
+    labels without a code alphabetically. flat_sections gives the order the
+    flat domain listing has always used, where labels with a single-level
+    code ("7 Physical actions") sort among the uncoded ones.
+    """
+
+    def __init__(self):
+        self.root = DomainNode('', 0)
+        self.uncoded = {}
+        self._groups = {}
+        self._nodes = {}
+        self.sections = []
+        self.flat_sections = []
+
+    @classmethod
+    def from_groups(cls, groups):
+        """A frozen trie over a {label: [entry, ...]} mapping; empty groups are left out."""
+        trie = cls()
+        for label, entries in groups.items():
+            if entries:
+                trie._group(label).extend(entries)
+        trie.freeze()
+        return trie
+
+    def _group(self, label):
+        entries = self._groups.get(label)
+        if entries is None:
+            entries = self._groups[label] = []
+            parts, desc = split_domain(label)
+            if parts is None:
+                self.uncoded[label] = entries
+            else:
+                node = self.root
+                for depth, part in enumerate(parts, 1):
+                    key = _part_key(part)
+                    child = node.children.get(key)
+                    if child is None:
+                        child = node.children[key] = DomainNode('.'.join(parts[:depth]), depth)
+                    node = child
+                node.sections.append((desc, label, entries))
+        return entries
+
+    def add(self, label, entry):
+        """File entry under label; call freeze once everything has been added."""
+        self._group(label).append(entry)
+
+    def freeze(self):
+        """Sort every label's entries and number the nodes; the trie is read-only afterwards."""
+        sections = []
+        flat = []
+        tail = []
+        nodes = {}
+
+        def visit(node):
+            nodes[node.code] = node
+            node.start = len(sections)
+            node.count = 0
+            own = []
+            for desc, label, entries in sorted(node.sections, key=itemgetter(0)):
+                entries.sort(key=_headword)
+                own.append((label, entries))
+                node.count += len(entries)
+            node.sections = own
+            sections.extend(own)
+            # Labels with a single-level code sort with the uncoded ones in the flat order
+            (flat if node.depth > 1 and node.code.split('.')[1][:1].isdigit() else tail).extend(own)
+            node.children = [node.children[key] for key in sorted(node.children)]
+            for child in node.children:
+                visit(child)
+                node.count += child.count
+            node.end = len(sections)
+
+        visit(self.root)
+        del nodes['']
+        uncoded = sorted(self.uncoded.items(), key=itemgetter(0))
+        for label, entries in uncoded:
+            entries.sort(key=_headword)
+        sections.extend(uncoded)
+        flat.extend(sorted(tail + uncoded, key=itemgetter(0)))
+        self._nodes = nodes
+        self.sections = sections
+        self.flat_sections = flat
+        return self
+
+    def __len__(self):
+        return len(self._groups)
+
+    def __contains__(self, code):
+        return code in self._nodes
+
+    def node(self, code):
+        """The DomainNode for a DDP4 code such as '6.6'; KeyError if no label falls under it."""
+        return self._nodes[code]
+
+    def subtree(self, code):
+        """The (label, entries) sections at and below code, in order."""
+        node = self._nodes[code]
+        return self.sections[node.start:node.end]
+
+    def count(self, code):
+        """Number of entries filed at and below code."""
+        return self._nodes[code].count
+
+    def entries(self, code):
+        """Every entry at and below code in headword order, merged from the already sorted sections."""
+        return heapq.merge(*(entries for label, entries in self.subtree(code)), key=_headword)
+
+    def walk(self):
+        """Yield (node, depth) for every coded node in pre-order."""
+        stack = list(reversed(self.root.children))
+        while stack:
+            node = stack.pop()
+            yield node, node.depth
+            stack.extend(reversed(node.children))
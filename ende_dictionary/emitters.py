@@ -0,0 +1,18 @@
+"""Registry of outputs that can be built from the configured-export entry model.
+
+An emitter is a function emit(items, output_file, jobs=1, stats=NULL_STATS)
+that receives the full list of LetterHead / ConfiguredEntry / MinorVariant
+records read from the export and writes one output, recording its stage
+times and skipped records in stats (see ende_dictionary.instrument). New outputs register themselves with
+@register_emitter and are then available to the build command.
+"""
+
+EMITTERS = {}
+
+
+def register_emitter(name, default_output):
+    """Register the decorated function as the emitter called name."""
+    def decorator(func):
+        EMITTERS[name] = (func, default_output)
+        return func
+    return decorator
@@ -0,0 +1,85 @@
+"""Choice of parser engine for the LIFT and configured-export readers.
+
+Both readers have two engines that produce identical records:
+
+lxml
+    libxml2 through lxml: iterparse for LIFT, the HTML parser (driving
+    the same per-div tree builder) for the configured export.
+stdlib
+    xml.etree.ElementTree and html.parser, always available.
+
+The engine is chosen once per process: by --engine on the command line,
+by the ENDE_PARSER_ENGINE environment variable, or with use() from Python.
+'lxml' and 'stdlib' apply to both readers. 'auto' (the default) picks
+per reader from AUTO, falling back to stdlib when lxml is not installed.
+lxml itself is only imported when a reader first needs it.
+"""
+import argparse
+import importlib.util
+import os
+
+ENGINES = ('lxml', 'stdlib')
+ENVIRONMENT_VARIABLE = 'ENDE_PARSER_ENGINE'
+
+# What 'auto' picks for each reader when lxml is installed. libxml2
+# tokenizes both formats at least twice as fast, but the LIFT reader then
+# walks every element of every entry in Python, and lxml's element proxies
+# cost more than that saves on large exports; the configured reader builds
+# its own trees from the parser's events, so it keeps the whole gain. See
+# benchmarks/bench_engines.py.
+AUTO = {'lift': 'stdlib', 'configured': 'lxml'}
+
+_choice = None
+
+
+def available():
+    """The engines that can run here."""
+    return [engine for engine in ENGINES if engine != 'lxml' or importlib.util.find_spec('lxml') is not None]
+
+
+def use(name):
+    """Make the readers use engine name ('auto', 'lxml' or 'stdlib') from now on.
+
+    Raises ValueError for an unknown engine or for 'lxml' when lxml is not
+    installed.
+    """
+    global _choice
+    if name != 'auto':
+        if name not in ENGINES:
+            raise ValueError(f"Unknown parser engine: {name} (expected auto, {', '.join(ENGINES)})")
+        if name not in available():
+            raise ValueError(f"The {name} parser engine is not installed")
+    _choice = name
+    return name
+
+
+def choice():
+    """The engine chosen with use(), or from ENDE_PARSER_ENGINE (default 'auto') if use() was never called."""
+    if _choice is None:
+        return use(os.environ.get(ENVIRONMENT_VARIABLE) or 'auto')
+    return _choice
+
+
+def current(reader):
+    """The engine reader ('lift' or 'configured') runs on under the current choice."""
+    name = choice()
+    if name == 'auto':
+        name = AUTO[reader]
+        return name if name in available() else 'stdlib'
+    return name
+
+
+class _UseEngine(argparse.Action):
+    def __call__(self, parser, namespace, values, option_string=None):
+        try:
+            use(values)
+        except ValueError as e:
+            parser.error(str(e))
+        setattr(namespace, self.dest, values)
+
+
+def add_arguments(parser):
+    """Add the --engine option to an argparse parser; it takes effect as soon as it is parsed."""
+    parser.add_argument('--engine', action=_UseEngine, choices=('auto',) + ENGINES, default='auto',
+                        help=f'parser engine for the exports (default auto: lxml for configured exports when '
+                             f'installed, ElementTree for LIFT; also set by {ENVIRONMENT_VARIABLE})')
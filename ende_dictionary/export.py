@@ -0,0 +1,216 @@
+"""Structured exports of the grouped entries the LIFT converters build.
+
+The verb and semantic converters can write their sections, the same
+(group, entries) pairs in the same order they render as LaTeX, in two
+other formats:
+
+jsonl
+    JSON Lines, one grouped entry per line, streamed to the output as it
+    is encoded. Verb lines carry their verb_class and examples, domain
+    lines their domain; an entry listed under several domains appears
+    once per domain, as it does in the LaTeX.
+sqlite
+    A SQLite database loaded in a single transaction, one executemany
+    per table fed straight from the sections so no row list is built. Indexes on headword, part of speech, verb class and
+    domain are created after the rows are in. A sense listed under several
+    domains is stored once, with one sense_domains row per domain.
+
+Both write to a temporary file next to the target and only replace it
+once the export is complete.
+"""
+import os
+
+from .binfile import atomic_write
+from .instrument import NULL_STATS
+from .latex import LatexWriter
+
+FORMATS = ('jsonl', 'sqlite')
+# SQLite page cache for the load and the index builds, in KiB
+CACHE_KB = 256 * 1024
+EXTENSIONS = {'latex': '.tex', 'jsonl': '.jsonl', 'sqlite': '.sqlite'}
+
+VERB_SCHEMA = """
+CREATE TABLE verbs (
+    id INTEGER PRIMARY KEY,
+    verb_class TEXT NOT NULL,
+    headword TEXT NOT NULL,
+    analytic_plural TEXT,
+    definition TEXT
+);
+CREATE TABLE verb_examples (
+    verb_id INTEGER NOT NULL REFERENCES verbs(id),
+    position INTEGER NOT NULL,
+    sentence TEXT NOT NULL,
+    translation TEXT NOT NULL
+);
+"""
+VERB_INDEXES = """
+CREATE INDEX verbs_headword ON verbs(headword);
+CREATE INDEX verbs_verb_class ON verbs(verb_class);
+CREATE INDEX verb_examples_verb_id ON verb_examples(verb_id);
+"""
+
+DOMAIN_SCHEMA = """
+CREATE TABLE senses (
+    id INTEGER PRIMARY KEY,
+    headword TEXT NOT NULL,
+    pos TEXT,
+    sense_number INTEGER NOT NULL,
+    definition TEXT
+);
+CREATE TABLE domains (
+    id INTEGER PRIMARY KEY,
+    domain TEXT NOT NULL
+);
+CREATE TABLE sense_domains (
+    sense_id INTEGER NOT NULL REFERENCES senses(id),
+    domain_id INTEGER NOT NULL REFERENCES domains(id)
+);
+"""
+DOMAIN_INDEXES = """
+CREATE INDEX senses_headword ON senses(headword);
+CREATE INDEX senses_pos ON senses(pos);
+CREATE UNIQUE INDEX domains_domain ON domains(domain);
+CREATE INDEX sense_domains_domain_id ON sense_domains(domain_id);
+CREATE INDEX sense_domains_sense_id ON sense_domains(sense_id);
+"""
+
+
+def output_path(default_latex_output, fmt):
+    """The default output path for fmt, derived from a converter's default LaTeX path."""
+    return os.path.splitext(default_latex_output)[0] + EXTENSIONS[fmt]
+
+
+def verb_lines(sections):
+    """The JSON Lines for the verb converter's (verb_class, entries) sections, one entry per line."""
+    # Every field the records carry is a string or a number, so lines are
+    # put together from the C string encoder instead of building a dict per
+    # record for json.dumps, which is several times slower
+    from json.encoder import encode_basestring as _string
+    for verb_class, entries in sections:
+        prefix = '{"verb_class":' + _string(verb_class) + ',"headword":'
+        for entry in entries:
+            examples = ','.join(f'{{"sentence":{_string(ex.sentence)},"translation":{_string(ex.translation)}}}'
+                                for ex in entry.examples)
+            yield (f'{prefix}{_string(entry.headword)},"analytic_plural":{_string(entry.analytic_plural)},'
+                   f'"definition":{_string(entry.definition)},"examples":[{examples}]}}\n')
+
+
+def domain_lines(sections):
+    """The JSON Lines for the semantic converter's (domain, entries) sections, one entry per line."""
+    from json.encoder import encode_basestring as _string
+    for domain, entries in sections:
+        prefix = '{"domain":' + _string(domain) + ',"headword":'
+        for entry in entries:
+            yield (f'{prefix}{_string(entry.headword)},"pos":{_string(entry.pos)},'
+                   f'"sense_number":{entry.sense_number},"definition":{_string(entry.definition)}}}\n')
+
+
+def write_jsonl(lines, output_file):
+    """Stream lines to output_file (a path, '-' or a file); returns the number written."""
+    count = 0
+    with LatexWriter(output_file) as out:
+        for line in lines:
+            out.write(line)
+            count += 1
+    return count
+
+
+def _statements(script):
+    # executescript() would commit the transaction; run the statements one by one
+    return [statement for statement in (part.strip() for part in script.split(';')) if statement]
+
+
+def _bulk_load(path, schema, indexes, load):
+    """Create a database at path with schema, run load(connection) and index it, all in one transaction."""
+    # Only the sqlite format needs it; kept out of every converter's start-up
+    import sqlite3
+    with atomic_write(path) as tmp_path:
+        connection = sqlite3.connect(tmp_path, isolation_level=None)
+        try:
+            # The file only becomes the export once it is complete, so there
+            # is nothing for a rollback journal or fsyncs to protect
+            connection.execute('PRAGMA journal_mode = OFF')
+            connection.execute('PRAGMA synchronous = OFF')
+            connection.execute(f'PRAGMA cache_size = -{CACHE_KB}')
+            connection.execute('BEGIN')
+            for statement in _statements(schema):
+                connection.execute(statement)
+            count = load(connection)
+            # Building the indexes once over the loaded rows is much cheaper
+            # than keeping them up to date row by row
+            for statement in _statements(indexes):
+                connection.execute(statement)
+            connection.execute('COMMIT')
+        finally:
+            connection.close()
+    return count
+
+
+def write_verbs_sqlite(sections, path):
+    """Load the verb converter's (verb_class, entries) sections into a new SQLite database at path.
+
+    Returns the number of verbs written.
+    """
+    def load(connection):
+        entries = [(verb_class, entry) for verb_class, class_entries in sections for entry in class_entries]
+        connection.executemany('INSERT INTO verbs VALUES (?, ?, ?, ?, ?)', (
+            (verb_id, verb_class, entry.headword, entry.analytic_plural, entry.definition)
+            for verb_id, (verb_class, entry) in enumerate(entries, 1)))
+        connection.executemany('INSERT INTO verb_examples VALUES (?, ?, ?, ?)', (
+            (verb_id, position, ex.sentence, ex.translation)
+            for verb_id, (verb_class, entry) in enumerate(entries, 1)
+            for position, ex in enumerate(entry.examples)))
+        return len(entries)
+
+    return _bulk_load(path, VERB_SCHEMA, VERB_INDEXES, load)
+
+
+def write_domains_sqlite(sections, path):
+    """Load the semantic converter's (domain, entries) sections into a new SQLite database at path.
+
+    Each distinct sense record becomes one senses row however many domains
+    list it, linked to them through sense_domains. Domain ids follow the
+    order of the sections. Returns the number of senses written.
+    """
+    def load(connection):
+        sense_ids = {}
+
+        def senses():
+            for domain, entries in sections:
+                for entry in entries:
+                    key = id(entry)
+                    if key not in sense_ids:
+                        sense_id = sense_ids[key] = len(sense_ids) + 1
+                        yield sense_id, entry.headword, entry.pos, entry.sense_number, entry.definition
+
+        connection.executemany('INSERT INTO domains VALUES (?, ?)', (
+            (domain_id, domain) for domain_id, (domain, entries) in enumerate(sections, 1)))
+        connection.executemany('INSERT INTO senses VALUES (?, ?, ?, ?, ?)', senses())
+        connection.executemany('INSERT INTO sense_domains VALUES (?, ?)', (
+            (sense_ids[id(entry)], domain_id)
+            for domain_id, (domain, entries) in enumerate(sections, 1) for entry in entries))
+        return len(sense_ids)
+
+    return _bulk_load(path, DOMAIN_SCHEMA, DOMAIN_INDEXES, load)
+
+
+def export_sections(fmt, kind, sections, output_file, stats=NULL_STATS):
+    """Write a converter's sections to output_file in fmt ('jsonl' or 'sqlite'); kind is 'verb' or 'domain'.
+
+    Timed as stats' emit stage. Returns the number of records written.
+    """
+    with stats.stage('emit'):
+        if fmt == 'jsonl':
+            return write_jsonl(verb_lines(sections) if kind == 'verb' else domain_lines(sections), output_file)
+        if fmt == 'sqlite':
+            write = write_verbs_sqlite if kind == 'verb' else write_domains_sqlite
+            return write(sections, output_file)
+    raise ValueError(f"Unknown export format: {fmt}")
+
+
+def add_arguments(parser):
+    """Add the --format option to a LIFT converter's argparse parser."""
+    parser.add_argument('--format', choices=('latex',) + FORMATS, default='latex',
+                        help="write LaTeX (default), JSON Lines or a SQLite database; without -o the "
+                             "output name gets the format's extension")
@@ -0,0 +1,319 @@
+"""Approximate ("did you mean") lookup of Ende forms.
+
+The index covers every spelling a reader might look an entry up by: LIFT
+headwords and analytic plurals, and the headwords, allomorphs and minor
+entry variants of a configured export. Each form is filed under the
+headword of its main entry, so a hit on a variant or an allomorph leads
+straight to the entry that describes it.
+
+Lookups use the symmetric-delete method (SymSpell). Every form is filed
+under each string that deleting up to MAX_DISTANCE characters from it
+gives; two strings within that Levenshtein distance always share one of
+them, so the candidates for a query are the forms filed under the query's
+own deletions, and only those are checked with a bounded edit distance.
+Forms are compared case-folded and NFC-normalized.
+
+The file has the layout of the reverse index (see ende_dictionary.binfile):
+a header, little-endian arrays and UTF-8 blobs, memory-mapped on open.
+Deletion strings are stored as sorted 64-bit blake2b digests, looked up
+with a C bisect, so opening does no work in proportion to the lexicon:
+
+    python -m ende_dictionary fuzzy-index build ende.fuzzy --lift dictionary-verb-20250513.lift
+    python -m ende_dictionary fuzzy-index query ende.fuzzy "ndabä"
+"""
+import argparse
+import hashlib
+import struct
+import unicodedata
+from array import array
+from bisect import bisect_left
+
+from .binfile import MappedFile, atomic_write, blob, little_endian
+
+MAGIC = b'ENDEFZY1'
+MAX_DISTANCE = 2
+KINDS = ('headword', 'allomorph', 'analytic plural', 'variant')
+# magic, max distance, key count, key posting count, form count, record
+# count, headword count, and the byte lengths of the form, spelling and
+# headword blobs; padded so the 64-bit key array after it is aligned
+_HEADER = struct.Struct('<8s9I4x')
+
+
+def normalize(form):
+    """The form a spelling is indexed and looked up under: NFC, case-folded, single-spaced."""
+    return ' '.join(unicodedata.normalize('NFC', form).casefold().split())
+
+
+def deletions(form, distance=MAX_DISTANCE):
+    """form and every string made by deleting up to distance characters from it."""
+    result = {form}
+    frontier = result
+    for _ in range(distance):
+        frontier = {word[:i] + word[i + 1:] for word in frontier for i in range(len(word))}
+        result |= frontier
+    return result
+
+
+def _key(text):
+    return int.from_bytes(hashlib.blake2b(text.encode('utf-8'), digest_size=8).digest(), 'little')
+
+
+# The characters a substitution, a deletion or an insertion consumes from
+# each string, paired up for an edit at each end and keyed by the length
+# difference they account for
+_EDITS = ((1, 1), (1, 0), (0, 1))
+_END_EDITS = {}
+for _front in _EDITS:
+    for _back in _EDITS:
+        _END_EDITS.setdefault(_front[0] + _back[0] - _front[1] - _back[1], []).append(_front + _back)
+del _front, _back
+
+
+def edit_distance(a, b, limit=MAX_DISTANCE):
+    """Levenshtein distance between a and b, or limit + 1 as soon as it is certain to exceed limit.
+
+    Made for the small limits of this index: the work grows as 3 ** limit
+    but not with the length of the strings beyond their differing core.
+    """
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    # Candidates share most of their characters with the query: trim the
+    # common prefix and suffix, then the first remaining characters differ
+    # and one of them must be substituted, deleted or inserted
+    start = 0
+    shorter = min(len(a), len(b))
+    while start < shorter and a[start] == b[start]:
+        start += 1
+    end = 0
+    while end < shorter - start and a[-1 - end] == b[-1 - end]:
+        end += 1
+    a, b = a[start:len(a) - end], b[start:len(b) - end]
+    if not a or not b:
+        return min(len(a) + len(b), limit + 1)
+    if limit == 0:
+        return 1
+    if a[1:] == b[1:] or a[1:] == b or a == b[1:]:
+        return 1
+    if limit == 1:
+        return 2
+    if limit == 2:
+        # Two edits: one at each end of the differing cores
+        for front_a, front_b, back_a, back_b in _END_EDITS.get(len(a) - len(b), ()):
+            if front_a + back_a <= len(a) and front_b + back_b <= len(b) and \
+                    a[front_a:len(a) - back_a] == b[front_b:len(b) - back_b]:
+                return 2
+        return 3
+    rest = limit - 1
+    best = min(edit_distance(a[1:], b[1:], rest), edit_distance(a[1:], b, rest), edit_distance(a, b[1:], rest))
+    return min(best + 1, limit + 1)
+
+
+class Match:
+    """A form within the query's edit distance, and the main entry it belongs to."""
+    __slots__ = ('form', 'kind', 'headword', 'distance')
+
+    def __init__(self, form, kind, headword, distance):
+        self.form = form
+        self.kind = kind
+        self.headword = headword
+        self.distance = distance
+
+    def __repr__(self):
+        return f'Match({self.form!r}, {self.kind!r}, {self.headword!r}, {self.distance})'
+
+
+def lift_forms(records):
+    """(form, kind, headword) for the headword and analytic plurals of every LIFT entry."""
+    for record in records:
+        if not record.headword:
+            continue
+        yield record.headword, 'headword', record.headword
+        for plural in record.analytic_plurals:
+            yield plural, 'analytic plural', record.headword
+
+
+def configured_forms(items):
+    """(form, kind, headword) for the headwords, allomorphs and minor variants of a configured export."""
+    from .configured import ConfiguredEntry, MinorVariant
+    for item in items:
+        if isinstance(item, ConfiguredEntry):
+            if item.headword:
+                yield item.headword, 'headword', item.headword
+                for allomorph in item.allomorphs:
+                    yield allomorph, 'allomorph', item.headword
+        elif isinstance(item, MinorVariant):
+            if item.problem is None:
+                yield item.headword, 'variant', item.referenced
+
+
+def write_index(forms, path):
+    """Write the index for (form, kind, headword) triples to path, atomically; returns the record count.
+
+    Repeated triples, and forms that normalize to nothing, are left out.
+    """
+    records = sorted({(normalize(form), form, KINDS.index(kind), headword)
+                      for form, kind, headword in forms if normalize(form)})
+    headwords = sorted({headword for _, _, _, headword in records})
+    headword_numbers = {headword: number for number, headword in enumerate(headwords)}
+
+    normalized = []
+    form_records = array('I')
+    for number, (form, _, _, _) in enumerate(records):
+        if not normalized or normalized[-1] != form:
+            normalized.append(form)
+            form_records.append(number)
+    form_records.append(len(records))
+
+    # One (deletion key, form) pair per deletion, packed into an int so a
+    # single sort groups them by key
+    pairs = sorted(_key(deletion) << 32 | number
+                   for number, form in enumerate(normalized) for deletion in deletions(form))
+    keys = array('Q')
+    key_offsets = array('I')
+    key_forms = array('I')
+    for pair in pairs:
+        key = pair >> 32
+        if not keys or keys[-1] != key:
+            keys.append(key)
+            key_offsets.append(len(key_forms))
+        key_forms.append(pair & 0xffffffff)
+    key_offsets.append(len(key_forms))
+
+    form_offsets, form_blob = blob(normalized)
+    spelling_offsets, spelling_blob = blob(spelling for _, spelling, _, _ in records)
+    headword_offsets, headword_blob = blob(headwords)
+    record_kinds = array('I', (kind for _, _, kind, _ in records))
+    record_headwords = array('I', (headword_numbers[headword] for _, _, _, headword in records))
+
+    with atomic_write(path) as tmp_path, open(tmp_path, 'wb') as f:
+        f.write(_HEADER.pack(MAGIC, MAX_DISTANCE, len(keys), len(key_forms), len(normalized), len(records),
+                             len(headwords), len(form_blob), len(spelling_blob), len(headword_blob)))
+        for values in (keys, key_offsets, key_forms, form_offsets, form_records, record_kinds,
+                       record_headwords, spelling_offsets, headword_offsets):
+            f.write(little_endian(values))
+        f.write(form_blob)
+        f.write(spelling_blob)
+        f.write(headword_blob)
+    return len(records)
+
+
+def build_index(path, lift_files=(), configured_files=()):
+    """Index the forms of the given LIFT and configured exports into path; returns the record count."""
+    from .configured import iter_items
+    from .lift import iter_records
+
+    def forms():
+        for lift_file in lift_files:
+            yield from lift_forms(iter_records(lift_file))
+        for configured_file in configured_files:
+            yield from configured_forms(iter_items(configured_file))
+
+    return write_index(forms(), path)
+
+
+class FuzzyIndex(MappedFile):
+    """Read-only, memory-mapped view of an index file written by write_index.
+
+    Use as a context manager, or call close(), to release the mapping.
+    """
+
+    def __init__(self, path):
+        super().__init__(path)
+        (magic, self.max_distance, key_count, key_form_count, self.form_count, self.record_count,
+         headword_count, form_bytes, spelling_bytes, headword_bytes) = _HEADER.unpack_from(self._view)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a fuzzy index file")
+        arrays, position = self._arrays(_HEADER.size, [
+            ('Q', key_count), ('I', key_count + 1), ('I', key_form_count),
+            ('I', self.form_count + 1), ('I', self.form_count + 1),
+            ('I', self.record_count), ('I', self.record_count),
+            ('I', self.record_count + 1), ('I', headword_count + 1)])
+        (self._keys, self._key_offsets, self._key_forms, self._form_offsets, self._form_records,
+         self._record_kinds, self._record_headwords, self._spelling_offsets, self._headword_offsets) = arrays
+        (self._forms, self._spellings, self._headwords), _ = self._blobs(
+            position, (form_bytes, spelling_bytes, headword_bytes))
+
+    def _form(self, number):
+        return str(self._forms[self._form_offsets[number]:self._form_offsets[number + 1]], 'utf-8')
+
+    def _candidates(self, query, distance):
+        keys, offsets, forms = self._keys, self._key_offsets, self._key_forms
+        candidates = set()
+        for deletion in deletions(query, distance):
+            key = _key(deletion)
+            i = bisect_left(keys, key)
+            if i < len(keys) and keys[i] == key:
+                candidates.update(forms[offsets[i]:offsets[i + 1]])
+        return candidates
+
+    def _matches(self, number, distance):
+        headwords, spellings = self._headword_offsets, self._spelling_offsets
+        for record in range(self._form_records[number], self._form_records[number + 1]):
+            headword = self._record_headwords[record]
+            yield Match(str(self._spellings[spellings[record]:spellings[record + 1]], 'utf-8'),
+                        KINDS[self._record_kinds[record]],
+                        str(self._headwords[headwords[headword]:headwords[headword + 1]], 'utf-8'),
+                        distance)
+
+    def lookup(self, query, max_distance=None, limit=None):
+        """Matches for every indexed form within max_distance (default: the index's) of query.
+
+        Closest first, then by form; at most limit of them. A form filed
+        under several entries gives one Match per entry.
+        """
+        distance = self.max_distance if max_distance is None else max_distance
+        if distance > self.max_distance:
+            raise ValueError(f"This index only supports edit distances up to {self.max_distance}")
+        query = normalize(query)
+        scored = []
+        for number in self._candidates(query, distance):
+            form = self._form(number)
+            found = edit_distance(query, form, distance)
+            if found <= distance:
+                scored.append((found, form, number))
+        scored.sort()
+        matches = []
+        for found, form, number in scored:
+            matches.extend(self._matches(number, found))
+            if limit is not None and len(matches) >= limit:
+                return matches[:limit]
+        return matches
+
+    def suggest(self, query, max_distance=None, limit=None):
+        """The main-entry headwords of lookup(query), closest first, each once."""
+        seen = {}
+        for match in self.lookup(query, max_distance):
+            seen.setdefault(match.headword, match.distance)
+        return list(seen)[:limit]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Build or query the approximate index of Ende forms.')
+    commands = parser.add_subparsers(dest='command', required=True)
+    build = commands.add_parser('build', help='index the headwords and variant forms of LIFT and configured exports')
+    build.add_argument('index_file')
+    build.add_argument('--lift', action='append', default=[], metavar='FILE',
+                       help='LIFT export to take headwords and analytic plurals from (repeatable)')
+    build.add_argument('--configured', action='append', default=[], metavar='FILE',
+                       help='configured export to take headwords, allomorphs and variants from (repeatable)')
+    query = commands.add_parser('query', help='print the forms within edit distance of a query')
+    query.add_argument('index_file')
+    query.add_argument('query')
+    query.add_argument('--max-distance', type=int, default=None, metavar='N')
+    query.add_argument('--limit', type=int, default=None)
+    args = parser.parse_args(argv)
+
+    if args.command == 'build':
+        if not (args.lift or args.configured):
+            build.error('give at least one --lift or --configured export')
+        count = build_index(args.index_file, args.lift, args.configured)
+        print(f"Indexed {count} forms into {args.index_file}")
+        return
+    with FuzzyIndex(args.index_file) as index:
+        for match in index.lookup(args.query, args.max_distance, args.limit):
+            print(f"{match.distance}\t{match.form}\t{match.kind}\t{match.headword}")
+
+
+if __name__ == '__main__':
+    main()
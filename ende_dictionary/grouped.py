@@ -0,0 +1,42 @@
+"""Compact records for the grouped entries the converters build and render.
+
+One record is made per listed item and shared wherever the item is
+grouped: a sense in three semantic domains is one DomainSense referenced
+from three lists, not three copies. The label fields (part of speech,
+domain, verb class) hold the strings the readers interned, so each
+distinct label is stored once however many records carry it.
+"""
+
+# Verb inflection classes (Verb-infl-class trait values), in the order the verb dictionary lists them
+VERB_CLASSES = ['I', 'II', 'III', 'IV', 'Irregular']
+
+
+class VerbItem:
+    """A verb listed under its inflection class; examples are complete LiftExample records."""
+    __slots__ = ('headword', 'analytic_plural', 'definition', 'examples')
+
+    def __init__(self, headword, analytic_plural, definition, examples):
+        self.headword = headword
+        self.analytic_plural = analytic_plural
+        self.definition = definition
+        self.examples = examples
+
+
+class DomainSense:
+    """One numbered sense of an entry, listed under each of its semantic domains."""
+    __slots__ = ('headword', 'pos', 'sense_number', 'definition')
+
+    def __init__(self, headword, pos, sense_number, definition):
+        self.headword = headword
+        self.pos = pos
+        self.sense_number = sense_number
+        self.definition = definition
+
+
+class WordListItem:
+    """A headword listed under a part of speech with its definitions."""
+    __slots__ = ('headword', 'definitions')
+
+    def __init__(self, headword, definitions):
+        self.headword = headword
+        self.definitions = definitions
@@ -0,0 +1,210 @@
+"""Incremental rebuilds of sectioned LaTeX output across dated exports.
+
+A build keeps a manifest next to its fragments that records, for every
+entry guid (from the LIFT export, or the div id of the configured one), a
+digest of the fields the reader extracted and the sections the entry was
+placed in. On the next run the new export is compared with the manifest,
+and only sections that gained, lost or changed an entry are rendered
+again. Each section lives in its own fragment file and the main output
+just \\input's them in order.
+
+The manifest also carries a digest of the code that groups and renders the
+sections; when that code changes, every section is rendered again.
+"""
+import hashlib
+import os
+import re
+import sys
+import time
+
+from . import latex
+from .instrument import NULL_STATS
+from .latex import write_text
+from .parallel import render_sections
+from .snapshot import parser_version
+
+MANIFEST_NAME = 'manifest.json'
+MANIFEST_VERSION = 2
+# The file names fragment_name gives out
+_FRAGMENT_FILE = re.compile(r'[0-9A-Za-z-]+-[0-9a-f]{8}\.tex\Z')
+
+
+def _values(record):
+    if isinstance(record, (list, tuple)):
+        return [_values(item) for item in record]
+    if hasattr(type(record), '__slots__'):
+        return [_values(getattr(record, name)) for name in record.__slots__]
+    return record
+
+
+def entry_digest(record):
+    """Digest of everything the reader extracted from an entry (every slot, nested records included)."""
+    key = repr(_values(record))
+    return hashlib.blake2b(key.encode('utf-8'), digest_size=16).hexdigest()
+
+
+def code_version(*functions):
+    """Digest of the source of the modules defining functions, and of ende_dictionary.latex."""
+    modules = {sys.modules[function.__module__] for function in functions} | {latex}
+    digest = hashlib.blake2b(digest_size=16)
+    for module in sorted(modules, key=lambda module: module.__name__):
+        digest.update(parser_version(module))
+    return digest.hexdigest()
+
+
+def fragment_name(section):
+    """A stable, TeX-safe file name for a section key."""
+    slug = re.sub(r'[^0-9A-Za-z]+', '-', section).strip('-')[:40] or 'section'
+    digest = hashlib.blake2b(section.encode('utf-8'), digest_size=4).hexdigest()
+    return f'{slug}-{digest}.tex'
+
+
+def default_fragment_dir(output_file):
+    """The fragment directory kept next to output_file: its name with -sections for the extension."""
+    return os.path.splitext(output_file)[0] + '-sections'
+
+
+def add_arguments(parser, section, sections):
+    """Add the --incremental and --fragment-dir options to an argparse parser.
+
+    section and sections name the unit a fragment holds, e.g. 'domain'
+    and 'domains', for the help text.
+    """
+    parser.add_argument('--incremental', action='store_true',
+                        help=f'write one fragment per {section} and re-render only the {sections} '
+                             'whose entries changed')
+    parser.add_argument('--fragment-dir', metavar='DIR',
+                        help='directory of the --incremental fragments (default: the output file '
+                             'with -sections for its extension)')
+
+
+def diff_entries(old_entries, new_entries):
+    """Return the sorted (added, removed, changed) guids between two manifests' entry maps."""
+    added = sorted(new_entries.keys() - old_entries.keys())
+    removed = sorted(old_entries.keys() - new_entries.keys())
+    changed = sorted(guid for guid in new_entries.keys() & old_entries.keys()
+                     if new_entries[guid][0] != old_entries[guid][0])
+    return added, removed, changed
+
+
+def load_manifest(fragment_dir, code=None):
+    """The manifest in fragment_dir, or an empty one if it is missing, outdated or for other code."""
+    import json
+    path = os.path.join(fragment_dir, MANIFEST_NAME)
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            manifest = json.load(f)
+    except (FileNotFoundError, ValueError):
+        return {'entries': {}, 'fragments': {}}
+    if manifest.get('version') != MANIFEST_VERSION or manifest.get('code') != code:
+        return {'entries': {}, 'fragments': {}}
+    return manifest
+
+
+class IncrementalResult:
+    """What an incremental build found and did."""
+    __slots__ = ('added', 'removed', 'changed', 'rendered', 'deleted', 'seconds')
+
+    def __init__(self, added, removed, changed, rendered, deleted, seconds):
+        self.added = added
+        self.removed = removed
+        self.changed = changed
+        self.rendered = rendered
+        self.deleted = deleted
+        self.seconds = seconds
+
+    def summary(self):
+        return (f"{len(self.added)} added, {len(self.removed)} removed, {len(self.changed)} changed; "
+                f"re-rendered {len(self.rendered)} section(s), removed {len(self.deleted)} fragment(s) "
+                f"in {self.seconds * 1000:.1f} ms")
+
+
+def build(records, sections_for, render_section, section_sort_key, preamble, output_file, fragment_dir,
+          stats=NULL_STATS, jobs=1, entry_key=None):
+    """Bring output_file and its per-section fragments up to date with records.
+
+    records yields the reader's records; sections_for(record) yields the
+    (section, item) pairs the converter groups the entry into;
+    render_section(section, items) returns a section's LaTeX and must be a
+    module-level function, as it is run through parallel.render_sections
+    on up to jobs processes. Sections are ordered by section_sort_key, or
+    kept in the order they first occur if it is None. entry_key(record)
+    gives the key an entry is tracked under in the manifest, by default
+    its guid. Only sections touched by an added, removed or changed entry
+    (or whose fragment is missing), or whose entries are not the same ones
+    in the same order, are rendered and written, and fragment files of
+    sections that are gone are deleted. Grouping, ordering and writing are
+    timed as stats' group, sort and emit stages.
+    """
+    import json
+    code = code_version(sections_for, render_section)
+    old = load_manifest(fragment_dir, code)
+    old_entries = old['entries']
+    old_fragments = old['fragments']
+
+    groups = {}
+    members = {}
+    new_entries = {}
+    group = stats.stage('group')
+    for index, record in enumerate(records):
+        with group:
+            # Entries without a key are keyed by position, so any shift re-renders them
+            guid = (entry_key(record) if entry_key is not None else record.guid) or f'#{index}'
+            sections = []
+            for section, item in sections_for(record):
+                groups.setdefault(section, []).append(item)
+                if section not in sections:
+                    sections.append(section)
+                    members.setdefault(section, []).append(guid)
+            new_entries[guid] = [entry_digest(record), sections]
+
+    start = time.perf_counter()
+    added, removed, changed = diff_entries(old_entries, new_entries)
+    affected = set()
+    for guid in removed + changed:
+        affected.update(old_entries[guid][1])
+    for guid in added + changed:
+        affected.update(new_entries[guid][1])
+    # An entry that kept its content but moved to another section, or
+    # within one whose items keep export order, changes the member lists
+    member_digests = {section: hashlib.blake2b(repr(guids).encode('utf-8'), digest_size=16).hexdigest()
+                      for section, guids in members.items()}
+    old_members = old.get('members', {})
+    affected.update(section for section, digest in member_digests.items() if old_members.get(section) != digest)
+
+    os.makedirs(fragment_dir, exist_ok=True)
+    with stats.stage('sort'):
+        order = sorted(groups, key=section_sort_key) if section_sort_key is not None else list(groups)
+    fragments = {section: fragment_name(section) for section in order}
+    emit = stats.stage('emit')
+    emit.start()
+    rendered = [section for section in order
+                if section in affected or section not in old_fragments
+                or not os.path.exists(os.path.join(fragment_dir, fragments[section]))]
+    texts = render_sections(render_section, [(section, groups[section]) for section in rendered], jobs)
+    for section, text in zip(rendered, texts):
+        write_text(os.path.join(fragment_dir, fragments[section]), text)
+
+    # Scan the directory rather than trust the old manifest, which is
+    # empty when it was unreadable or written by other code
+    current = set(fragments.values())
+    deleted = sorted(name for name in os.listdir(fragment_dir)
+                     if _FRAGMENT_FILE.match(name) and name not in current)
+    for name in deleted:
+        try:
+            os.remove(os.path.join(fragment_dir, name))
+        except FileNotFoundError:
+            pass
+
+    if rendered or deleted or not os.path.exists(output_file):
+        rel_dir = os.path.relpath(fragment_dir, os.path.dirname(os.path.abspath(output_file)))
+        inputs = ''.join(f"\\input{{{rel_dir}/{fragments[section]}}}\n".replace(os.sep, '/')
+                         for section in order)
+        write_text(output_file, preamble + inputs)
+
+    write_text(os.path.join(fragment_dir, MANIFEST_NAME), json.dumps(
+        {'version': MANIFEST_VERSION, 'code': code, 'entries': new_entries, 'fragments': fragments,
+         'members': member_digests},
+        ensure_ascii=False, sort_keys=True))
+    emit.stop()
+    return IncrementalResult(added, removed, changed, rendered, deleted, time.perf_counter() - start)
@@ -0,0 +1,256 @@
+"""Run statistics shared by the converters: stage timers, skip counters and profiling.
+
+A converter creates one Stats per run and hands it down to the readers,
+groupers and emitters. They time their work with stats.stage(name) and call
+stats.skip() / stats.warn() instead of logging every record, and the run
+ends with a single summary:
+
+    with instrument.session(args) as stats:
+        groups = parse_lift_file(input_file, stats=stats)
+        generate_latex(groups, output_file, stats=stats)
+
+Stage times are exclusive: starting a stage pauses whichever one is
+running, so the time a streaming reader spends inside an emit loop counts
+as read or parse, not emit. Library callers that pass no Stats get
+NULL_STATS, which records nothing.
+"""
+import contextlib
+import sys
+import time
+from collections import Counter
+
+STAGES = ('read', 'parse', 'group', 'sort', 'emit')
+SAMPLES_PER_REASON = 3
+
+
+class Stage:
+    """Accumulated wall-clock and CPU time of one stage; usable as a re-entrant context manager."""
+    __slots__ = ('stats', 'name', 'wall', 'cpu', 'calls', '_depth', '_parent', '_wall_start', '_cpu_start')
+
+    def __init__(self, stats, name):
+        self.stats = stats
+        self.name = name
+        self.wall = 0.0
+        self.cpu = 0.0
+        self.calls = 0
+        self._depth = 0
+        self._parent = None
+        self._wall_start = 0.0
+        self._cpu_start = 0.0
+
+    def start(self):
+        self._depth += 1
+        if self._depth > 1:
+            return
+        wall, cpu = time.perf_counter(), time.process_time()
+        parent = self.stats._running
+        if parent is not None:
+            parent._pause(wall, cpu)
+        self._parent = parent
+        self.stats._running = self
+        self.calls += 1
+        self._wall_start = wall
+        self._cpu_start = cpu
+
+    def stop(self):
+        if self._depth == 0:
+            return
+        self._depth -= 1
+        if self._depth:
+            return
+        wall, cpu = time.perf_counter(), time.process_time()
+        self._pause(wall, cpu)
+        self.stats._running = self._parent
+        if self._parent is not None:
+            self._parent._wall_start = wall
+            self._parent._cpu_start = cpu
+        self._parent = None
+
+    def _pause(self, wall, cpu):
+        self.wall += wall - self._wall_start
+        self.cpu += cpu - self._cpu_start
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.stop()
+        return False
+
+
+class _NullStage:
+    __slots__ = ()
+
+    def start(self):
+        pass
+
+    def stop(self):
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        return False
+
+
+class Stats:
+    """Stage timings, skip and warning counts, and optional profiling results of one run."""
+
+    def __init__(self):
+        self.stages = {}
+        self.skipped = Counter()
+        self.warnings = Counter()
+        self.samples = {}
+        self.peak_memory = None
+        self.allocations = []
+        self.profile_path = None
+        self._running = None
+        self._started = time.perf_counter()
+
+    def stage(self, name):
+        """Return the timer for a stage (one of STAGES), creating it on first use."""
+        timer = self.stages.get(name)
+        if timer is None:
+            timer = self.stages[name] = Stage(self, name)
+        return timer
+
+    def _sample(self, key, sample):
+        if sample is not None:
+            samples = self.samples.setdefault(key, [])
+            if len(samples) < SAMPLES_PER_REASON:
+                samples.append(sample)
+
+    def skip(self, what, reason, sample=None):
+        """Count one skipped record of kind what ('entry', 'sense', ...) and why."""
+        self.skipped[what, reason] += 1
+        self._sample((what, reason), sample)
+
+    def warn(self, reason, sample=None):
+        """Count a problem that did not cause anything to be skipped."""
+        self.warnings[reason] += 1
+        self._sample(('warning', reason), sample)
+
+    def as_dict(self):
+        order = sorted(self.stages, key=lambda name: (STAGES.index(name) if name in STAGES else len(STAGES), name))
+        return {
+            'total_s': time.perf_counter() - self._started,
+            'stages': {name: {'wall_s': self.stages[name].wall, 'cpu_s': self.stages[name].cpu,
+                              'calls': self.stages[name].calls} for name in order},
+            'skipped': [{'what': what, 'reason': reason, 'count': count,
+                         'samples': self.samples.get((what, reason), [])}
+                        for (what, reason), count in sorted(self.skipped.items())],
+            'warnings': [{'reason': reason, 'count': count, 'samples': self.samples.get(('warning', reason), [])}
+                         for reason, count in sorted(self.warnings.items())],
+            'peak_memory_bytes': self.peak_memory,
+            'allocations': self.allocations,
+            'profile': self.profile_path,
+        }
+
+    def summary(self):
+        """The end-of-run report as text."""
+        data = self.as_dict()
+        lines = [f"{'stage':<8} {'wall s':>9} {'cpu s':>9} {'calls':>9}"]
+        for name, timing in data['stages'].items():
+            lines.append(f"{name:<8} {timing['wall_s']:9.3f} {timing['cpu_s']:9.3f} {timing['calls']:9d}")
+        lines.append(f"{'total':<8} {data['total_s']:9.3f}")
+        if data['skipped']:
+            lines.append('skipped:')
+            for row in data['skipped']:
+                lines.append(f"  {row['count']:7d} {row['what']}: {row['reason']}{_examples(row['samples'])}")
+        if data['warnings']:
+            lines.append('warnings:')
+            for row in data['warnings']:
+                lines.append(f"  {row['count']:7d} {row['reason']}{_examples(row['samples'])}")
+        if self.peak_memory is not None:
+            lines.append(f"peak traced memory: {self.peak_memory / (1 << 20):.1f} MB")
+            for site, size in self.allocations:
+                lines.append(f"  {size / 1024:10.1f} KB  {site}")
+        if self.profile_path is not None:
+            lines.append(f"profile written to {self.profile_path}")
+        return '\n'.join(lines)
+
+
+def _examples(samples):
+    return f" (e.g. {'; '.join(samples)})" if samples else ''
+
+
+class _NullStats:
+    """Stand-in for Stats that records nothing."""
+
+    def stage(self, name):
+        return _NULL_STAGE
+
+    def skip(self, what, reason, sample=None):
+        pass
+
+    def warn(self, reason, sample=None):
+        pass
+
+
+_NULL_STAGE = _NullStage()
+NULL_STATS = _NullStats()
+
+
+@contextlib.contextmanager
+def capture(stats, profile_path=None, trace_memory=False, top=10):
+    """Run the with-block under cProfile and/or tracemalloc, recording the results in stats.
+
+    The profile is saved with pstats' dump format to profile_path (open it
+    with python -m pstats or snakeviz). With trace_memory the peak traced
+    size and the top allocation sites are kept in stats.
+    """
+    profiler = None
+    if trace_memory:
+        import tracemalloc
+        tracemalloc.start()
+    if profile_path is not None:
+        import cProfile
+        profiler = cProfile.Profile()
+        profiler.enable()
+    try:
+        yield stats
+    finally:
+        if profiler is not None:
+            profiler.disable()
+            profiler.dump_stats(profile_path)
+            stats.profile_path = profile_path
+        if trace_memory:
+            stats.peak_memory = tracemalloc.get_traced_memory()[1]
+            snapshot = tracemalloc.take_snapshot()
+            tracemalloc.stop()
+            stats.allocations = [(str(stat.traceback), stat.size)
+                                 for stat in snapshot.statistics('lineno')[:top]]
+
+
+def add_arguments(parser):
+    """Add the --summary, --profile and --trace-memory options to an argparse parser."""
+    group = parser.add_argument_group('instrumentation')
+    group.add_argument('--summary', choices=('text', 'json', 'none'), default='text',
+                       help='end-of-run report of stage timings and skipped records on stderr (default: text)')
+    group.add_argument('--profile', metavar='FILE', help='run under cProfile and save the stats to FILE')
+    group.add_argument('--trace-memory', action='store_true',
+                       help='record peak memory and the top allocation sites with tracemalloc')
+
+
+def report(stats, fmt='text', stream=None):
+    """Write the end-of-run summary of stats to stream (stderr by default)."""
+    if fmt == 'none':
+        return
+    stream = stream or sys.stderr
+    if fmt == 'json':
+        import json
+        json.dump(stats.as_dict(), stream, ensure_ascii=False, indent=2)
+        stream.write('\n')
+    else:
+        print(stats.summary(), file=stream)
+
+
+@contextlib.contextmanager
+def session(args):
+    """Yield a Stats for one converter run configured from add_arguments' options, then report it."""
+    stats = Stats()
+    with capture(stats, args.profile, args.trace_memory):
+        yield stats
+    report(stats, args.summary)
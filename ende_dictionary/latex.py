@@ -0,0 +1,99 @@
+"""Shared LaTeX output helpers."""
+import functools
+import os
+import re
+import sys
+import tempfile
+
+from .binfile import replacement_mode
+
+STDOUT = '-'
+
+# Every character with a special meaning in LaTeX text. The control-word
+# escapes end in {} so they cannot run into the letters that follow them.
+LATEX_ESCAPES = {
+    '&': r'\&', '%': r'\%', '$': r'\$', '#': r'\#', '_': r'\_',
+    '{': r'\{', '}': r'\}', '~': r'\textasciitilde{}', '^': r'\textasciicircum{}',
+    '\\': r'\textbackslash{}',
+}
+_LATEX_SPECIAL = re.compile('[' + re.escape(''.join(LATEX_ESCAPES)) + ']')
+
+
+def _escape_match(match):
+    return LATEX_ESCAPES[match.group()]
+
+
+@functools.lru_cache(maxsize=1 << 16)
+def escape_latex(text):
+    r"""Escape LaTeX special characters in text in a single regex pass.
+
+    POS labels, domain names and glosses repeat heavily, so results are
+    kept in a bounded LRU cache.
+
+    >>> escape_latex('50% & #1 $5 a_b {x}')
+    '50\\% \\& \\#1 \\$5 a\\_b \\{x\\}'
+    >>> escape_latex('~ada ^b c\\d')
+    '\\textasciitilde{}ada \\textasciicircum{}b c\\textbackslash{}d'
+    >>> escape_latex(r'\&')
+    '\\textbackslash{}\\&'
+    """
+    if _LATEX_SPECIAL.search(text) is None:
+        return text
+    return _LATEX_SPECIAL.sub(_escape_match, text)
+
+
+class LatexWriter:
+    """Buffered, streaming destination for generated LaTeX.
+
+    output may be a path, '-' for stdout, or an open text file or pipe.
+    Rendered pieces are written as they are produced instead of being
+    concatenated into one document string. For a path, the text goes to a
+    temporary file in the same directory which replaces the target only
+    when the with-block finishes without an exception, so a crashed run
+    never leaves a truncated .tex file behind.
+    """
+
+    def __init__(self, output, buffer_size=1 << 16):
+        self.output = output
+        self.buffer_size = buffer_size
+        self._file = None
+        self._tmp_path = None
+
+    def __enter__(self):
+        if self.output == STDOUT:
+            self._file = sys.stdout
+        elif isinstance(self.output, (str, os.PathLike)):
+            directory = os.path.dirname(os.path.abspath(self.output))
+            fd, self._tmp_path = tempfile.mkstemp(
+                prefix='.' + os.path.basename(self.output) + '.', suffix='.tmp', dir=directory)
+            self._file = open(fd, 'w', encoding='utf-8', buffering=self.buffer_size)
+        else:
+            self._file = self.output
+        return self
+
+    def write(self, text):
+        self._file.write(text)
+
+    def writelines(self, pieces):
+        self._file.writelines(pieces)
+
+    def __exit__(self, exc_type, exc, tb):
+        if self._tmp_path is None:
+            self._file.flush()
+            return False
+        tmp_path, self._tmp_path = self._tmp_path, None
+        try:
+            self._file.close()
+            if exc_type is None:
+                os.chmod(tmp_path, replacement_mode(self.output))
+                os.replace(tmp_path, self.output)
+        finally:
+            if os.path.exists(tmp_path):
+                os.remove(tmp_path)
+        return False
+
+
+def write_text(output, text):
+    """Atomically write a complete piece of text to output (see LatexWriter)."""
+    with LatexWriter(output) as out:
+        out.write(text)
@@ -0,0 +1,267 @@
+"""Helpers for reading FLEx LIFT exports."""
+import re
+import sys
+import xml.etree.ElementTree as ET
+
+from . import engines
+from .instrument import NULL_STATS
+
+
+def iter_entries(file_path, stream=True, stats=NULL_STATS):
+    """Yield every top-level <entry> element of a LIFT file in document order.
+
+    With stream=True the file is read incrementally and each entry is cleared
+    as soon as the caller moves on, so memory use stays flat no matter how
+    large the export is. With stream=False the whole tree is loaded first.
+    Time spent reading and tokenizing the XML is counted as stats' read stage.
+    The elements come from lxml or ElementTree, whichever engine
+    ende_dictionary.engines selects; read_entry handles both.
+    """
+    if engines.current('lift') == 'lxml':
+        return _iter_lxml_entries(file_path, stream, stats)
+    return _iter_etree_entries(file_path, stream, stats)
+
+
+def _iter_etree_entries(file_path, stream, stats):
+    read = stats.stage('read')
+    if not stream:
+        with read:
+            entries = ET.parse(file_path).getroot().findall('entry')
+        yield from entries
+        return
+
+    root = None
+    depth = 0
+    read.start()
+    try:
+        for event, elem in ET.iterparse(file_path, events=('start', 'end')):
+            if event == 'start':
+                if root is None:
+                    root = elem
+                depth += 1
+                continue
+            depth -= 1
+            if depth == 1:
+                if elem.tag == 'entry':
+                    read.stop()
+                    yield elem
+                    read.start()
+                # Drop the finished child (entry, header, ...) from the root
+                root.clear()
+    finally:
+        read.stop()
+
+
+# ElementTree drops comments and processing instructions and has no size
+# limits; parsing the same way keeps lxml's text and children identical
+_LXML_OPTIONS = {'remove_comments': True, 'remove_pis': True, 'huge_tree': True}
+_lxml_parser = None
+
+
+def _lxml_xml_parser():
+    global _lxml_parser
+    if _lxml_parser is None:
+        from lxml import etree
+        _lxml_parser = etree.XMLParser(**_LXML_OPTIONS)
+    return _lxml_parser
+
+
+def _iter_lxml_entries(file_path, stream, stats):
+    from lxml import etree
+    read = stats.stage('read')
+    if not stream:
+        with read:
+            entries = etree.parse(file_path, _lxml_xml_parser()).getroot().findall('entry')
+        yield from entries
+        return
+
+    read.start()
+    try:
+        # Only end events for <entry> reach Python; everything else stays in libxml2
+        for event, elem in etree.iterparse(file_path, events=('end',), tag='entry', **_LXML_OPTIONS):
+            parent = elem.getparent()
+            if parent is None or parent.getparent() is not None:
+                continue
+            read.stop()
+            yield elem
+            read.start()
+            # Drop the finished entry and whatever preceded it (header, ...)
+            elem.clear()
+            while elem.getprevious() is not None:
+                del parent[0]
+    finally:
+        read.stop()
+
+
+def clean_text(text):
+    """Clean text by removing extra whitespace and replacing underscores with spaces."""
+    if text:
+        text = re.sub(r'\s+', ' ', text.strip())
+        return text.replace('_', ' ')
+    return ''
+
+
+class LiftExample:
+    """An example sentence and its free translation, both cleaned ('' if missing)."""
+    __slots__ = ('sentence', 'translation')
+
+    def __init__(self, sentence='', translation=''):
+        self.sentence = sentence
+        self.translation = translation
+
+
+class LiftSense:
+    """One <sense> of an entry.
+
+    definition and gloss are None when the English form is absent or has no
+    text, so callers can tell a missing definition from one that cleans to ''.
+    verb_class is None when the sense carries no Verb-infl-class trait.
+    """
+    __slots__ = ('id', 'pos', 'verb_class', 'definition', 'gloss', 'domains', 'examples')
+
+    def __init__(self, sense_id=None):
+        self.id = sense_id
+        self.pos = ''
+        self.verb_class = None
+        self.definition = None
+        self.gloss = None
+        self.domains = []
+        self.examples = []
+
+
+class LiftEntry:
+    """The fields the converters need from one <entry>."""
+    __slots__ = ('guid', 'headword', 'analytic_plurals', 'senses')
+
+    def __init__(self, guid=None):
+        self.guid = guid
+        self.headword = None
+        self.analytic_plurals = []
+        self.senses = []
+
+
+def _find_form_text(elem, lang):
+    """Return the first <form lang=...><text> child element, like find("./form[@lang=...]/text")."""
+    for form in elem:
+        if form.tag == 'form' and form.get('lang') == lang:
+            for text in form:
+                if text.tag == 'text':
+                    return text
+    return None
+
+
+def _cleaned(text_elem):
+    """Clean the text of an element found by _find_form_text, or None if it has none."""
+    if text_elem is not None and text_elem.text:
+        return clean_text(text_elem.text)
+    return None
+
+
+def _visit_lexical_unit(record, elem):
+    # Only the first <lexical-unit> counts, as with entry.find('lexical-unit')
+    if record.headword is None:
+        record.headword = _cleaned(_find_form_text(elem, 'kit')) or ''
+
+
+def _visit_variant(record, elem):
+    for trait in elem:
+        if (trait.tag == 'trait' and trait.get('name') == 'environment'
+                and trait.get('value') == 'analytic plural'):
+            form = _cleaned(_find_form_text(elem, 'kit'))
+            if form is not None:
+                record.analytic_plurals.append(form)
+            return
+
+
+def _visit_example(sense, elem):
+    translation = None
+    for child in elem:
+        if child.tag == 'translation' and child.get('type') == 'Free translation':
+            translation = _find_form_text(child, 'en')
+            if translation is not None:
+                break
+    sense.examples.append(LiftExample(_cleaned(_find_form_text(elem, 'kit')) or '',
+                                      _cleaned(translation) or ''))
+
+
+def _visit_sense(record, elem):
+    sense = LiftSense(elem.get('id'))
+    gram_info = definition = gloss = None
+    for child in elem:
+        tag = child.tag
+        if tag == 'grammatical-info':
+            if gram_info is None:
+                gram_info = child
+                sense.pos = sys.intern(clean_text(child.get('value')))
+            if sense.verb_class is None:
+                for trait in child:
+                    if trait.tag == 'trait' and trait.get('name') == 'Verb-infl-class':
+                        sense.verb_class = sys.intern(trait.get('value', 'Irregular'))
+                        break
+        elif tag == 'definition':
+            if definition is None:
+                definition = _find_form_text(child, 'en')
+        elif tag == 'gloss':
+            if gloss is None and child.get('lang') == 'en':
+                for text in child:
+                    if text.tag == 'text':
+                        gloss = text
+                        break
+        elif tag == 'trait':
+            if child.get('name') == 'semantic-domain-ddp4':
+                sense.domains.append(sys.intern(clean_text(child.get('value'))))
+        elif tag == 'example':
+            _visit_example(sense, child)
+    sense.definition = _cleaned(definition)
+    sense.gloss = _cleaned(gloss)
+    record.senses.append(sense)
+
+
+_ENTRY_VISITORS = {
+    'lexical-unit': _visit_lexical_unit,
+    'variant': _visit_variant,
+    'sense': _visit_sense,
+}
+
+
+def read_entry(entry):
+    """Walk an <entry> subtree once and return its fields as a LiftEntry.
+
+    Replaces the per-field find/findall lookups: every child is visited a
+    single time and dispatched on its tag, with the same first-match rules
+    the XPath expressions used.
+    """
+    record = LiftEntry(entry.get('guid'))
+    for child in entry:
+        visit = _ENTRY_VISITORS.get(child.tag)
+        if visit is not None:
+            visit(record, child)
+    if record.headword is None:
+        record.headword = ''
+    return record
+
+
+# An <entry> element's source, self-closing or not; LIFT entries never nest
+_ENTRY_SOURCE = re.compile(r'<entry(?=[\s/>])(?:[^>]*/>|.*?</entry>)', re.S)
+
+
+def split_entries(text):
+    """The source text of every <entry> of a LIFT document, in order (see read_entry_source)."""
+    return _ENTRY_SOURCE.findall(text)
+
+
+def read_entry_source(source):
+    """Parse the source text of a single <entry> into a LiftEntry."""
+    if engines.current('lift') == 'lxml':
+        from lxml import etree
+        return read_entry(etree.fromstring(source, _lxml_xml_parser()))
+    return read_entry(ET.fromstring(source))
+
+
+def iter_records(file_path, stream=True, stats=NULL_STATS):
+    """Yield a LiftEntry for every entry of a LIFT file, timing read_entry as stats' parse stage."""
+    parse = stats.stage('parse')
+    for entry in iter_entries(file_path, stream, stats):
+        with parse:
+            record = read_entry(entry)
+        yield record
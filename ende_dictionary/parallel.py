@@ -0,0 +1,44 @@
+"""Render independent output sections across a process pool."""
+
+
+def _render_chunk(render, chunk):
+    return [render(key, items) for key, items in chunk]
+
+
+def _chunks(sections, count):
+    """Split sections into count runs of roughly equal item totals, keeping their order."""
+    total = sum(len(items) for _, items in sections) or 1
+    target = total / count
+    chunk, size = [], 0
+    for section in sections:
+        chunk.append(section)
+        size += len(section[1])
+        if size >= target:
+            yield chunk
+            chunk, size = [], 0
+    if chunk:
+        yield chunk
+
+
+def render_sections(render, sections, jobs=1):
+    """Yield render(key, items) for each of sections, optionally in parallel.
+
+    render must be a module-level function so it can be sent to worker
+    processes. Results always come back in the order of sections, so joining
+    them gives the same document as the serial path, and each one is yielded
+    as soon as it and everything before it is done. Sections are batched
+    into a few chunks per worker to keep pickling overhead down.
+    """
+    if jobs <= 1:
+        for key, items in sections:
+            yield render(key, items)
+        return
+    # Imported here: it pulls in multiprocessing, a large share of start-up
+    # for the serial runs that never use it
+    from concurrent.futures import ProcessPoolExecutor
+    sections = list(sections)
+    with ProcessPoolExecutor(max_workers=jobs) as pool:
+        futures = [pool.submit(_render_chunk, render, chunk)
+                   for chunk in _chunks(sections, jobs * 4)]
+        for future in futures:
+            yield from future.result()
@@ -0,0 +1,238 @@
+"""English-to-Ende reverse index over the definitions and glosses of a LIFT export.
+
+Every English word of a sense's definition and gloss is a term. The index
+file holds the terms as a sorted array with a postings list of sense
+numbers each, and a sense table giving each sense's LIFT id and headword.
+Senses are numbered in headword order, so postings, and therefore query
+results, come out alphabetically by headword.
+
+The file is a flat run of little-endian uint32 arrays followed by UTF-8
+string blobs, addressed through offset arrays (see ende_dictionary.binfile),
+so ReverseIndex can memory-map it and answer queries without decoding or
+copying anything up front:
+
+    python -m ende_dictionary reverse-index build dictionary-verb-20250513.lift ende.idx
+    python -m ende_dictionary reverse-index query ende.idx "sago beat" [--prefix]
+"""
+import argparse
+import re
+import struct
+from array import array
+
+from .binfile import MappedFile, atomic_write, blob, little_endian
+
+MAGIC = b'ENDERIX1'
+# magic, term count, posting count, sense count, headword count, and the
+# byte lengths of the term, sense id and headword blobs
+_HEADER = struct.Struct('<8s7I')
+_TOKEN = re.compile(r'[^\W_]+')
+# No UTF-8 sequence contains 0xff, so prefix + _AFTER sorts after every term starting with prefix
+_AFTER = b'\xff'
+
+
+def tokenize(text):
+    """Lower-cased English words of text.
+
+    >>> tokenize("To beat (sago) with the sago-beater; it's done.")
+    ['to', 'beat', 'sago', 'with', 'the', 'sago', 'beater', 'it', 's', 'done']
+    """
+    return _TOKEN.findall(text.casefold()) if text else []
+
+
+class Hit:
+    """A sense matched by a query."""
+    __slots__ = ('sense', 'sense_id', 'headword')
+
+    def __init__(self, sense, sense_id, headword):
+        self.sense = sense
+        self.sense_id = sense_id
+        self.headword = headword
+
+    def __repr__(self):
+        return f'Hit({self.sense}, {self.sense_id!r}, {self.headword!r})'
+
+
+def collect_senses(records):
+    """Return [(headword, sense_id, terms)] for every sense with English text, in headword order."""
+    senses = []
+    for entry_index, record in enumerate(records):
+        if not record.headword:
+            continue
+        for sense_index, sense in enumerate(record.senses, 1):
+            terms = set(tokenize(sense.definition)) | set(tokenize(sense.gloss))
+            if terms:
+                sense_id = sense.id or f'{record.guid or entry_index}#{sense_index}'
+                senses.append((record.headword, entry_index, sense_index, sense_id, terms))
+    senses.sort(key=lambda sense: sense[:3])
+    return [(headword, sense_id, terms) for headword, _, _, sense_id, terms in senses]
+
+
+def write_index(senses, path):
+    """Write the index for senses (as returned by collect_senses) to path, atomically."""
+    postings = {}
+    headwords = sorted({headword for headword, _, _ in senses})
+    headword_numbers = {headword: number for number, headword in enumerate(headwords)}
+    sense_headwords = array('I')
+    for number, (headword, _, terms) in enumerate(senses):
+        sense_headwords.append(headword_numbers[headword])
+        for term in terms:
+            postings.setdefault(term.encode('utf-8'), array('I')).append(number)
+
+    terms = sorted(postings)
+    term_offsets = array('I', [0])
+    posting_offsets = array('I', [0])
+    flat = array('I')
+    for term in terms:
+        term_offsets.append(term_offsets[-1] + len(term))
+        flat.extend(postings[term])
+        posting_offsets.append(len(flat))
+    term_blob = b''.join(terms)
+    sense_id_offsets, sense_id_blob = blob(sense_id for _, sense_id, _ in senses)
+    headword_offsets, headword_blob = blob(headwords)
+
+    with atomic_write(path) as tmp_path, open(tmp_path, 'wb') as f:
+        f.write(_HEADER.pack(MAGIC, len(terms), len(flat), len(senses), len(headwords),
+                             len(term_blob), len(sense_id_blob), len(headword_blob)))
+        for values in (term_offsets, posting_offsets, flat, sense_headwords,
+                       sense_id_offsets, headword_offsets):
+            f.write(little_endian(values))
+        f.write(term_blob)
+        f.write(sense_id_blob)
+        f.write(headword_blob)
+
+
+def build_index(lift_file, path, stream=True):
+    """Index the English definitions and glosses of lift_file into path; return the sense count."""
+    from .lift import iter_records
+    senses = collect_senses(iter_records(lift_file, stream))
+    write_index(senses, path)
+    return len(senses)
+
+
+class ReverseIndex(MappedFile):
+    """Read-only, memory-mapped view of an index file written by write_index.
+
+    Opening maps the file and slices the arrays out of it without reading
+    them, so load time does not depend on the size of the lexicon. Use as a
+    context manager, or call close(), to release the mapping.
+    """
+
+    def __init__(self, path):
+        super().__init__(path)
+        (magic, self.term_count, posting_count, self.sense_count, headword_count,
+         term_bytes, sense_id_bytes, headword_bytes) = _HEADER.unpack_from(self._view)
+        if magic != MAGIC:
+            self.close()
+            raise ValueError(f"{path} is not a reverse index file")
+        arrays, position = self._arrays(_HEADER.size, [
+            ('I', self.term_count + 1), ('I', self.term_count + 1), ('I', posting_count),
+            ('I', self.sense_count), ('I', self.sense_count + 1), ('I', headword_count + 1)])
+        (self._term_offsets, self._posting_offsets, self._postings, self._sense_headwords,
+         self._sense_id_offsets, self._headword_offsets) = arrays
+        (self._terms, self._sense_ids, self._headwords), _ = self._blobs(
+            position, (term_bytes, sense_id_bytes, headword_bytes))
+
+    def _term(self, i):
+        return self._terms[self._term_offsets[i]:self._term_offsets[i + 1]].tobytes()
+
+    def _lower_bound(self, key):
+        lo, hi = 0, self.term_count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            if self._term(mid) < key:
+                lo = mid + 1
+            else:
+                hi = mid
+        return lo
+
+    def _posting_list(self, i, limit=None):
+        start, end = self._posting_offsets[i], self._posting_offsets[i + 1]
+        if limit is not None:
+            end = min(end, start + limit)
+        # A list rather than a view slice, so nothing handed out pins the mapping
+        return self._postings[start:end].tolist()
+
+    def _exact_senses(self, term, limit=None):
+        key = term.encode('utf-8')
+        i = self._lower_bound(key)
+        if i < self.term_count and self._term(i) == key:
+            return self._posting_list(i, limit)
+        return []
+
+    def _prefix_senses(self, prefix):
+        key = prefix.encode('utf-8')
+        start, end = self._lower_bound(key), self._lower_bound(key + _AFTER)
+        if end - start == 1:
+            return self._posting_list(start)
+        senses = set()
+        for i in range(start, end):
+            senses.update(self._posting_list(i))
+        return sorted(senses)
+
+    def terms(self, prefix=''):
+        """The indexed terms starting with prefix, in sorted order."""
+        key = prefix.encode('utf-8')
+        start, end = self._lower_bound(key), self._lower_bound(key + _AFTER)
+        return [self._term(i).decode('utf-8') for i in range(start, end)]
+
+    def hit(self, sense):
+        """Return the Hit for sense number sense."""
+        start, end = self._sense_id_offsets[sense], self._sense_id_offsets[sense + 1]
+        headword = self._sense_headwords[sense]
+        h_start, h_end = self._headword_offsets[headword], self._headword_offsets[headword + 1]
+        return Hit(sense, str(self._sense_ids[start:end], 'utf-8'), str(self._headwords[h_start:h_end], 'utf-8'))
+
+    def exact(self, term, limit=None):
+        """Senses whose definition or gloss contains the word term, at most limit of them."""
+        return [self.hit(sense) for sense in self._exact_senses(term.casefold(), limit)]
+
+    def prefix(self, prefix, limit=None):
+        """Senses with a definition or gloss word starting with prefix, at most limit of them."""
+        return [self.hit(sense) for sense in self._prefix_senses(prefix.casefold())[:limit]]
+
+    def search(self, query, prefix_last=False, limit=None):
+        """Senses matching every word of query (AND).
+
+        With prefix_last the final word only has to be a prefix, for
+        search-as-you-type. Results are in headword order, at most limit
+        of them.
+        """
+        words = tokenize(query)
+        if not words:
+            return []
+        postings = [self._exact_senses(word) for word in words[:-1]]
+        postings.append(self._prefix_senses(words[-1]) if prefix_last else self._exact_senses(words[-1]))
+        postings.sort(key=len)
+        senses = postings[0]
+        for other in postings[1:]:
+            if not senses:
+                break
+            other = set(other)
+            senses = [sense for sense in senses if sense in other]
+        return [self.hit(sense) for sense in senses[:limit]]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Build or query the English-to-Ende reverse index.')
+    commands = parser.add_subparsers(dest='command', required=True)
+    build = commands.add_parser('build', help='index the English definitions and glosses of a LIFT export')
+    build.add_argument('lift_file')
+    build.add_argument('index_file')
+    query = commands.add_parser('query', help='print the senses matching every word of a query')
+    query.add_argument('index_file')
+    query.add_argument('query')
+    query.add_argument('--prefix', action='store_true', help='let the last word match as a prefix')
+    query.add_argument('--limit', type=int, default=None)
+    args = parser.parse_args(argv)
+
+    if args.command == 'build':
+        count = build_index(args.lift_file, args.index_file)
+        print(f"Indexed {count} senses into {args.index_file}")
+        return
+    with ReverseIndex(args.index_file) as index:
+        for hit in index.search(args.query, args.prefix, args.limit):
+            print(f"{hit.headword}\t{hit.sense_id}")
+
+
+if __name__ == '__main__':
+    main()
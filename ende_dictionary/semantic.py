@@ -0,0 +1,236 @@
+"""The semantic dictionary (dictionary_by_domain.tex): LIFT senses grouped by DDP4 semantic domain.
+
+    python -m ende_dictionary domains dictionary-20250513.lift -o dictionary_by_domain.tex
+
+parse_lift_file reads and groups an export in one go; group_records does
+the grouping for LiftEntry records already in memory, and generate_latex
+or ende_dictionary.export writes the groups out.
+"""
+import argparse
+import re
+from collections import defaultdict
+from operator import attrgetter
+
+from . import engines, export, incremental, instrument, snapshot
+from .domains import DomainTrie
+from .grouped import DomainSense
+from .instrument import NULL_STATS
+from .latex import STDOUT, LatexWriter, escape_latex
+from .parallel import render_sections
+
+DEFAULT_OUTPUT = 'dictionary_by_domain.tex'
+
+
+def domain_entries(record, stats=NULL_STATS):
+    """Yield (domain, DomainSense) for every semantic domain of every sense of a LiftEntry.
+
+    A sense listed under several domains is one DomainSense shared between them.
+    """
+    headword = record.headword
+    if not headword:
+        stats.skip('entry', 'missing headword', record.guid)
+        return
+    for i, sense in enumerate(record.senses, 1):
+        definition = sense.definition or sense.gloss or ''
+        if not any(sense.domains):
+            stats.skip('sense', 'no semantic domain', f"{headword} {i}")
+        item = DomainSense(headword, sense.pos, i, definition)
+        for domain in sense.domains:
+            if domain:  # Only include entries with a valid domain
+                yield domain, item
+
+
+def group_records(records, stats=NULL_STATS):
+    """Group the senses of LiftEntry records by semantic domain."""
+    domain_groups = defaultdict(list)
+    group = stats.stage('group')
+
+    for record in records:
+        with group:
+            for domain, item in domain_entries(record, stats):
+                domain_groups[domain].append(item)
+
+    return domain_groups
+
+
+def parse_lift_file(file_path, stream=True, stats=NULL_STATS, use_snapshot=False):
+    """Parse LIFT file and group entries by semantic domain."""
+    return group_records(snapshot.lift_records(file_path, stream, stats, use_snapshot), stats)
+
+
+LATEX_PREAMBLE = r"""
+
+"""
+
+
+def domain_sort_key(domain):
+    """Split domain into numeric parts and description for sorting."""
+    # Check if domain starts with a numeric code (e.g., '6.6.5.1')
+    if re.match(r'^\d+\.\d+', domain):
+        # Split on first space to separate code from description
+        parts = domain.split(' ', 1)
+        code = parts[0]
+        desc = parts[1] if len(parts) > 1 else ''
+        # Split code by dots and convert numeric parts to integers
+        code_parts = [int(n) if n.isdigit() else n for n in code.split('.')]
+        # Return tuple: (0 for numeric, code_parts, description)
+        return (0, code_parts, desc)
+    else:
+        # Non-numeric domain: sort after numeric domains
+        return (1, [domain])
+
+
+def sort_domain_entries(entries):
+    """Return a semantic domain's entries in headword order."""
+    return sorted(entries, key=attrgetter('headword'))
+
+
+def iter_entry_list(entries):
+    """Yield the LaTeX entrylist for entries in headword order, one entry at a time."""
+    yield "\\begin{entrylist}\n"
+    for entry in entries:
+        headword = escape_latex(entry.headword)
+        yield (
+            f"\\entry{{{headword}}}\\headword{{{headword}}}{{\\pos{{{escape_latex(entry.pos)}}}}} {{\\definition{{{escape_latex(entry.definition)}}}}}\n"
+        )
+    yield "\\end{entrylist}\n\n"
+
+
+def iter_domain_section(domain, entries):
+    """Yield the LaTeX entry list for one semantic domain, one entry at a time; entries must be in headword order."""
+    yield f"\\section*{{{escape_latex(domain)}}}\n"
+    yield from iter_entry_list(entries)
+
+
+# Heading commands for nested output by DDP4 code depth; deeper codes reuse the last
+NESTED_HEADINGS = ['section', 'subsection', 'subsubsection', 'paragraph', 'subparagraph']
+
+
+def iter_nested_section(heading, sections):
+    """Yield one DDP4 node of the nested output: its heading, then its own labels' entry lists.
+
+    heading is (depth, label, count), count being the entries of the whole
+    subtree the heading rolls up. A further label with the same code gets a
+    heading of its own at the same level.
+    """
+    depth, label, count = heading
+    command = NESTED_HEADINGS[min(depth, len(NESTED_HEADINGS)) - 1]
+    yield f"\\{command}*{{{escape_latex(label)} ({count})}}\n"
+    for i, (domain, entries) in enumerate(sections):
+        if i:
+            yield f"\\{command}*{{{escape_latex(domain)} ({len(entries)})}}\n"
+        yield from iter_entry_list(entries)
+
+
+def generate_nested_section(heading, sections):
+    """Generate one DDP4 node of the nested output (see iter_nested_section)."""
+    return ''.join(iter_nested_section(heading, sections))
+
+
+def nested_sections(trie):
+    """(heading, sections) for every node of a DomainTrie in code order, then its uncoded labels at top level."""
+    for node, depth in trie.walk():
+        yield (depth, node.label, node.count), node.sections
+    for domain, entries in trie.sections[trie.root.end:]:
+        yield (1, domain, len(entries)), [(domain, entries)]
+
+
+def generate_domain_section(domain, entries):
+    """Generate the LaTeX entry list for one semantic domain from entries in headword order."""
+    return ''.join(iter_domain_section(domain, entries))
+
+
+def sort_and_generate_domain_section(domain, entries):
+    """Generate the LaTeX entry list for one semantic domain from entries in any order."""
+    return generate_domain_section(domain, sort_domain_entries(entries))
+
+
+def generate_latex(domain_groups, output_file, jobs=1, stats=NULL_STATS, nested=False):
+    """Write the LaTeX document with entries grouped by semantic domain to output_file (a path, '-' or a file).
+
+    Entries are streamed to the output as they are rendered and a path is
+    only replaced once the whole document has been written. With jobs > 1
+    whole domains are rendered on worker processes instead. domain_groups
+    is a {domain: entries} mapping or an already frozen DomainTrie. With
+    nested, domains are written as nested sections following their DDP4
+    codes, each heading giving the number of entries it rolls up.
+    """
+    with stats.stage('sort'):
+        trie = domain_groups if isinstance(domain_groups, DomainTrie) else DomainTrie.from_groups(domain_groups)
+    if nested:
+        render, iter_section, sections = generate_nested_section, iter_nested_section, nested_sections(trie)
+    else:
+        render, iter_section, sections = generate_domain_section, iter_domain_section, trie.flat_sections
+    with stats.stage('emit'), LatexWriter(output_file) as out:
+        out.write(LATEX_PREAMBLE)
+        if jobs > 1:
+            out.writelines(render_sections(render, sections, jobs))
+        else:
+            for key, items in sections:
+                out.writelines(iter_section(key, items))
+
+
+def build_incremental(input_file, output_file, fragment_dir, stream=True, stats=NULL_STATS, use_snapshot=False,
+                      jobs=1):
+    """Rebuild only the semantic domains touched by entries that changed since the last run.
+
+    Each domain is written to its own fragment in fragment_dir and
+    output_file \\input's them; see ende_dictionary.incremental. The domains
+    to re-render are rendered on up to jobs processes.
+    """
+    return incremental.build(snapshot.lift_records(input_file, stream, stats, use_snapshot),
+                             lambda record: domain_entries(record, stats),
+                             sort_and_generate_domain_section, domain_sort_key,
+                             LATEX_PREAMBLE, output_file, fragment_dir, stats, jobs)
+
+
+def main(argv=None, default_input=None):
+    """Command-line entry point; default_input is the LIFT export read when none is given."""
+    parser = argparse.ArgumentParser(description='Generate a LaTeX dictionary grouped by semantic domain from a LIFT export.')
+    parser.add_argument('input_file', nargs='?', default=default_input,
+                        help='LIFT export to read' + (f' (default {default_input})' if default_input else ''))
+    parser.add_argument('-o', '--output',
+                        help=f"file to write, or '-' for stdout (default {DEFAULT_OUTPUT} or its --format equivalent)")
+    incremental.add_arguments(parser, 'domain', 'domains')
+    parser.add_argument('--jobs', type=int, default=1, metavar='N',
+                        help='render domains on N worker processes')
+    parser.add_argument('--nested', action='store_true',
+                        help='nest domains by DDP4 code, each heading rolling up the entries below it')
+    export.add_arguments(parser)
+    engines.add_arguments(parser)
+    snapshot.add_arguments(parser)
+    instrument.add_arguments(parser)
+    args = parser.parse_args(argv)
+    if args.input_file is None:
+        parser.error('a LIFT export to read is required')
+    if args.incremental and args.format != 'latex':
+        parser.error('--incremental only writes LaTeX')
+    if args.incremental and args.output == STDOUT:
+        parser.error('--incremental cannot write to stdout')
+    if args.format == 'sqlite' and args.output == STDOUT:
+        parser.error('a SQLite database cannot be written to stdout')
+
+    input_file = args.input_file
+    output_file = args.output or export.output_path(DEFAULT_OUTPUT, args.format)
+    with instrument.session(args) as stats:
+        if args.incremental:
+            fragment_dir = args.fragment_dir or incremental.default_fragment_dir(output_file)
+            result = build_incremental(input_file, output_file, fragment_dir, stats=stats,
+                                       use_snapshot=args.snapshot, jobs=args.jobs)
+            print(f"LaTeX file updated: {output_file} ({result.summary()})")
+            return
+        domain_groups = parse_lift_file(input_file, stats=stats, use_snapshot=args.snapshot)
+        if args.format != 'latex':
+            with stats.stage('sort'):
+                sections = DomainTrie.from_groups(domain_groups).flat_sections
+            count = export.export_sections(args.format, 'domain', sections, output_file, stats)
+            if output_file != STDOUT:
+                print(f"{args.format} export written: {output_file} ({count} records)")
+            return
+        generate_latex(domain_groups, output_file, args.jobs, stats, args.nested)
+    if output_file != STDOUT:
+        print(f"LaTeX file generated: {output_file}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,333 @@
+"""Local HTTP/JSON lookup service over a LIFT export.
+
+    python -m ende_dictionary serve dictionary-20250513.lift [--port 8765]
+
+The export is parsed once at start-up and every entry is encoded to JSON
+once; requests are answered from in-memory indexes on a single asyncio
+event loop. Endpoints (GET or HEAD):
+
+    /entries/<headword>       entries whose headword or analytic plural is <headword>
+    /entries?verb_class=I&domain=1.1&pos=Noun&limit=50&offset=0
+                              entries matching every given filter: verb_class
+                              is the class the verb dictionary lists the entry
+                              under, domain a full DDP4 domain or its number of
+                              any sense, pos the part of speech of any sense
+    /stats                    lexicon size and response cache counters
+
+Entries are returned in full, with every sense and its examples. Response
+bodies are kept in an LRU cache bounded by their total size in bytes, so
+hot queries are served without touching the indexes again.
+"""
+import argparse
+import asyncio
+import json
+import sys
+import time
+from collections import OrderedDict
+from urllib.parse import parse_qs, unquote, urlsplit
+
+from .domains import split_domain
+from .grouped import VERB_CLASSES
+
+DEFAULT_PORT = 8765
+DEFAULT_LIMIT = 50
+MAX_LIMIT = 1000
+REASONS = {200: 'OK', 400: 'Bad Request', 404: 'Not Found', 405: 'Method Not Allowed', 414: 'URI Too Long'}
+
+
+def _dumps(value):
+    return json.dumps(value, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def entry_json(record):
+    """The JSON form of a LiftEntry."""
+    return {
+        'guid': record.guid,
+        'headword': record.headword,
+        'analytic_plurals': record.analytic_plurals,
+        'senses': [{
+            'id': sense.id,
+            'pos': sense.pos,
+            'verb_class': sense.verb_class,
+            'definition': sense.definition,
+            'gloss': sense.gloss,
+            'domains': sense.domains,
+            'examples': [{'sentence': ex.sentence, 'translation': ex.translation} for ex in sense.examples],
+        } for sense in record.senses],
+    }
+
+
+def _add(index, key, number):
+    numbers = index.setdefault(key, [])
+    if not numbers or numbers[-1] != number:
+        numbers.append(number)
+
+
+class Lexicon:
+    """Entries of a LIFT export, pre-encoded as JSON, with lookup indexes.
+
+    Every index maps a key to the ascending entry numbers it occurs in.
+    Entries are filed under the verb class verbs.verb_entry lists them
+    under, and under the full label and the DDP4 code of their senses'
+    domains. Headword, part-of-speech and domain label keys are case-folded.
+    """
+
+    def __init__(self, records):
+        from .verbs import verb_entry
+        self.encoded = []
+        self.by_headword = {}
+        self.by_verb_class = {}
+        self.by_domain = {}
+        self.by_pos = {}
+        for record in records:
+            if not record.headword:
+                continue
+            number = len(self.encoded)
+            self.encoded.append(_dumps(entry_json(record)))
+            for form in [record.headword] + record.analytic_plurals:
+                _add(self.by_headword, form.casefold(), number)
+            listed = verb_entry(record)
+            if listed is not None:
+                _add(self.by_verb_class, listed[0], number)
+            for sense in record.senses:
+                if sense.pos:
+                    _add(self.by_pos, sense.pos.casefold(), number)
+                for domain in sense.domains:
+                    if domain:
+                        _add(self.by_domain, domain.casefold(), number)
+                        code, _ = split_domain(domain)
+                        if code is not None:
+                            _add(self.by_domain, '.'.join(code), number)
+
+    @classmethod
+    def from_lift(cls, lift_file, stream=True):
+        from .lift import iter_records
+        return cls(iter_records(lift_file, stream))
+
+    def lookup(self, headword):
+        return self.by_headword.get(headword.casefold(), [])
+
+    def filter(self, verb_class=None, domain=None, pos=None):
+        """Entry numbers in the given verb class with a sense in every given domain and part of speech."""
+        lists = []
+        if verb_class is not None:
+            lists.append(self.by_verb_class.get(verb_class, []))
+        if domain is not None:
+            lists.append(self.by_domain.get(domain.casefold(), []))
+        if pos is not None:
+            lists.append(self.by_pos.get(pos.casefold(), []))
+        if not lists:
+            return range(len(self.encoded))
+        lists.sort(key=len)
+        numbers = lists[0]
+        for other in lists[1:]:
+            other = set(other)
+            numbers = [number for number in numbers if number in other]
+        return numbers
+
+    def entries_json(self, numbers):
+        return b'[' + b','.join(self.encoded[number] for number in numbers) + b']'
+
+
+class LRUCache:
+    """Least-recently-used map from request target to response, bounded by total size in bytes."""
+
+    def __init__(self, max_bytes):
+        self.max_bytes = max_bytes
+        self.size = 0
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self._items = OrderedDict()
+
+    def __len__(self):
+        return len(self._items)
+
+    def get(self, key):
+        value = self._items.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self._items.move_to_end(key)
+        self.hits += 1
+        return value
+
+    @staticmethod
+    def _cost(key, value):
+        return len(key.encode('utf-8')) + len(value[1])
+
+    def put(self, key, value):
+        cost = self._cost(key, value)
+        if cost > self.max_bytes:
+            return
+        old = self._items.pop(key, None)
+        if old is not None:
+            self.size -= self._cost(key, old)
+        self._items[key] = value
+        self.size += cost
+        while self.size > self.max_bytes:
+            evicted_key, evicted = self._items.popitem(last=False)
+            self.size -= self._cost(evicted_key, evicted)
+            self.evictions += 1
+
+
+class _BadRequest(Exception):
+    pass
+
+
+def _int_param(params, name, default, maximum=None):
+    try:
+        value = int(params.get(name, default))
+    except ValueError:
+        raise _BadRequest(f"{name} must be an integer") from None
+    if value < 0:
+        raise _BadRequest(f"{name} must not be negative")
+    return min(value, maximum) if maximum is not None else value
+
+
+class LookupServer:
+    """Routes GET requests to a Lexicon, caching the encoded responses."""
+
+    def __init__(self, lexicon, cache_bytes=32 << 20):
+        self.lexicon = lexicon
+        self.cache = LRUCache(cache_bytes)
+        self.requests = 0
+
+    def respond(self, target):
+        """Return (status, JSON body) for a request target, from the cache when possible."""
+        self.requests += 1
+        if target == '/stats':
+            return 200, self.stats()
+        response = self.cache.get(target)
+        if response is None:
+            try:
+                response = self.route(target)
+            except _BadRequest as e:
+                return 400, _dumps({'error': str(e)})
+            self.cache.put(target, response)
+        return response
+
+    def route(self, target):
+        parts = urlsplit(target)
+        path = unquote(parts.path)
+        params = {name: values[-1] for name, values in parse_qs(parts.query).items()}
+        lexicon = self.lexicon
+        if path.startswith('/entries/') and len(path) > len('/entries/'):
+            headword = path[len('/entries/'):]
+            numbers = lexicon.lookup(headword)
+            body = (b'{"headword":' + _dumps(headword) + b',"entries":'
+                    + lexicon.entries_json(numbers) + b'}')
+            return (200 if numbers else 404), body
+        if path == '/entries':
+            verb_class = params.get('verb_class')
+            if verb_class is not None and verb_class not in VERB_CLASSES:
+                raise _BadRequest(f"verb_class must be one of {', '.join(VERB_CLASSES)}")
+            limit = _int_param(params, 'limit', DEFAULT_LIMIT, MAX_LIMIT)
+            offset = _int_param(params, 'offset', 0)
+            numbers = lexicon.filter(verb_class, params.get('domain'), params.get('pos'))
+            body = (b'{"total":' + str(len(numbers)).encode() + b',"offset":' + str(offset).encode()
+                    + b',"limit":' + str(limit).encode() + b',"entries":'
+                    + lexicon.entries_json(numbers[offset:offset + limit]) + b'}')
+            return 200, body
+        return 404, _dumps({'error': f"no such endpoint: {path}"})
+
+    def stats(self):
+        cache = self.cache
+        return _dumps({'entries': len(self.lexicon.encoded), 'requests': self.requests,
+                       'cache': {'items': len(cache), 'bytes': cache.size, 'max_bytes': cache.max_bytes,
+                                 'hits': cache.hits, 'misses': cache.misses, 'evictions': cache.evictions}})
+
+    @staticmethod
+    def _write(writer, status, body, keep_alive, head_only=False):
+        head = (f"HTTP/1.1 {status} {REASONS[status]}\r\n"
+                f"Content-Type: application/json; charset=utf-8\r\n"
+                f"Content-Length: {len(body)}\r\n")
+        if not keep_alive:
+            head += "Connection: close\r\n"
+        writer.write(head.encode('latin-1') + b'\r\n')
+        if not head_only:
+            writer.write(body)
+
+    async def handle(self, reader, writer):
+        """Serve HTTP/1.1 requests on one connection until the client closes it."""
+        try:
+            while True:
+                # readline raises ValueError for a line longer than the stream limit
+                try:
+                    request_line = await reader.readline()
+                except ValueError:
+                    self._write(writer, 414, _dumps({'error': 'request line too long'}), False)
+                    await writer.drain()
+                    break
+                if not request_line:
+                    break
+                try:
+                    method, target, version = request_line.decode('latin-1').split()
+                except ValueError:
+                    method, target, version = '', '', 'HTTP/1.0'
+                headers = {}
+                try:
+                    while True:
+                        line = await reader.readline()
+                        if line in (b'\r\n', b'\n', b''):
+                            break
+                        name, _, value = line.decode('latin-1').partition(':')
+                        headers[name.strip().lower()] = value.strip().lower()
+                except ValueError:
+                    method, headers = None, {}
+                connection = headers.get('connection', '')
+                keep_alive = connection != 'close' if version == 'HTTP/1.1' else connection == 'keep-alive'
+
+                if method in ('GET', 'HEAD'):
+                    status, body = self.respond(target)
+                elif method is None:
+                    status, body, keep_alive = 400, _dumps({'error': 'header line too long'}), False
+                elif not method:
+                    status, body, keep_alive = 400, _dumps({'error': 'malformed request line'}), False
+                else:
+                    status, body = 405, _dumps({'error': 'only GET and HEAD are supported'})
+                self._write(writer, status, body, keep_alive, method == 'HEAD')
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError, asyncio.LimitOverrunError):
+            pass
+        finally:
+            writer.close()
+
+
+async def serve(server, host='127.0.0.1', port=DEFAULT_PORT, ready=None):
+    """Accept connections for server until cancelled; ready(sockets) is called once listening."""
+    listener = await asyncio.start_server(server.handle, host, port)
+    async with listener:
+        if ready is not None:
+            ready(listener.sockets)
+        await listener.serve_forever()
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Serve dictionary lookups over HTTP/JSON from a LIFT export.')
+    parser.add_argument('lift_file', help='LIFT export to load')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=DEFAULT_PORT)
+    parser.add_argument('--cache-mb', type=float, default=32, help='response cache size in MB (default: 32)')
+    args = parser.parse_args(argv)
+
+    start = time.perf_counter()
+    lexicon = Lexicon.from_lift(args.lift_file)
+    loaded = time.perf_counter() - start
+    server = LookupServer(lexicon, int(args.cache_mb * (1 << 20)))
+
+    def ready(sockets):
+        host, port = sockets[0].getsockname()[:2]
+        print(f"Serving {len(lexicon.encoded)} entries on http://{host}:{port} "
+              f"(loaded in {loaded:.2f} s)", file=sys.stderr, flush=True)
+
+    try:
+        asyncio.run(serve(server, args.host, args.port, ready))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
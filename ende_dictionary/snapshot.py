@@ -0,0 +1,185 @@
+"""Binary snapshots of the parsed entry model, cached next to the source export.
+
+The first run over an export parses it as usual and saves the resulting
+records to <source>.snapshot; later runs load that file instead of
+parsing again. A snapshot starts with a key made of the blake2b digest of
+the source's bytes and the parser version, the digest of the reader
+module's own source code, so editing either the export or the extraction
+logic invalidates it without anyone having to bump a number. Anything that
+is not a valid snapshot for the current key is ignored and rewritten.
+
+The payload holds plain data only: every record becomes a tuple of its
+slot values, and the list of those is stored in marshal format, so loading
+a snapshot never runs code or imports anything. A RecordCodec per reader
+says which record classes to rebuild. A snapshot owned by another user is
+ignored as well.
+"""
+import functools
+import gc
+import hashlib
+import marshal
+import os
+
+from .binfile import atomic_write
+from .instrument import NULL_STATS
+
+SNAPSHOT_SUFFIX = '.snapshot'
+_MAGIC = b'ENDESNP2'
+_KEY_SIZE = 32
+
+
+def _file_digest(path, chunk_size=1 << 20):
+    digest = hashlib.blake2b(digest_size=_KEY_SIZE)
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(chunk_size), b''):
+            digest.update(chunk)
+    return digest.digest()
+
+
+@functools.lru_cache(maxsize=None)
+def parser_version(module):
+    """Digest of a reader module's source, which changes whenever its extraction logic does."""
+    return _file_digest(module.__file__)
+
+
+def snapshot_key(source, reader):
+    """The key a snapshot of source parsed by the reader module must carry to be used."""
+    digest = hashlib.blake2b(digest_size=_KEY_SIZE)
+    digest.update(_MAGIC + reader.__name__.encode('utf-8') + b'\0' + parser_version(reader))
+    digest.update(_file_digest(source))
+    return digest.digest()
+
+
+class RecordCodec:
+    """Converts records to and from tuples of plain values for a snapshot.
+
+    classes are the record types a reader yields; nested maps a record
+    type to {slot: type} for its slots holding lists of nested records.
+    All other slot values are stored as they are and must be marshallable.
+    """
+
+    def __init__(self, classes, nested=None):
+        self.classes = tuple(classes)
+        self.nested = nested or {}
+        self._index = {cls: number for number, cls in enumerate(self.classes)}
+
+    def _fields(self, record):
+        cls = type(record)
+        nested = self.nested.get(cls, {})
+        return tuple([self._fields(child) for child in getattr(record, slot)] if slot in nested
+                     else getattr(record, slot) for slot in cls.__slots__)
+
+    def _build(self, cls, fields):
+        slots = cls.__slots__
+        if len(fields) != len(slots):
+            raise ValueError(f"{cls.__name__} needs {len(slots)} fields, got {len(fields)}")
+        record = cls.__new__(cls)
+        for slot, value in zip(slots, fields):
+            setattr(record, slot, value)
+        for slot, child in self.nested.get(cls, {}).items():
+            setattr(record, slot, [self._build(child, item) for item in getattr(record, slot)])
+        return record
+
+    def encode(self, records):
+        """The records as a list of (class number, field, ...) tuples."""
+        return [(self._index[type(record)],) + self._fields(record) for record in records]
+
+    def decode(self, rows):
+        """The records encode() turned into rows; raises ValueError, TypeError or IndexError for others."""
+        return [self._build(self.classes[row[0]], row[1:]) for row in rows]
+
+
+def _read_snapshot(path, key):
+    """The payload of the snapshot at path, or None if it is missing, has another key or another owner."""
+    try:
+        with open(path, 'rb') as f:
+            if hasattr(os, 'getuid') and os.fstat(f.fileno()).st_uid != os.getuid():
+                return None
+            if f.read(len(_MAGIC) + _KEY_SIZE) != _MAGIC + key:
+                return None
+            return f.read()
+    except FileNotFoundError:
+        return None
+
+
+def _load(data, codec):
+    # Decoding allocates one object per record and field; the cyclic GC
+    # would otherwise keep rescanning them and take most of the load time
+    enabled = gc.isenabled()
+    gc.disable()
+    try:
+        return codec.decode(marshal.loads(data))
+    except (EOFError, ValueError, TypeError, IndexError):
+        # Truncated or written by an incompatible version: parse afresh
+        return None
+    finally:
+        if enabled:
+            gc.enable()
+
+
+def _write_snapshot(path, key, records, codec):
+    with atomic_write(path) as tmp_path, open(tmp_path, 'wb') as f:
+        f.write(_MAGIC + key)
+        f.write(marshal.dumps(codec.encode(records)))
+
+
+def cached_parse(source, reader, parse, codec, stats=NULL_STATS):
+    """Return parse(source) as a list, loading it from source's snapshot when the key matches.
+
+    reader is the module whose code parse runs; it is part of the key.
+    codec is the RecordCodec for the records parse yields. On a miss the
+    parsed records are saved for next time; a snapshot that cannot be
+    written (read-only directory, full disk) is reported as a warning in
+    stats and otherwise ignored. Hashing and reading the snapshot are timed
+    as stats' read stage and decoding as its parse stage.
+    """
+    path = os.fspath(source) + SNAPSHOT_SUFFIX
+    with stats.stage('read'):
+        key = snapshot_key(source, reader)
+        data = _read_snapshot(path, key)
+    if data is not None:
+        with stats.stage('parse'):
+            records = _load(data, codec)
+        if records is not None:
+            return records
+    records = list(parse(source))
+    with stats.stage('snapshot'):
+        try:
+            _write_snapshot(path, key, records, codec)
+        except OSError as e:
+            stats.warn('snapshot not written', f"{path}: {e.strerror}")
+    return records
+
+
+def add_arguments(parser):
+    """Add the --no-snapshot option to an argparse parser."""
+    parser.add_argument('--no-snapshot', dest='snapshot', action='store_false',
+                        help=f"always parse the export instead of using its {SNAPSHOT_SUFFIX} cache")
+
+
+def lift_records(file_path, stream=True, stats=NULL_STATS, use_snapshot=True):
+    """The LiftEntry records of a LIFT export.
+
+    With use_snapshot they come as a list, via the export's snapshot;
+    otherwise they are streamed straight from lift.iter_records.
+    """
+    # The readers are imported on first use, so importing this module does
+    # not load the XML and HTML parsers
+    from . import lift
+    if not use_snapshot:
+        return lift.iter_records(file_path, stream, stats)
+    codec = RecordCodec([lift.LiftEntry], {lift.LiftEntry: {'senses': lift.LiftSense},
+                                           lift.LiftSense: {'examples': lift.LiftExample}})
+    return cached_parse(file_path, lift, lambda path: lift.iter_records(path, stream, stats), codec, stats)
+
+
+def configured_items(file_path, stats=NULL_STATS, use_snapshot=True):
+    """The items of a configured-dictionary export, as for lift_records (see configured.iter_items)."""
+    from . import configured
+    if not use_snapshot:
+        return configured.iter_items(file_path, stats=stats)
+    codec = RecordCodec([configured.LetterHead, configured.ConfiguredEntry, configured.MinorVariant],
+                        {configured.ConfiguredEntry: {'senses': configured.ConfiguredSense,
+                                                      'subentries': configured.Subentry}})
+    return cached_parse(file_path, configured, lambda path: configured.iter_items(path, stats=stats),
+                        codec, stats)
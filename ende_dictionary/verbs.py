@@ -0,0 +1,208 @@
+"""The verb dictionary (verb-dictionary.tex): verbs from a LIFT export grouped by inflection class.
+
+    python -m ende_dictionary verbs dictionary-verb-20250513.lift -o verb-dictionary.tex
+
+parse_lift_file reads and groups an export in one go; group_records does
+the grouping for LiftEntry records already in memory, and generate_latex
+or ende_dictionary.export writes the groups out.
+"""
+import argparse
+from collections import defaultdict
+from operator import attrgetter
+
+from . import engines, export, incremental, instrument, snapshot
+from .grouped import VERB_CLASSES, VerbItem
+from .instrument import NULL_STATS
+from .latex import STDOUT, LatexWriter, escape_latex
+from .parallel import render_sections
+
+DEFAULT_OUTPUT = 'verb-dictionary.tex'
+
+
+def verb_entry(record, stats=NULL_STATS):
+    """Return (verb_class, VerbItem) for a LiftEntry, or None if it is not listed."""
+    verb_class = 'Irregular'
+    if record.senses and record.senses[0].verb_class is not None:
+        verb_class = record.senses[0].verb_class
+    if verb_class not in VERB_CLASSES:
+        stats.skip('entry', 'unlisted verb class', f"{record.headword} ({verb_class})")
+        return None
+    headword = record.headword
+    analytic_plural = ', '.join(record.analytic_plurals) if record.analytic_plurals else '[]'
+    definitions = []
+    examples = []
+    for sense in record.senses:
+        definition = sense.definition if sense.definition is not None else sense.gloss
+        if definition is not None:
+            definitions.append(definition)
+        for example in sense.examples:
+            if example.sentence and example.translation:  # Only include complete examples
+                examples.append(example)
+    definition = ', '.join(definitions) if definitions else ''
+    if not (headword and definition):  # Only include entries with headword and definition
+        stats.skip('entry', 'missing headword or definition', headword or record.guid)
+        return None
+    return verb_class, VerbItem(headword, analytic_plural, definition, examples)
+
+
+def group_records(records, stats=NULL_STATS):
+    """Group the listed verbs among LiftEntry records by verb class."""
+    verb_groups = defaultdict(list)
+    group = stats.stage('group')
+
+    for record in records:
+        with group:
+            item = verb_entry(record, stats)
+            if item is not None:
+                verb_class, verb = item
+                verb_groups[verb_class].append(verb)
+
+    return verb_groups
+
+
+def parse_lift_file(file_path, stream=True, stats=NULL_STATS, use_snapshot=False):
+    """Parse LIFT file and group entries by verb class."""
+    return group_records(snapshot.lift_records(file_path, stream, stats, use_snapshot), stats)
+
+
+LATEX_PREAMBLE = r"""
+\documentclass[12pt]{article}
+\usepackage[utf8]{inputenc}
+\usepackage[T1]{fontenc}
+\usepackage{lmodern}
+\usepackage{enumitem}
+\usepackage{xcolor}
+
+% Custom commands for dictionary entries
+\newcommand{\anpl}[1]{\textbf{#1}} % Analytic non-plural (headword)
+\newcommand{\apl}[1]{\textit{#1}} % Analytic plural
+\newcommand{\defi}[1]{#1} % Definition
+
+"""
+
+
+def sort_class_entries(entries):
+    """Return a verb class's entries in headword order."""
+    return sorted(entries, key=attrgetter('headword'))
+
+
+def iter_class_section(verb_class, entries):
+    """Yield the LaTeX list for one verb class, one entry at a time; entries must be in headword order."""
+    yield f"\\section*{{Class {escape_latex(verb_class)} Verbs}}\n"
+    yield "\\begin{itemize}\n"
+    for entry in entries:
+        yield (
+            f"\\item \\anpl{{{escape_latex(entry.headword)}}} "
+            f"\\apl{{{escape_latex(entry.analytic_plural)}}} "
+            f"\\defi{{{escape_latex(entry.definition)}}}\n"
+        )
+        if entry.examples:
+            yield "\\begin{itemize}\n"
+            for example in entry.examples:
+                yield (
+                    f"\\item \\exsen{{{escape_latex(example.sentence)}}} "
+                    f"\\extran{{{escape_latex(example.translation)}}}\n"
+                )
+            yield "\\end{itemize}\n"
+    yield "\\end{itemize}\n\n"
+
+
+def generate_class_section(verb_class, entries):
+    """Generate the LaTeX list for one verb class from entries in headword order."""
+    return ''.join(iter_class_section(verb_class, entries))
+
+
+def sort_and_generate_class_section(verb_class, entries):
+    """Generate the LaTeX list for one verb class from entries in any order."""
+    return generate_class_section(verb_class, sort_class_entries(entries))
+
+
+def class_sections(verb_groups):
+    """Return (verb_class, entries in headword order) for every verb class with entries, in VERB_CLASSES order."""
+    return [(verb_class, sort_class_entries(verb_groups[verb_class])) for verb_class in VERB_CLASSES
+            if verb_groups.get(verb_class)]
+
+
+def generate_latex(verb_groups, output_file, jobs=1, stats=NULL_STATS):
+    """Write the LaTeX document with verb class lists to output_file (a path, '-' or a file).
+
+    Entries are streamed to the output as they are rendered and a path is
+    only replaced once the whole document has been written. With jobs > 1
+    whole classes are rendered on worker processes instead.
+    """
+    with stats.stage('sort'):
+        sections = class_sections(verb_groups)
+    with stats.stage('emit'), LatexWriter(output_file) as out:
+        out.write(LATEX_PREAMBLE)
+        if jobs > 1:
+            out.writelines(render_sections(generate_class_section, sections, jobs))
+        else:
+            for verb_class, entries in sections:
+                out.writelines(iter_class_section(verb_class, entries))
+
+
+def build_incremental(input_file, output_file, fragment_dir, stream=True, stats=NULL_STATS, use_snapshot=False,
+                      jobs=1):
+    """Rebuild only the verb classes touched by entries that changed since the last run.
+
+    Each class is written to its own fragment in fragment_dir and
+    output_file \\input's them; see ende_dictionary.incremental. The classes
+    to re-render are rendered on up to jobs processes.
+    """
+    def sections_for(record):
+        item = verb_entry(record, stats)
+        return [item] if item is not None else []
+
+    return incremental.build(snapshot.lift_records(input_file, stream, stats, use_snapshot), sections_for,
+                             sort_and_generate_class_section, VERB_CLASSES.index,
+                             LATEX_PREAMBLE, output_file, fragment_dir, stats, jobs)
+
+
+def main(argv=None, default_input=None):
+    """Command-line entry point; default_input is the LIFT export read when none is given."""
+    parser = argparse.ArgumentParser(description='Generate LaTeX verb lists grouped by inflection class from a LIFT export.')
+    parser.add_argument('input_file', nargs='?', default=default_input,
+                        help='LIFT export to read' + (f' (default {default_input})' if default_input else ''))
+    parser.add_argument('-o', '--output',
+                        help=f"file to write, or '-' for stdout (default {DEFAULT_OUTPUT} or its --format equivalent)")
+    incremental.add_arguments(parser, 'verb class', 'classes')
+    parser.add_argument('--jobs', type=int, default=1, metavar='N',
+                        help='render verb classes on N worker processes')
+    export.add_arguments(parser)
+    engines.add_arguments(parser)
+    snapshot.add_arguments(parser)
+    instrument.add_arguments(parser)
+    args = parser.parse_args(argv)
+    if args.input_file is None:
+        parser.error('a LIFT export to read is required')
+    if args.incremental and args.format != 'latex':
+        parser.error('--incremental only writes LaTeX')
+    if args.incremental and args.output == STDOUT:
+        parser.error('--incremental cannot write to stdout')
+    if args.format == 'sqlite' and args.output == STDOUT:
+        parser.error('a SQLite database cannot be written to stdout')
+
+    input_file = args.input_file
+    output_file = args.output or export.output_path(DEFAULT_OUTPUT, args.format)
+    with instrument.session(args) as stats:
+        if args.incremental:
+            fragment_dir = args.fragment_dir or incremental.default_fragment_dir(output_file)
+            result = build_incremental(input_file, output_file, fragment_dir, stats=stats,
+                                       use_snapshot=args.snapshot, jobs=args.jobs)
+            print(f"LaTeX file updated: {output_file} ({result.summary()})")
+            return
+        verb_groups = parse_lift_file(input_file, stats=stats, use_snapshot=args.snapshot)
+        if args.format != 'latex':
+            with stats.stage('sort'):
+                sections = class_sections(verb_groups)
+            count = export.export_sections(args.format, 'verb', sections, output_file, stats)
+            if output_file != STDOUT:
+                print(f"{args.format} export written: {output_file} ({count} records)")
+            return
+        generate_latex(verb_groups, output_file, args.jobs, stats)
+    if output_file != STDOUT:
+        print(f"LaTeX file generated: {output_file}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,252 @@
+"""Watch mode: rebuild the LaTeX outputs whenever a FLEx export is saved.
+
+    python -m ende_dictionary watch verb-dictionary configured-dictionary
+
+runs as one long-lived process, so interpreter start-up and imports are
+paid once. It polls the newest file matching each watched pattern in the
+given directories:
+
+    dictionary-verb-*.lift        verb-dictionary.tex
+    dictionary-[0-9]*.lift        dictionary_by_domain.tex
+    dictionary-configured-*.txt   dictionary.tex and word_lists.tex
+
+A file counts as changed when its modification time or size does, and is
+rebuilt once both have stayed the same for the debounce interval, so an
+export that is written in several bursts is read once, after the last.
+Outputs go next to their source unless --out-dir says otherwise.
+
+The parsed model stays in memory between rebuilds, keyed by the source
+text of each entry (LIFT) or top-level div (configured export). A save
+only re-parses the entries whose text changed; everything else, and any
+entry an export shares with the previous dated export, is reused. After
+each rebuild one line reports how many entries were re-read, the stage
+times, and the turnaround from the save to the finished outputs.
+"""
+import argparse
+import glob
+import importlib
+import os
+import sys
+import time
+
+from . import engines
+from .emitters import EMITTERS
+from .instrument import Stats
+
+DEFAULT_INTERVAL = 0.1
+DEFAULT_DEBOUNCE = 0.25
+
+
+class LiftOutput:
+    """A LaTeX file one of the LIFT converters (ende_dictionary.verbs or .semantic) builds from a LIFT export."""
+
+    def __init__(self, module_name, output):
+        self.module_name = module_name
+        self.output = output
+        self._module = None
+
+    def write(self, records, out_dir, jobs, stats):
+        if self._module is None:
+            self._module = importlib.import_module(self.module_name)
+        path = os.path.join(out_dir, self.output)
+        self._module.generate_latex(self._module.group_records(records, stats), path, jobs, stats)
+        return [path]
+
+
+class ConfiguredOutputs:
+    """Every registered emitter (see ende_dictionary.emitters) for a configured export."""
+
+    def write(self, items, out_dir, jobs, stats):
+        from . import build
+        build.emit_all(items, list(EMITTERS), out_dir, jobs=jobs, stats=stats)
+        return [os.path.join(out_dir, output) for emit, output in EMITTERS.values()]
+
+
+# The readers are imported on first use, so --help loads neither parser
+def _split_lift(text):
+    from .lift import split_entries
+    return split_entries(text)
+
+
+def _lift_items(source):
+    from .lift import read_entry_source
+    return [read_entry_source(source)]
+
+
+def _read_lift(path):
+    from .lift import iter_records
+    return list(iter_records(path))
+
+
+def _split_configured(text):
+    from .configured import split_divs
+    return split_divs(text)
+
+
+def _configured_items(source):
+    from .configured import read_div_source
+    return read_div_source(source)
+
+
+def _read_configured(path):
+    from .configured import iter_items
+    return list(iter_items(path))
+
+
+# (pattern, split the text into pieces, parse one piece into items, parse the whole file, outputs)
+WATCHED = [
+    ('dictionary-verb-*.lift', _split_lift, _lift_items, _read_lift,
+     LiftOutput('ende_dictionary.verbs', 'verb-dictionary.tex')),
+    ('dictionary-[0-9]*.lift', _split_lift, _lift_items, _read_lift,
+     LiftOutput('ende_dictionary.semantic', 'dictionary_by_domain.tex')),
+    ('dictionary-configured-*.txt', _split_configured, _configured_items, _read_configured,
+     ConfiguredOutputs()),
+]
+
+
+def signature(path):
+    """(mtime in ns, size) of path, or None if it cannot be read."""
+    try:
+        st = os.stat(path)
+    except OSError:
+        return None
+    return st.st_mtime_ns, st.st_size
+
+
+class Model:
+    """The parsed items of one watched source, reused piece by piece across rebuilds."""
+
+    def __init__(self, split, parse_piece, parse_file):
+        self.split = split
+        self.parse_piece = parse_piece
+        self.parse_file = parse_file
+        self._pieces = {}
+
+    def load(self, path, stats):
+        """Return (items, pieces re-parsed, pieces in total) for the current contents of path."""
+        with stats.stage('read'):
+            with open(path, 'r', encoding='utf-8') as f:
+                pieces = self.split(f.read())
+        if pieces is None:
+            # Cannot be cut into pieces safely: parse it whole and start afresh
+            self._pieces = {}
+            with stats.stage('parse'):
+                items = self.parse_file(path)
+            return items, len(items), len(items)
+        cached, self._pieces = self._pieces, {}
+        items = []
+        parsed = 0
+        with stats.stage('parse'):
+            for piece in pieces:
+                piece_items = cached.get(piece)
+                if piece_items is None:
+                    piece_items = self.parse_piece(piece)
+                    parsed += 1
+                self._pieces[piece] = piece_items
+                items.extend(piece_items)
+        return items, parsed, len(pieces)
+
+
+class Source:
+    """One watched pattern in one directory: its current file, model and build state."""
+
+    def __init__(self, directory, pattern, split, parse_piece, parse_file, outputs):
+        self.directory = directory
+        self.pattern = pattern
+        self.model = Model(split, parse_piece, parse_file)
+        self.outputs = outputs
+        self.built = None
+        self.pending = None
+        self.changed_at = 0.0
+
+    def current(self):
+        """The newest file matching the pattern (dated names sort by date), or None."""
+        matches = sorted(glob.glob(os.path.join(self.directory, self.pattern)))
+        return matches[-1] if matches else None
+
+
+class Watcher:
+    """Polls every source and rebuilds the ones that changed; see the module docstring."""
+
+    def __init__(self, directories, out_dir=None, jobs=1, interval=DEFAULT_INTERVAL, debounce=DEFAULT_DEBOUNCE,
+                 report=None):
+        self.sources = [Source(directory, *watched) for directory in directories for watched in WATCHED]
+        self.out_dir = out_dir
+        self.jobs = jobs
+        self.interval = interval
+        self.debounce = debounce
+        self.report = report or (lambda line: print(line, file=sys.stderr, flush=True))
+
+    def poll(self, now=None):
+        """Check every source once, rebuilding those whose change has settled; returns how many were rebuilt."""
+        now = time.monotonic() if now is None else now
+        rebuilt = 0
+        for source in self.sources:
+            path = source.current()
+            if path is None:
+                continue
+            state = (path, signature(path))
+            if state[1] is None or state == source.built:
+                source.pending = None
+                continue
+            if state != source.pending:
+                source.pending, source.changed_at = state, now
+            elif now - source.changed_at >= self.debounce:
+                self.rebuild(source, path, state)
+                rebuilt += 1
+        return rebuilt
+
+    def rebuild(self, source, path, state):
+        # Marked as built even if it fails, so a half-written export is
+        # retried on its next change rather than on every poll
+        initial = source.built is None
+        source.built, source.pending = state, None
+        stats = Stats()
+        start = time.perf_counter()
+        name = os.path.basename(path)
+        try:
+            items, parsed, total = source.model.load(path, stats)
+            out_dir = self.out_dir or os.path.dirname(path) or '.'
+            os.makedirs(out_dir, exist_ok=True)
+            outputs = source.outputs.write(items, out_dir, self.jobs, stats)
+        except Exception as e:
+            self.report(f"{name}: rebuild failed: {type(e).__name__}: {e}")
+            return
+        elapsed = time.perf_counter() - start
+        stages = ' '.join(f"{stage} {timer.wall:.3f}" for stage, timer in stats.stages.items())
+        turnaround = 'initial build' if initial else f"{time.time() - state[1][0] / 1e9:.3f} s after save"
+        self.report(f"{name}: re-read {parsed}/{total}, wrote {', '.join(map(os.path.basename, outputs))} "
+                    f"in {elapsed:.3f} s ({stages}); {turnaround}")
+
+    def run(self):
+        """Poll until interrupted."""
+        while True:
+            self.poll()
+            time.sleep(self.interval)
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Rebuild the LaTeX outputs whenever a FLEx export changes.')
+    parser.add_argument('directories', nargs='*', default=['.'], metavar='DIR',
+                        help='directories to watch for exports (default: the current one)')
+    parser.add_argument('--out-dir', help='write every output here instead of next to its source')
+    parser.add_argument('--jobs', type=int, default=1, metavar='N',
+                        help='render sections on N worker processes where the output supports it')
+    parser.add_argument('--interval', type=float, default=DEFAULT_INTERVAL, metavar='SECONDS',
+                        help=f'polling interval (default {DEFAULT_INTERVAL})')
+    parser.add_argument('--debounce', type=float, default=DEFAULT_DEBOUNCE, metavar='SECONDS',
+                        help=f'how long a file must stay unchanged before it is rebuilt (default {DEFAULT_DEBOUNCE})')
+    engines.add_arguments(parser)
+    args = parser.parse_args(argv)
+
+    watcher = Watcher(args.directories, args.out_dir, args.jobs, args.interval, args.debounce)
+    watched = ', '.join(sorted({source.pattern for source in watcher.sources}))
+    print(f"watching {', '.join(args.directories)} for {watched}; Ctrl-C to stop", file=sys.stderr, flush=True)
+    try:
+        watcher.run()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == '__main__':
+    main()
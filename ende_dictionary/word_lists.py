@@ -0,0 +1,156 @@
+"""Part-of-speech word lists (word_lists.tex) built from the configured-export entry model.
+
+    python -m ende_dictionary word-lists dictionary-configured-20250509.txt -o word_lists.tex
+"""
+import argparse
+import logging
+
+from . import engines, instrument, snapshot
+from .emitters import register_emitter
+from .grouped import WordListItem
+from .instrument import NULL_STATS
+from .latex import LatexWriter, escape_latex
+from .snapshot import configured_items
+
+
+# Function to group the entries read from the export by part of speech; skipped
+# entries and senses are counted in stats rather than logged one by one
+def group_by_pos(items, stats=NULL_STATS):
+    from .configured import ConfiguredEntry
+    pos_dict = {}  # Dictionary to store entries by part of speech
+
+    with stats.stage('group'):
+        entries = (item for item in items if isinstance(item, ConfiguredEntry))
+        for idx, entry in enumerate(entries, 1):
+            headword = entry.plain_headword
+            if not headword:
+                stats.skip('entry', 'missing or empty headword', f"entry {idx}")
+                continue
+
+            # Entry-level POS (from sharedgrammaticalinfo)
+            entry_pos = entry.shared_pos if entry.shared_pos is not None else 'unknown'
+            if entry_pos == 'unknown':
+                stats.warn('missing entry-level partofspeech', headword)
+
+            if not entry.senses:
+                stats.skip('entry', 'no senses', headword)
+                continue
+
+            for sense_idx, sense in enumerate(entry.senses, 1):
+                # Sense-level POS if present, else the entry-level one
+                pos = sense.pos if sense.pos is not None else entry_pos
+
+                definition = sense.gloss
+                if not definition:
+                    stats.skip('sense', 'no definition', f"{headword} {sense_idx}")
+                    continue
+
+                # Store in dictionary by part of speech
+                if pos != 'unknown':  # Only include non-unknown POS
+                    if pos not in pos_dict:
+                        pos_dict[pos] = []
+                    pos_dict[pos].append(WordListItem(headword, (definition,)))
+                else:
+                    stats.skip('sense', 'no sense- or entry-level partofspeech', f"{headword} {sense_idx}")
+
+    return pos_dict
+
+
+# Function to extract entries from the input file
+def parse_entries(file_path, stats=NULL_STATS, use_snapshot=False):
+    try:
+        items = list(configured_items(file_path, stats, use_snapshot))
+    except FileNotFoundError:
+        logging.error(f"Input file {file_path} not found.")
+        return {}
+    except UnicodeDecodeError:
+        logging.error(f"Input file {file_path} is not UTF-8 encoded.")
+        return {}
+    return group_by_pos(items, stats)
+
+
+# Function to generate LaTeX content for a part of speech, one entry at a time
+def iter_latex_section(pos, entries):
+    pos = escape_latex(pos)
+    yield f"\\section{{{pos}}}\n"
+    yield "\\begin{enumerate}\n"
+
+    for entry in entries:
+        headword = escape_latex(entry.headword)
+        definitions = entry.definitions
+        
+        # Start the entry with the headword
+        entry_text = f"\\entry{{{pos}}}{{\\headword{{{headword}}}"
+        
+        # Add numbered definitions
+        for i, definition in enumerate(definitions, 1):
+            def_text = escape_latex(definition)
+            entry_text += f" \\definition{{{i}. {def_text}}}"
+        
+        entry_text += "}"
+        yield f"\\item {entry_text}\n"
+
+    yield "\\end{description}\n\n"
+
+
+def generate_latex_section(pos, entries):
+    return ''.join(iter_latex_section(pos, entries))
+
+
+# Function to generate the complete LaTeX document, streaming each section to the file
+def generate_latex_file(pos_dict, output_file, stats=NULL_STATS):
+    preamble = r"""
+"""
+    document_end = r""
+
+    with stats.stage('sort'):
+        sections = sorted(pos_dict.items())
+    try:
+        with stats.stage('emit'), LatexWriter(output_file) as out:
+            out.write(preamble)
+            for pos, entries in sections:
+                out.writelines(iter_latex_section(pos, entries))
+            out.write(document_end)
+        logging.info(f"LaTeX file generated: {output_file}")
+    except Exception as e:
+        logging.error(f"Failed to write LaTeX file {output_file}: {e}")
+
+
+@register_emitter('word_lists', 'word_lists.tex')
+def write_word_lists(items, output_file, jobs=1, stats=NULL_STATS):
+    """Write the part-of-speech word lists for items to output_file; jobs is unused."""
+    pos_dict = group_by_pos(items, stats)
+    if pos_dict:
+        generate_latex_file(pos_dict, output_file, stats)
+    else:
+        logging.error("No entries parsed. LaTeX file not generated.")
+
+
+def main(argv=None, default_input=None):
+    """Command-line entry point; default_input is the export read when none is given."""
+    parser = argparse.ArgumentParser(description='Generate part-of-speech word lists from a FLEx configured-dictionary export.')
+    parser.add_argument('input_file', nargs='?', default=default_input,
+                        help='configured HTML export to read' + (f' (default {default_input})' if default_input else ''))
+    parser.add_argument('-o', '--output', default='word_lists.tex', help='LaTeX file to write')
+    engines.add_arguments(parser)
+    snapshot.add_arguments(parser)
+    instrument.add_arguments(parser)
+    args = parser.parse_args(argv)
+    if args.input_file is None:
+        parser.error('a configured export to read is required')
+
+    # Set up logging to help diagnose issues
+    logging.basicConfig(level=logging.INFO, format='%(levelname)s: %(message)s')
+
+    # Entries and senses skipped for a missing headword, POS or definition
+    # are counted and listed once in the end-of-run summary
+    with instrument.session(args) as stats:
+        pos_dict = parse_entries(args.input_file, stats, args.snapshot)
+        if pos_dict:
+            generate_latex_file(pos_dict, args.output, stats)
+        else:
+            logging.error("No entries parsed. LaTeX file not generated.")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,10 @@
+"""Helpers shared by the test modules (importable as pytest puts tests/ on sys.path)."""
+
+
+def values(record):
+    """A record as nested lists or tuples of its slot values, headed by its class name, for comparisons."""
+    if isinstance(record, (list, tuple)):
+        return type(record)(values(item) for item in record)
+    if hasattr(type(record), '__slots__'):
+        return (type(record).__name__,) + tuple(values(getattr(record, name)) for name in record.__slots__)
+    return record
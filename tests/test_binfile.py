@@ -0,0 +1,68 @@
+import os
+import struct
+from array import array
+
+import pytest
+
+from ende_dictionary.binfile import MappedFile, atomic_write, blob, little_endian
+
+_HEADER = struct.Struct('<8s2I')
+
+
+class Sample(MappedFile):
+    def __init__(self, path):
+        super().__init__(path)
+        magic, count, size = _HEADER.unpack_from(self._view)
+        (self.keys, self.offsets), position = self._arrays(_HEADER.size, [('Q', count), ('I', count + 1)])
+        (self.text,), _ = self._blobs(position, [size])
+
+
+def test_round_trip(tmp_path):
+    words = ['bmo', 'kaba', '', 'ndä']
+    offsets, text = blob(words)
+    keys = array('Q', [1, 1 << 40, 7, 2 ** 64 - 1])
+    path = tmp_path / 'sample.bin'
+    with atomic_write(path) as partial, open(partial, 'wb') as f:
+        f.write(_HEADER.pack(b'SAMPLE01', len(words), len(text)))
+        f.write(little_endian(keys))
+        f.write(little_endian(offsets))
+        f.write(text)
+    umask = os.umask(0)
+    os.umask(umask)
+    assert oct(os.stat(path).st_mode & 0o777) == oct(0o666 & ~umask)
+    with Sample(path) as sample:
+        assert list(sample.keys) == list(keys)
+        assert [str(sample.text[sample.offsets[i]:sample.offsets[i + 1]], 'utf-8')
+                for i in range(len(words))] == words
+    assert sample._views == []
+
+
+@pytest.mark.skipif(os.name != 'posix', reason='no permission bits')
+def test_atomic_write_keeps_the_mode_of_the_file_it_replaces(tmp_path):
+    path = tmp_path / 'out.bin'
+    path.write_bytes(b'old')
+    os.chmod(path, 0o600)
+    with atomic_write(path) as partial:
+        with open(partial, 'wb') as f:
+            f.write(b'new')
+    assert oct(os.stat(path).st_mode & 0o777) == oct(0o600)
+    path.unlink()
+    old = os.umask(0o027)
+    try:
+        with atomic_write(path) as partial:
+            open(partial, 'wb').close()
+    finally:
+        os.umask(old)
+    assert oct(os.stat(path).st_mode & 0o777) == oct(0o640)
+
+
+def test_atomic_write_keeps_the_old_file_on_error(tmp_path):
+    path = tmp_path / 'out.bin'
+    path.write_bytes(b'old')
+    with pytest.raises(RuntimeError):
+        with atomic_write(path) as partial:
+            with open(partial, 'wb') as f:
+                f.write(b'new')
+            raise RuntimeError
+    assert path.read_bytes() == b'old'
+    assert os.listdir(tmp_path) == ['out.bin']
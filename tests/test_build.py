@@ -0,0 +1,39 @@
+import glob
+import os
+import shutil
+
+from ende_dictionary import build, watch
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+LIFT_EXPORT = sorted(glob.glob(os.path.join(ROOT, 'verb-dictionary', 'dictionary-verb-*.lift')))[-1]
+
+CONFIGURED = (
+    '<html><body class="lexentry">'
+    '<div class="letHead"><span class="letter">B b</span></div>\n'
+    '<div class="entry" id="g1"><span class="mainheadword"><span lang="kit">bmo</span></span>'
+    '<span class="sharedgrammaticalinfo"><span class="morphosyntaxanalysis"><span class="partofspeech">'
+    '<span lang="en">v</span></span></span></span>'
+    '<span class="senses"><span class="sensecontent"><span class="sense">'
+    '<span class="definitionorgloss"><span lang="en">to go</span></span></span></span></span></div>\n'
+    '</body></html>\n'
+)
+
+
+def test_build_creates_a_missing_out_dir(tmp_path):
+    source = tmp_path / 'dictionary-configured-20250509.txt'
+    source.write_text(CONFIGURED, encoding='utf-8')
+    out_dir = tmp_path / 'out' / 'tex'
+    build.main([str(source), '--out-dir', str(out_dir), '--no-snapshot', '--summary', 'none'])
+    assert sorted(os.listdir(out_dir)) == ['dictionary.tex', 'word_lists.tex']
+    assert 'bmo' in (out_dir / 'dictionary.tex').read_text(encoding='utf-8')
+
+
+def test_watch_creates_a_missing_out_dir(tmp_path):
+    shutil.copyfile(LIFT_EXPORT, tmp_path / os.path.basename(LIFT_EXPORT))
+    out_dir = tmp_path / 'out'
+    reports = []
+    watcher = watch.Watcher([str(tmp_path)], str(out_dir), debounce=0, report=reports.append)
+    watcher.poll(now=0)
+    assert watcher.poll(now=1) == 1
+    assert 'failed' not in reports[0]
+    assert os.listdir(out_dir) == ['verb-dictionary.tex']
@@ -0,0 +1,48 @@
+import pytest
+
+from ende_dictionary import engines
+from ende_dictionary.configured import ConfiguredEntry, iter_items
+
+HEAD = ('<?xml version="1.0" encoding="utf-8"?><!DOCTYPE html>'
+        '<html xmlns="http://www.w3.org/1999/xhtml"><head><title>test</title></head><body class="lexentry">\n')
+ENTRY = ('<div class="entry" id="g0f0e3a4c-0000-4000-8000-000000000001">'
+         '<span class="mainheadword"><span lang="kit">kaba</span></span>'
+         '<span class="sharedgrammaticalinfo"><span class="morphosyntaxanalysis"><span class="partofspeech">'
+         '<span lang="en">n</span></span></span></span>'
+         '<span class="senses"><span class="sensecontent"><span class="sense">'
+         '<span class="definitionorgloss"><span lang="en">garden fish</span></span>'
+         '<span class="examplescontents"><span class="examplescontent">'
+         '<span class="example"><span lang="kit">Kaba ndä yunu.</span></span>'
+         '<span class="translationcontents"><span class="translationcontent"><span class="translation">'
+         '<span lang="en">The fish is in the garden.</span></span></span></span>'
+         '</span></span></span></span></span></div>\n')
+TAIL = '</body></html>\n'
+
+
+@pytest.fixture(params=engines.available())
+def engine(request):
+    engines.use(request.param)
+    yield request.param
+    engines.use('auto')
+
+
+def read_entry(path, chunk_size):
+    entries = [item for item in iter_items(path, chunk_size=chunk_size) if isinstance(item, ConfiguredEntry)]
+    assert len(entries) == 1
+    return entries[0]
+
+
+@pytest.mark.parametrize('text', ['garden fish', 'Kaba ndä yunu.', 'The fish is in the garden.'])
+def test_text_run_split_across_feed_chunks(tmp_path, engine, text):
+    # html.parser hands a text run cut by a chunk boundary over in two
+    # pieces; each piece must not be stripped on its own
+    document = HEAD + ENTRY + TAIL
+    path = tmp_path / 'dictionary-configured.txt'
+    path.write_text(document, encoding='utf-8')
+    boundary = document.index(text) + text.index(' ') + 1
+    entry = read_entry(path, boundary)
+    whole = read_entry(path, len(document) + 1)
+    sense = entry.senses[0]
+    assert sense.gloss == whole.senses[0].gloss == 'garden fish'
+    assert sense.definition == 'garden fish'
+    assert sense.examples == whole.senses[0].examples == [('Kaba ndä yunu.', 'The fish is in the garden.')]
@@ -0,0 +1,70 @@
+import glob
+import os
+
+import pytest
+
+from ende_dictionary import configured, engines, lift
+from helpers import values
+
+pytestmark = pytest.mark.skipif('lxml' not in engines.available(), reason='lxml is not installed')
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+LIFT_EXPORTS = sorted(glob.glob(os.path.join(ROOT, '*', '*.lift')))
+
+CONFIGURED = (
+    '<?xml version="1.0" encoding="utf-8"?><!DOCTYPE html>'
+    '<html xmlns="http://www.w3.org/1999/xhtml"><head><title>test</title></head><body class="lexentry">'
+    '<div class="letHead"><span class="letter">B b</span></div>\n'
+    '<div class="entry" id="g1"><span class="mainheadword"><span lang="kit"><a href="#g1">bmo</a></span></span>'
+    '<span class="senses"><span class="sharedgrammaticalinfo"><span class="morphosyntaxanalysis">'
+    '<span class="partofspeech"><span lang="en">adv.</span></span></span></span>'
+    '<span class="sensecontent"><span class="sensenumber">1</span><span class="sense" entryguid="g1">'
+    '<span class="definitionorgloss"><span lang="en">to go</span></span>'
+    '<span class="examplescontents"><span class="examplescontent">'
+    '<span class="example"><span lang="kit">Bmo ttmogi.</span></span>'
+    '<span class="translationcontents"><span class="translationcontent"><span class="translation">'
+    '<span lang="en">good &quot;friend&quot;</span></span></span></span></span></span></span></span>'
+    '<span class="sensecontent"><span class="sensenumber">2</span><span class="sense" entryguid="g1">'
+    '<span class="morphosyntaxanalysis"><span class="partofspeech"><span lang="en">n.</span></span></span>'
+    '<span class="definitionorgloss"><span lang="en">to go</span>'
+    '<span class="writingsystemprefix">Eng</span></span></span></span></span>'
+    '<span class="allomorphs"><span class="allomorph"><span class="form"><span lang="kit">zoll</span>'
+    '</span></span></span></div>\n'
+    '<div class="entry" id="g2"><span class="mainheadword"><span lang="kit">bllrott</span></span>'
+    '<span class="senses"><span class="sensecontent"><span class="sense" entryguid="g2">'
+    '<span class="definitionorgloss"><span lang="en">chief &amp; river (small)</span></span>'
+    '</span></span></span></div>\n'
+    '<div class="minorentryvariant"><span class="headword"><span lang="kit">bmmo</span></span>'
+    '<span class="reverseabbr"><span lang="en">var. of</span></span>'
+    '<span class="referencedentry"><span lang="kit">bmo</span></span></div>\n'
+    '</body></html>\n'
+)
+
+
+def read(engine, reader, path):
+    engines.use(engine)
+    try:
+        return [values(record) for record in reader(path)]
+    finally:
+        engines.use('auto')
+
+
+def assert_same_records(reader, path):
+    expected = read('stdlib', reader, path)
+    assert expected
+    got = read('lxml', reader, path)
+    for number, (want, have) in enumerate(zip(expected, got)):
+        assert have == want, f"record {number} differs"
+    assert len(got) == len(expected)
+
+
+@pytest.mark.parametrize('path', LIFT_EXPORTS, ids=os.path.basename)
+def test_lift_records_match(path):
+    assert_same_records(lift.iter_records, path)
+
+
+@pytest.mark.parametrize('chunk_size', [1 << 16, 7])
+def test_configured_items_match(tmp_path, chunk_size):
+    path = tmp_path / 'dictionary-configured.txt'
+    path.write_text(CONFIGURED, encoding='utf-8')
+    assert_same_records(lambda path: configured.iter_items(path, chunk_size=chunk_size), path)
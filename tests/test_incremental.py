@@ -0,0 +1,130 @@
+import glob
+import os
+import re
+
+import pytest
+
+from ende_dictionary import dictionary, incremental, verbs
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+LIFT_EXPORT = sorted(glob.glob(os.path.join(ROOT, '*', '*.lift')))[-1]
+
+
+def entry(guid, headword, definition):
+    return (f'<div class="entry" id="g{guid}"><span class="mainheadword"><span lang="kit">{headword}</span></span>'
+            f'<span class="senses"><span class="sensecontent"><span class="sense">'
+            f'<span class="definitionorgloss"><span lang="en">{definition}</span></span>'
+            f'</span></span></span></div>\n')
+
+
+def letter(text):
+    return f'<div class="letHead"><span class="letter">{text}</span></div>\n'
+
+
+def export(*divs):
+    return '<html><body class="lexentry">' + ''.join(divs) + '</body></html>\n'
+
+
+def fragments(output_file):
+    """The fragment texts output_file \\input's, in order."""
+    directory = os.path.dirname(output_file)
+    with open(output_file, encoding='utf-8') as f:
+        names = re.findall(r'\\input\{([^}]*)\}', f.read())
+    texts = []
+    for name in names:
+        with open(os.path.join(directory, name), encoding='utf-8') as f:
+            texts.append(f.read())
+    return texts
+
+
+@pytest.fixture
+def configured(tmp_path):
+    source = tmp_path / 'dictionary-configured.txt'
+    divs = [letter('B b'), entry('b1', 'bmo', 'to go'), entry('b2', 'bllrott', 'chief'),
+            letter('K k'), entry('k1', 'kaba', 'fish')]
+    source.write_text(export(*divs), encoding='utf-8')
+    return source, divs
+
+
+def build_dictionary(tmp_path, source, jobs=1):
+    return dictionary.build_incremental(str(source), str(tmp_path / 'dictionary.tex'),
+                                        str(tmp_path / 'dictionary-sections'), jobs=jobs)
+
+
+def test_letter_sections_match_the_full_dictionary(tmp_path, configured):
+    source, _ = configured
+    result = build_dictionary(tmp_path, source)
+    assert result.added == ['b1', 'b2', 'k1', 'letter B b', 'letter K k']
+    assert result.rendered == ['B b', 'K k']
+    full = tmp_path / 'full.tex'
+    dictionary.main([str(source), '-o', str(full), '--summary', 'none'])
+    assert '\n'.join(fragments(str(tmp_path / 'dictionary.tex'))) == full.read_text(encoding='utf-8')
+
+
+def test_entry_edit_re_renders_its_letter_only(tmp_path, configured):
+    source, divs = configured
+    build_dictionary(tmp_path, source)
+    divs[4] = entry('k1', 'kaba', 'garden fish')
+    source.write_text(export(*divs), encoding='utf-8')
+    result = build_dictionary(tmp_path, source)
+    assert (result.added, result.removed, result.changed) == ([], [], ['k1'])
+    assert result.rendered == ['K k']
+    assert 'garden fish' in fragments(str(tmp_path / 'dictionary.tex'))[1]
+
+
+def test_moved_entries_re_render_their_letters(tmp_path, configured):
+    source, divs = configured
+    build_dictionary(tmp_path, source)
+    source.write_text(export(divs[0], divs[1], divs[3], divs[4], divs[2]), encoding='utf-8')
+    result = build_dictionary(tmp_path, source)
+    assert result.changed == []
+    assert result.rendered == ['B b', 'K k']
+    source.write_text(export(divs[0], divs[2], divs[1], divs[3], divs[4]), encoding='utf-8')
+    assert build_dictionary(tmp_path, source).rendered == ['B b', 'K k']
+    source.write_text(export(divs[0], divs[1], divs[2], divs[3], divs[4]), encoding='utf-8')
+    assert build_dictionary(tmp_path, source).rendered == ['B b']
+
+
+def test_code_change_re_renders_everything(tmp_path, configured, monkeypatch):
+    source, _ = configured
+    build_dictionary(tmp_path, source)
+    assert build_dictionary(tmp_path, source).rendered == []
+    monkeypatch.setattr(incremental, 'code_version', lambda *functions: 'edited')
+    result = build_dictionary(tmp_path, source)
+    assert result.added == ['b1', 'b2', 'k1', 'letter B b', 'letter K k']
+    assert result.rendered == ['B b', 'K k']
+
+
+def test_jobs_render_the_same_fragments(tmp_path):
+    serial = verbs.build_incremental(LIFT_EXPORT, str(tmp_path / 'serial.tex'), str(tmp_path / 'serial'))
+    parallel = verbs.build_incremental(LIFT_EXPORT, str(tmp_path / 'parallel.tex'), str(tmp_path / 'parallel'),
+                                       jobs=2)
+    assert parallel.rendered == serial.rendered
+    assert fragments(str(tmp_path / 'parallel.tex')) == fragments(str(tmp_path / 'serial.tex'))
+
+
+def test_stale_fragments_are_deleted_when_the_manifest_is_invalidated(tmp_path, configured):
+    source, divs = configured
+    build_dictionary(tmp_path, source)
+    source.write_text(export(*divs[:3]), encoding='utf-8')
+    (tmp_path / 'dictionary-sections' / incremental.MANIFEST_NAME).write_text('{', encoding='utf-8')
+    (tmp_path / 'dictionary-sections' / 'notes.tex').write_text('kept', encoding='utf-8')
+    result = build_dictionary(tmp_path, source)
+    assert result.deleted == [incremental.fragment_name('K k')]
+    assert sorted(os.listdir(tmp_path / 'dictionary-sections')) == sorted(
+        [incremental.MANIFEST_NAME, 'notes.tex', incremental.fragment_name('B b')])
+
+
+def test_fragments_are_kept_next_to_the_output(tmp_path, configured, monkeypatch):
+    source, _ = configured
+    monkeypatch.chdir(tmp_path)
+    out = tmp_path / 'out'
+    out.mkdir()
+    dictionary.main([str(source), '-o', str(out / 'kit.tex'), '--incremental', '--summary', 'none'])
+    assert sorted(os.listdir(out)) == ['kit-sections', 'kit.tex']
+    dictionary.main([str(source), '-o', str(out / 'kit.tex'), '--incremental', '--fragment-dir', 'parts',
+                     '--summary', 'none'])
+    assert len(fragments(str(out / 'kit.tex'))) == 2
+    assert incremental.MANIFEST_NAME in os.listdir(tmp_path / 'parts')
+    with pytest.raises(SystemExit):
+        dictionary.main([str(source), '-o', '-', '--incremental'])
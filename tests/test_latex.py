@@ -0,0 +1,81 @@
+import doctest
+import os
+
+import pytest
+
+from ende_dictionary import latex
+from ende_dictionary.latex import LATEX_ESCAPES, escape_latex
+
+
+@pytest.mark.parametrize('char, escaped', [
+    ('&', r'\&'), ('%', r'\%'), ('$', r'\$'), ('#', r'\#'), ('_', r'\_'),
+    ('{', r'\{'), ('}', r'\}'), ('~', r'\textasciitilde{}'), ('^', r'\textasciicircum{}'),
+    ('\\', r'\textbackslash{}'),
+])
+def test_every_special_character(char, escaped):
+    assert escape_latex(char) == escaped
+    assert escape_latex(f'a{char}b') == f'a{escaped}b'
+
+
+def test_the_table_covers_exactly_the_tested_characters():
+    assert set(LATEX_ESCAPES) == set('&%$#_{}~^\\')
+
+
+def test_all_special_characters_in_one_string():
+    assert escape_latex('&%$#_{}~^\\') == (r'\&\%\$\#\_\{\}\textasciitilde{}\textasciicircum{}'
+                                           r'\textbackslash{}')
+
+
+def test_backslash_escape_is_not_escaped_again():
+    # A chain of str.replace calls escapes the braces of \textbackslash{}
+    # or the backslash of \{ depending on its order; one pass does neither
+    assert escape_latex('\\{') == r'\textbackslash{}\{'
+    assert escape_latex('{\\}') == r'\{\textbackslash{}\}'
+    assert escape_latex('\\\\') == r'\textbackslash{}\textbackslash{}'
+    assert escape_latex(r'\&') == r'\textbackslash{}\&'
+
+
+@pytest.mark.parametrize('text, escaped', [
+    ('\\alpha', r'\textbackslash{}alpha'),
+    ('~ada', r'\textasciitilde{}ada'),
+    ('^bä', r'\textasciicircum{}bä'),
+])
+def test_control_words_do_not_run_into_following_letters(text, escaped):
+    assert escape_latex(text) == escaped
+
+
+def test_text_without_special_characters_is_returned_as_is():
+    text = 'ndä yunu go: Bädä'
+    assert escape_latex(text) is text
+    assert escape_latex('') == ''
+
+
+def test_results_are_cached():
+    escape_latex.cache_clear()
+    first = escape_latex('a_b & c')
+    second = escape_latex('a_b & c')
+    info = escape_latex.cache_info()
+    assert first is second
+    assert (info.hits, info.misses) == (1, 1)
+    assert info.maxsize == 1 << 16
+
+
+def test_cached_and_uncached_results_agree():
+    escape_latex.cache_clear()
+    for text in ('plain', '50% & #1', '\\{x}', '~^_$'):
+        assert escape_latex(text) == escape_latex.__wrapped__(text)
+
+
+def test_docstring_examples():
+    assert doctest.testmod(latex).failed == 0
+
+
+@pytest.mark.skipif(os.name != 'posix', reason='no permission bits')
+def test_written_files_follow_the_umask(tmp_path):
+    path = tmp_path / 'out.tex'
+    old = os.umask(0o027)
+    try:
+        latex.write_text(str(path), 'new')
+    finally:
+        os.umask(old)
+    assert oct(os.stat(path).st_mode & 0o777) == oct(0o640)
@@ -0,0 +1,8 @@
+from ende_dictionary.lift import split_entries
+
+
+def test_split_entries_skips_elements_that_only_start_with_entry():
+    text = ('<lift><entry-types/><entry id="a"><entry-note>n</entry-note></entry>'
+            '<entry\n id="b"/><entry/></lift>')
+    assert split_entries(text) == ['<entry id="a"><entry-note>n</entry-note></entry>', '<entry\n id="b"/>',
+                                   '<entry/>']
@@ -0,0 +1,86 @@
+import asyncio
+import glob
+import json
+import os
+from collections import namedtuple
+
+import pytest
+
+from ende_dictionary import verbs
+from ende_dictionary.grouped import VERB_CLASSES
+from ende_dictionary.lift import iter_records
+from ende_dictionary.server import Lexicon, LookupServer, LRUCache
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+LIFT_EXPORTS = sorted(glob.glob(os.path.join(ROOT, '*', '*.lift')))
+
+Sense = namedtuple('Sense', 'id pos verb_class definition gloss domains examples')
+Record = namedtuple('Record', 'guid headword analytic_plurals senses')
+
+
+def record(headword, *domains):
+    return Record('g-' + headword, headword, [],
+                  [Sense('s-' + headword, 'Verb', None, 'to ' + headword, None, list(domains), [])])
+
+
+@pytest.mark.parametrize('path', LIFT_EXPORTS, ids=os.path.basename)
+def test_verb_class_counts_match_the_verb_dictionary(path):
+    records = list(iter_records(path))
+    lexicon = Lexicon(records)
+    sections = verbs.group_records(records)
+    assert sections
+    for verb_class in VERB_CLASSES:
+        assert len(lexicon.filter(verb_class=verb_class)) == len(sections.get(verb_class, []))
+
+
+def test_domains_are_indexed_by_code_and_full_label():
+    lexicon = Lexicon([record('bmo', '7.8.3 Cut'), record('kaba', 'Body parts')])
+    assert lexicon.filter(domain='7.8.3') == [0]
+    assert lexicon.filter(domain='7.8.3 cut') == [0]
+    assert lexicon.filter(domain='body parts') == [1]
+    assert lexicon.filter(domain='Body') == []
+    assert lexicon.filter(domain='7.8.3 Cut', verb_class='Irregular') == [0]
+
+
+def exchange(server, request, limit=1 << 10):
+    """Send request bytes to server.handle on a loopback socket and return the raw response."""
+    async def run():
+        listener = await asyncio.start_server(server.handle, '127.0.0.1', 0, limit=limit)
+        async with listener:
+            reader, writer = await asyncio.open_connection(*listener.sockets[0].getsockname()[:2])
+            writer.write(request)
+            await writer.drain()
+            response = await reader.read()
+            writer.close()
+            return response
+    return asyncio.run(run())
+
+
+def test_over_long_request_line_is_refused():
+    server = LookupServer(Lexicon([record('bmo')]))
+    response = exchange(server, b'GET /entries/' + b'a' * 4096 + b' HTTP/1.1\r\n\r\n')
+    assert response.startswith(b'HTTP/1.1 414 URI Too Long\r\n')
+    assert json.loads(response.split(b'\r\n\r\n', 1)[1]) == {'error': 'request line too long'}
+
+
+def test_over_long_header_line_is_refused():
+    server = LookupServer(Lexicon([record('bmo')]))
+    response = exchange(server, b'GET /entries/bmo HTTP/1.1\r\nX-Padding: ' + b'a' * 4096 + b'\r\n\r\n')
+    assert response.startswith(b'HTTP/1.1 400 Bad Request\r\n')
+
+
+def test_lookup_after_a_request():
+    server = LookupServer(Lexicon([record('bmo')]))
+    response = exchange(server, b'GET /entries/bmo HTTP/1.1\r\nConnection: close\r\n\r\n')
+    assert response.startswith(b'HTTP/1.1 200 OK\r\n')
+    body = json.loads(response.split(b'\r\n\r\n', 1)[1])
+    assert [entry['headword'] for entry in body['entries']] == ['bmo']
+
+
+def test_cache_counts_keys_in_utf8_bytes():
+    cache = LRUCache(20)
+    cache.put('/search?q=ndä', (200, b'[]'))
+    assert cache.size == len('/search?q=ndä'.encode('utf-8')) + 2
+    cache.put('/search?q=ndä', (200, b'[1]'))
+    cache.put('/x', (200, b'12345'))
+    assert (len(cache), cache.evictions, cache.size) == (1, 1, 7)
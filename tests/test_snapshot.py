@@ -0,0 +1,105 @@
+import glob
+import marshal
+import os
+import shutil
+
+import pytest
+
+from ende_dictionary import configured, snapshot
+from helpers import values
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), os.pardir)
+LIFT_EXPORT = sorted(glob.glob(os.path.join(ROOT, '*', '*.lift')))[-1]
+
+CONFIGURED = (
+    '<html><body class="lexentry">'
+    '<div class="letHead"><span class="letter">B b</span></div>\n'
+    '<div class="entry" id="g1"><span class="mainheadword"><span lang="kit">bmo</span></span>'
+    '<span class="etymology"><span class="preccomment">from</span><span class="form">bmoo</span></span>'
+    '<span class="senses"><span class="sensecontent"><span class="sensenumber">1</span><span class="sense">'
+    '<span class="definitionorgloss"><span lang="en">to go</span></span>'
+    '<span class="examplescontents"><span class="examplescontent">'
+    '<span class="example"><span lang="kit">Bmo ttmogi.</span></span>'
+    '<span class="translationcontents"><span class="translationcontent"><span class="translation">'
+    '<span lang="en">He goes.</span></span></span></span></span></span></span></span></span>'
+    '<span class="subentries"><span class="subentry"><span class="headword"><span lang="kit">bmo ka</span></span>'
+    '<span class="definitionorgloss"><span lang="en">go away</span></span></span></span></div>\n'
+    '<div class="minorentryvariant"><span class="headword"><span lang="kit">bmmo</span></span>'
+    '<span class="reverseabbr"><span lang="en">var. of</span></span>'
+    '<span class="referencedentry"><span lang="kit">bmo</span></span></div>\n'
+    '</body></html>\n'
+)
+
+
+@pytest.fixture
+def lift_export(tmp_path):
+    path = tmp_path / os.path.basename(LIFT_EXPORT)
+    shutil.copyfile(LIFT_EXPORT, path)
+    return str(path)
+
+
+@pytest.fixture
+def configured_export(tmp_path):
+    path = tmp_path / 'dictionary-configured.txt'
+    path.write_text(CONFIGURED, encoding='utf-8')
+    return str(path)
+
+
+def test_lift_round_trip(lift_export):
+    parsed = snapshot.lift_records(lift_export, use_snapshot=False)
+    cold = snapshot.lift_records(lift_export)
+    assert os.path.exists(lift_export + snapshot.SNAPSHOT_SUFFIX)
+    warm = snapshot.lift_records(lift_export)
+    assert values(warm) == values(cold) == values(list(parsed))
+
+
+def test_configured_round_trip(configured_export):
+    cold = snapshot.configured_items(configured_export)
+    warm = snapshot.configured_items(configured_export)
+    assert [type(item).__name__ for item in warm] == ['LetterHead', 'ConfiguredEntry', 'MinorVariant']
+    assert warm[1].etymology == ('from', 'bmoo')
+    assert warm[1].senses[0].examples == [('Bmo ttmogi.', 'He goes.')]
+    assert values(warm) == values(cold)
+
+
+def test_payload_is_plain_data(configured_export):
+    snapshot.configured_items(configured_export)
+    with open(configured_export + snapshot.SNAPSHOT_SUFFIX, 'rb') as f:
+        data = f.read()
+    rows = marshal.loads(data[len(snapshot._MAGIC) + snapshot._KEY_SIZE:])
+    assert [row[0] for row in rows] == [0, 1, 2]
+    assert rows[0] == (0, 'B b')
+
+
+@pytest.mark.parametrize('damage', [
+    lambda data: data[:len(data) // 2],
+    lambda data: data[:len(snapshot._MAGIC) + snapshot._KEY_SIZE] + marshal.dumps([(7, 'x')]),
+    lambda data: data[:len(snapshot._MAGIC) + snapshot._KEY_SIZE] + marshal.dumps([(0,)]),
+])
+def test_damaged_snapshot_is_reparsed(configured_export, damage):
+    expected = values(snapshot.configured_items(configured_export))
+    path = configured_export + snapshot.SNAPSHOT_SUFFIX
+    with open(path, 'rb') as f:
+        data = f.read()
+    with open(path, 'wb') as f:
+        f.write(damage(data))
+    assert values(snapshot.configured_items(configured_export)) == expected
+    with open(path, 'rb') as f:
+        assert f.read() == data
+
+
+def test_source_edit_invalidates(configured_export):
+    snapshot.configured_items(configured_export)
+    with open(configured_export, 'w', encoding='utf-8') as f:
+        f.write(CONFIGURED.replace('B b', 'K k'))
+    assert snapshot.configured_items(configured_export)[0].letter == 'K k'
+
+
+@pytest.mark.skipif(not hasattr(os, 'getuid'), reason='no file ownership')
+def test_snapshot_of_another_user_is_ignored(configured_export, monkeypatch):
+    snapshot.configured_items(configured_export)
+    path = configured_export + snapshot.SNAPSHOT_SUFFIX
+    key = snapshot.snapshot_key(configured_export, configured)
+    assert snapshot._read_snapshot(path, key) is not None
+    monkeypatch.setattr(os, 'getuid', lambda: os.stat(path).st_uid + 1)
+    assert snapshot._read_snapshot(path, key) is None